@@ -1,11 +1,131 @@
 import json
-import copy
 import re
-from .openai_tools import openai_chat_completion
-from .memory_handler import get_conversation_for_agent
+from dataclasses import dataclass, field
+from typing import List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from . import cv_patch, fast_path
+from .intents import get_intent_matcher
+from .llm_cache import get_llm_cache
+from .json_stream import JSONStringFieldStream
+from .openai_tools import aopenai_chat_completion, openai_chat_completion, openai_chat_completion_stream
+from .memory_handler import build_agent_context, count_message_tokens
 from utils.logger import logger
 from utils.validators import validate_and_correct_personal_info, auto_correct_name
 
+# Fixed agent prompts. Kept in one place so server-side TTS can pre-render them.
+QUESTIONS = {
+    "name": "Can you please provide your full name?",
+    "email": "What's your email address?",
+    "phone": "Could you share your phone number?",
+    "address": "What is your current address?",
+    "education": "Could you tell me about your highest education qualification and the institute?",
+    "degree": "What degree did you complete?",
+    "institute": "Which institute or college did you attend?",
+    "start_year": "What year did you start this course? (YYYY)",
+    "end_year": "What year did you finish? (YYYY)",
+    "experience": "Do you have any work experience you'd like to include?",
+    "role": "What was your job title or role?",
+    "company": "Which company did you work for?",
+    "start_date": "When did you start this role? (YYYY-MM)",
+    "end_date": "When did you finish this role? (YYYY-MM or 'Present')",
+    "description": "Could you briefly describe your responsibilities in that role?",
+    "skills": "Could you share some of your key skills?",
+    "projects": "Would you like to add a project? Please include the project name and a short description.",
+    "certifications": "Do you have any certifications to add?",
+    "project_details": "Could you share a brief summary of your role and key contributions for your main project?",
+}
+COMPLETION_PROMPT = "Thank you for providing the details. All key details are captured! Would you like me to generate your CV now?"
+GENERATE_REPLY = "Great! I'll prepare your CV now. Please click the 'Generate Resume' button to view the preview and download your files."
+DECLINE_REPLY = "No problem. Let me know whenever you're ready to generate your CV."
+_QUESTION_KEYS = {text: key for key, text in QUESTIONS.items()}
+
+AGENT_MODEL = "gpt-3.5-turbo"
+
+# Field aliases the LLM uses, mapped to cv_json keys. Built once instead of per turn.
+PERSONAL_ALIASES = {
+    "full_name": "name",
+    "firstname": "name",
+    "first_name": "name",
+    "last_name": "name",
+    "mail": "email",
+    "email_address": "email",
+    "e-mail": "email",
+    "mobile": "phone",
+    "phone_number": "phone",
+    "contact_number": "phone",
+    "location": "address",
+    "current_location": "address",
+    "city": "address",
+}
+EDUCATION_ALIASES = {"college": "institute"}
+EXPERIENCE_ALIASES = {
+    "company": "company",
+    "organization": "company",
+    "employer": "company",
+    "role": "role",
+    "position": "role",
+    "title": "role",
+    "job_title": "role",
+    "start_date": "start_date",
+    "start": "start_date",
+    "from": "start_date",
+    "end_date": "end_date",
+    "end": "end_date",
+    "to": "end_date",
+    "until": "end_date",
+    "till": "end_date",
+    "description": "description",
+    "responsibilities": "description",
+    "duties": "description",
+}
+SECTION_ALIASES = {
+    "projects": {"title": "project_name", "name": "project_name"},
+    "certifications": {
+        "certificate": "name",
+        "certification": "name",
+        "title": "name",
+        "org": "issuer",
+        "organization": "issuer",
+    },
+}
+
+
+def fixed_prompts():
+    """Every agent reply that does not come from the LLM."""
+    return [*QUESTIONS.values(), COMPLETION_PROMPT, GENERATE_REPLY, DECLINE_REPLY]
+
+
+@dataclass
+class AgentTurn:
+    """State carried from _prepare_turn to _complete_turn across the LLM call."""
+
+    user_text: str
+    last_agent_prompt: str
+    preferred_language: Optional[str]
+    declined_experience: bool
+    declined_certifications: bool
+    # Set up front by the fast path, otherwise from the LLM reply.
+    parsed: Optional[dict] = None
+    messages: List[dict] = field(default_factory=list)
+    accounting: Optional[dict] = None
+
+    @property
+    def answered_locally(self):
+        return not self.messages
+
+
+@dataclass
+class TurnOutcome:
+    """What a turn does to the session, as computed by _apply_turn."""
+
+    previous_cv: dict
+    cv_json: dict
+    skipped_ops: int
+    agent_text: str
+    next_action: str
+    is_complete: bool
+
 
 class AgentCore:
     def __init__(self):
@@ -81,34 +201,12 @@ class AgentCore:
         """Extract role/company from description if missing."""
         if entry.get("role") and entry.get("company"):
             return entry
-        
-        # Normalize keys (handle case variations)
-        key_map = {
-            "company": "company",
-            "organization": "company",
-            "employer": "company",
-            "role": "role",
-            "position": "role",
-            "title": "role",
-            "job_title": "role",
-            "start_date": "start_date",
-            "start": "start_date",
-            "from": "start_date",
-            "end_date": "end_date",
-            "end": "end_date",
-            "to": "end_date",
-            "until": "end_date",
-            "till": "end_date",
-            "description": "description",
-            "responsibilities": "description",
-            "duties": "description",
-        }
-        
+
         # Normalize all keys to lowercase and map aliases
         normalized = {}
         for k, v in entry.items():
             k_lower = k.lower()
-            target_key = key_map.get(k_lower, k_lower)
+            target_key = EXPERIENCE_ALIASES.get(k_lower, k_lower)
             if v not in (None, ""):
                 normalized[target_key] = v
         
@@ -201,46 +299,50 @@ class AgentCore:
                     seen[key] = item
         return list(seen.values())
 
-    def _normalize_cv_json(self, session, parsed_cv):
-        base = copy.deepcopy(self._base_template)
-        existing = copy.deepcopy(session.cv_json or {})
-        existing = self._merge_dict(base, existing)
+    def _merge_entries(self, existing, incoming):
+        """Merge incoming entries over existing ones by position into a new list."""
+        merged = list(existing)
+        if not incoming:
+            return merged
+        for idx, new_item in enumerate(incoming):
+            if idx < len(merged):
+                merged[idx] = self._merge_dict(merged[idx], new_item)
+            else:
+                merged.append(new_item)
+        return [item for item in merged if item]
+
+    def _normalize_cv_json(self, session, parsed_cv, base_cv=None):
+        """
+        Merge ``parsed_cv`` over ``base_cv`` (the session's cv_json by default)
+        and normalize field names and sections.
+
+        The stored CV is itself normalizer output and normalizing is
+        idempotent, so only what ``parsed_cv`` brings is normalized; entries
+        it does not touch are reused as they are instead of being deep-copied
+        and normalized again. Containers are copied before they are modified,
+        so the stored CV is left as it was.
+        """
+        source = session.cv_json if base_cv is None else base_cv
+        existing = self._merge_dict(self._base_template, source if isinstance(source, dict) else {})
         incoming = parsed_cv or {}
 
         # ---- PERSONAL INFO ----
-        personal = existing.get("personal_info", {})
+        personal = dict(existing.get("personal_info") or {})
         personal_fields = ["name", "email", "phone", "address"]
         for field in personal_fields:
             personal.setdefault(field, "")
         incoming_personal = {k.lower(): str(v).strip() for k, v in incoming.get("personal_info", {}).items() if v}
 
-        alias_map = {
-            "full_name": "name",
-            "firstname": "name",
-            "first_name": "name",
-            "last_name": "name",
-            "mail": "email",
-            "email_address": "email",
-            "e-mail": "email",
-            "mobile": "phone",
-            "phone_number": "phone",
-            "contact_number": "phone",
-            "location": "address",
-            "current_location": "address",
-            "city": "address",
-        }
-
         # Apply alias mapping
-        for alias, target in alias_map.items():
+        for alias, target in PERSONAL_ALIASES.items():
             if alias in incoming_personal and not incoming_personal.get(target):
                 incoming_personal[target] = incoming_personal[alias]
 
         # Merge incoming personal info with existing
         personal.update(incoming_personal)
-        
-        # Validate and correct personal information
-        corrected_personal = validate_and_correct_personal_info(personal)
-        existing["personal_info"] = corrected_personal
+
+        # Validate and correct personal information (validators are memoized per value)
+        existing["personal_info"] = validate_and_correct_personal_info(personal)
 
         # ---- SUMMARY ----
         summary_value = existing.get("summary", "") or ""
@@ -256,7 +358,7 @@ class AgentCore:
         existing["summary"] = summary_value
 
         # ---- META ----
-        meta = existing.get("meta", {}) if isinstance(existing.get("meta"), dict) else {}
+        meta = dict(existing["meta"]) if isinstance(existing.get("meta"), dict) else {}
         incoming_meta = incoming.get("meta", {}) if isinstance(incoming.get("meta"), dict) else {}
         prev_skip_experience = bool(meta.get("skip_experience"))
         prev_skip_certifications = bool(meta.get("skip_certifications"))
@@ -272,131 +374,62 @@ class AgentCore:
         existing["meta"] = meta
 
         # ---- EDUCATION ----
-        education_aliases = {"college": "institute"}
-        existing_edu = [
-            self._parse_education_description(self._normalize_entry(ed, education_aliases))
-            for ed in self._ensure_list(existing.get("education", []))
-        ]
         incoming_edu = [
-            self._parse_education_description(self._normalize_entry(ed, education_aliases))
+            self._parse_education_description(self._normalize_entry(ed, EDUCATION_ALIASES))
             for ed in self._ensure_list(incoming.get("education", []))
         ]
-
-        if incoming_edu:
-            for idx, new_ed in enumerate(incoming_edu):
-                if idx < len(existing_edu):
-                    existing_edu[idx] = self._merge_dict(existing_edu[idx], new_ed)
-                else:
-                    existing_edu.append(new_ed)
-        existing["education"] = [ed for ed in existing_edu if ed]
+        existing["education"] = self._merge_entries(self._ensure_list(existing.get("education", [])), incoming_edu)
 
         # ---- EXPERIENCE ----
-        experience_key_map = {
-            "company": "company",
-            "organization": "company",
-            "employer": "company",
-            "role": "role",
-            "position": "role",
-            "title": "role",
-            "job_title": "role",
-            "start_date": "start_date",
-            "start": "start_date",
-            "from": "start_date",
-            "end_date": "end_date",
-            "end": "end_date",
-            "to": "end_date",
-            "until": "end_date",
-            "till": "end_date",
-            "description": "description",
-            "responsibilities": "description",
-            "duties": "description",
-        }
-        existing_exp = [
-            self._parse_experience_description(self._normalize_entry(exp, experience_key_map))
-            for exp in self._ensure_list(existing.get("experience", []))
-        ]
         incoming_exp = [
-            self._parse_experience_description(self._normalize_entry(exp, experience_key_map))
+            self._parse_experience_description(self._normalize_entry(exp, EXPERIENCE_ALIASES))
             for exp in self._ensure_list(incoming.get("experience", []))
         ]
-        if incoming_exp:
-            for idx, new_exp in enumerate(incoming_exp):
-                if idx < len(existing_exp):
-                    existing_exp[idx] = self._merge_dict(existing_exp[idx], new_exp)
-                else:
-                    existing_exp.append(new_exp)
-        existing["experience"] = [exp for exp in existing_exp if exp]
+        existing["experience"] = self._merge_entries(self._ensure_list(existing.get("experience", [])), incoming_exp)
 
         if existing["experience"]:
-            if not existing.setdefault("meta", {}).get("skip_experience"):
+            if not existing["meta"].get("skip_experience"):
                 existing["meta"]["skip_experience"] = False
 
-        # ---- SKILLS / PROJECTS / CERTIFICATIONS ----
-        alias_map = {
-            "projects": {"title": "project_name", "name": "project_name"},
-            "certifications": {
-                "certificate": "name",
-                "certification": "name",
-                "title": "name",
-                "org": "issuer",
-                "organization": "issuer",
-            },
-        }
-
-        for section in ["skills", "projects", "certifications"]:
-            incoming_list = self._ensure_list(incoming.get(section, []))
-            if section == "skills":
-                # Handle skills - can be list of strings or dict (categorized)
-                existing_skills = existing.get("skills", [])
-                incoming_skills = incoming.get("skills", [])
-                
-                # If incoming is a dict (categorized), merge with existing dict
-                if isinstance(incoming_skills, dict):
-                    if isinstance(existing_skills, dict):
-                        # Merge categorized skills
-                        merged_skills = dict(existing_skills)
-                        for category, skills_list in incoming_skills.items():
-                            if category in merged_skills:
-                                # Combine lists and dedupe
-                                combined = self._ensure_list(merged_skills[category]) + self._ensure_list(skills_list)
-                                merged_skills[category] = self._dedupe_strings(combined)
-                            else:
-                                merged_skills[category] = self._ensure_list(skills_list)
-                        existing["skills"] = merged_skills
+        # ---- SKILLS ----
+        # Can be a list of strings or a dict of categorized lists.
+        existing_skills = existing.get("skills", [])
+        incoming_skills = incoming.get("skills", [])
+        if isinstance(incoming_skills, dict):
+            if isinstance(existing_skills, dict):
+                # Merge categorized skills
+                merged_skills = dict(existing_skills)
+                for category, skills_list in incoming_skills.items():
+                    if category in merged_skills:
+                        # Combine lists and dedupe
+                        combined = self._ensure_list(merged_skills[category]) + self._ensure_list(skills_list)
+                        merged_skills[category] = self._dedupe_strings(combined)
                     else:
-                        # Existing is list, incoming is dict - convert existing to dict or use incoming
-                        existing["skills"] = incoming_skills
-                elif isinstance(existing_skills, dict):
-                    # Existing is dict, incoming is list - try to merge into a default category
-                    if "General" not in existing_skills:
-                        existing_skills["General"] = []
-                    existing_skills["General"].extend(self._ensure_list(incoming_skills))
-                    existing_skills["General"] = self._dedupe_strings(existing_skills["General"])
-                    existing["skills"] = existing_skills
-                else:
-                    # Both are lists - combine and dedupe
-                    combined = self._ensure_list(existing_skills) + self._ensure_list(incoming_skills)
-                    existing["skills"] = self._dedupe_strings(combined)
-                continue
+                        merged_skills[category] = self._ensure_list(skills_list)
+                existing["skills"] = merged_skills
+            else:
+                # Existing is list, incoming is dict - use incoming
+                existing["skills"] = incoming_skills
+        elif self._ensure_list(incoming_skills):
+            if isinstance(existing_skills, dict):
+                # Existing is dict, incoming is list - merge into a default category
+                general = self._ensure_list(existing_skills.get("General", [])) + self._ensure_list(incoming_skills)
+                existing["skills"] = {**existing_skills, "General": self._dedupe_strings(general)}
+            else:
+                # Both are lists - combine and dedupe
+                combined = self._ensure_list(existing_skills) + self._ensure_list(incoming_skills)
+                existing["skills"] = self._dedupe_strings(combined)
+        else:
+            existing["skills"] = dict(existing_skills) if isinstance(existing_skills, dict) else list(self._ensure_list(existing_skills))
 
-            section_alias = alias_map.get(section, {})
-            normalized_existing = [
-                self._normalize_entry(item, section_alias)
-                for item in self._ensure_list(existing.get(section, []))
-            ]
+        # ---- PROJECTS / CERTIFICATIONS ----
+        for section in ["projects", "certifications"]:
+            section_alias = SECTION_ALIASES[section]
             normalized_incoming = [
                 self._normalize_entry(item, section_alias)
-                for item in incoming_list
+                for item in self._ensure_list(incoming.get(section, []))
             ]
-
-            if normalized_incoming:
-                for idx, new_item in enumerate(normalized_incoming):
-                    if idx < len(normalized_existing):
-                        normalized_existing[idx] = self._merge_dict(normalized_existing[idx], new_item)
-                    else:
-                        normalized_existing.append(new_item)
-
-            existing[section] = [item for item in normalized_existing if item]
+            existing[section] = self._merge_entries(self._ensure_list(existing.get(section, [])), normalized_incoming)
 
         return existing
 
@@ -404,43 +437,43 @@ class AgentCore:
         """Determine the next missing field question."""
         personal = cv_json.get("personal_info", {})
         if not personal.get("name"):
-            return "Can you please provide your full name?"
+            return QUESTIONS["name"]
         if not personal.get("email"):
-            return "What's your email address?"
+            return QUESTIONS["email"]
         if not personal.get("phone"):
-            return "Could you share your phone number?"
+            return QUESTIONS["phone"]
         if not personal.get("address"):
-            return "What is your current address?"
+            return QUESTIONS["address"]
 
         education = cv_json.get("education", [])
         if not education:
-            return "Could you tell me about your highest education qualification and the institute?"
+            return QUESTIONS["education"]
         edu = education[0]
         if not edu.get("degree"):
-            return "What degree did you complete?"
+            return QUESTIONS["degree"]
         if not edu.get("institute"):
-            return "Which institute or college did you attend?"
+            return QUESTIONS["institute"]
         if not edu.get("start_year"):
-            return "What year did you start this course? (YYYY)"
+            return QUESTIONS["start_year"]
         if not edu.get("end_year"):
-            return "What year did you finish? (YYYY)"
+            return QUESTIONS["end_year"]
 
         experience = cv_json.get("experience", [])
         skip_experience = cv_json.get("meta", {}).get("skip_experience")
         if not experience and not skip_experience:
-            return "Do you have any work experience you'd like to include?"
+            return QUESTIONS["experience"]
         if experience:
             exp = experience[0]
             if not exp.get("role"):
-                return "What was your job title or role?"
+                return QUESTIONS["role"]
             if not exp.get("company"):
-                return "Which company did you work for?"
+                return QUESTIONS["company"]
             if not exp.get("start_date"):
-                return "When did you start this role? (YYYY-MM)"
+                return QUESTIONS["start_date"]
             if not exp.get("end_date"):
-                return "When did you finish this role? (YYYY-MM or 'Present')"
+                return QUESTIONS["end_date"]
             if not exp.get("description"):
-                return "Could you briefly describe your responsibilities in that role?"
+                return QUESTIONS["description"]
 
 
         skills = cv_json.get("skills")
@@ -453,132 +486,119 @@ class AgentCore:
                 has_skills = len(skills) > 0
         
         if not has_skills:
-            return "Could you share some of your key skills?"
+            return QUESTIONS["skills"]
         if not cv_json.get("projects"):
-            return "Would you like to add a project? Please include the project name and a short description."
+            return QUESTIONS["projects"]
 
         certifications = cv_json.get("certifications", [])
         skip_certifications = cv_json.get("meta", {}).get("skip_certifications")
         if skip_certifications:
             certifications = []
         if not certifications and not skip_certifications:
-            return "Do you have any certifications to add?"
+            return QUESTIONS["certifications"]
 
         projects_confirmed = cv_json.get("meta", {}).get("projects_confirmed")
         if cv_json.get("projects") and not projects_confirmed:
-            return "Could you share a brief summary of your role and key contributions for your main project?"
+            return QUESTIONS["project_details"]
 
         return None
 
-    def process_user_message(self, session, user_text):
-        """Core interaction between agent and user."""
-        messages = get_conversation_for_agent(session)
+    def _fast_path_reply(self, session, question_key, user_text, preferred_language, declined):
+        """
+        Answer a reply to one of the fixed questions without the LLM. Returns a
+        ``parsed`` dict shaped like the LLM's JSON, with the extracted sparse
+        ``cv_update`` in place of a CV, or None to fall back.
+        """
+        if not getattr(settings, "AGENT_FAST_PATH", True):
+            return None
+        result = fast_path.extract(question_key, user_text, declined=declined)
+        min_confidence = getattr(settings, "AGENT_FAST_PATH_MIN_CONFIDENCE", 0.9)
+        if result is None or result[1] < min_confidence:
+            fast_path.fast_path_stats.record(question_key, served=False, low_confidence=result is not None)
+            return None
+        fast_path.fast_path_stats.record(question_key, served=True)
+        update, _ = result
+        # agent_text stays empty: the post-processing below asks the next question.
+        return {
+            "agent_text": "",
+            "cv_update": update,
+            "next_action": "ask",
+            "language": preferred_language,
+        }
 
+    def _prepare_turn(self, session, user_text):
+        """
+        Everything before the LLM call: decline detection, the fast path and,
+        when the fast path does not apply, the prompt messages.
+        """
         current_meta = {}
         if isinstance(session.cv_json, dict):
             current_meta = session.cv_json.get("meta", {}) or {}
         preferred_language = current_meta.get("preferred_language")
 
-        last_agent_prompt = ""
-        for item in reversed(session.conversation):
-            if item.get("from") == "agent":
-                last_agent_prompt = item.get("text", "")
-                break
+        last_agent_prompt = session.last_turn_text("agent")
 
-        user_lower = user_text.lower()
+        intents = get_intent_matcher()
         last_agent_prompt_lower = last_agent_prompt.lower()
 
-        no_experience_phrases = [
-            "no experience",
-            "don't have experience",
-            "do not have experience",
-            "dont have experience",
-            "no i dont have experience",
-            "no, i don't have experience",
-            "no, i dont have experience",
-            "no i don't have experience",
-            "no experience yet",
-            "fresher",
-            "i am a fresher",
-            "i'm a fresher",
-            "no work experience",
-            "haven't worked",
-            "havent worked",
-            "never worked",
-            "no prior experience",
-            "no experiance",
-            "dont have experiance",
-        ]
-        user_declined_experience = any(phrase in user_lower for phrase in no_experience_phrases)
-
-        telugu_negative_tokens = [
-            "ledu",
-            "ledhu",
-            "lādu",
-            "లేదు",
-            "లేడు",
-            "వద్దు",
-            "కావదు",
-            "కావలెదు",
-        ]
-
-        if not user_declined_experience:
-            has_telugu_negative = any(token in user_lower for token in telugu_negative_tokens)
-            if has_telugu_negative and any(keyword in user_lower for keyword in ["experience", "exper", "job", "work"]):
-                user_declined_experience = True
-
-        if not user_declined_experience and "experienc" in user_lower:
-            negative_tokens = ["no", "don't", "dont", "do not", "haven't", "havent", "never", "none"]
-            user_declined_experience = any(token in user_lower for token in negative_tokens)
-
-        if not user_declined_experience and "experience" in last_agent_prompt_lower:
-            concise_negative_replies = [
-                "no",
-                "nope",
-                "none",
-                "not yet",
-                "no i dont have",
-                "no i don't have",
-                "i dont have",
-                "i don't have",
-                "dont have",
-                "don't have",
-                "nil",
-            ]
-            stripped_lower = user_lower.strip()
-            user_declined_experience = any(stripped_lower.startswith(reply) for reply in concise_negative_replies)
+        user_declined_experience = (
+            intents.matches("no_experience", user_text)
+            or (intents.matches("refusal", user_text) and intents.matches("mentions_work", user_text))
+            or (intents.matches("mentions_experience", user_text) and intents.matches("negation", user_text))
+            or ("experience" in last_agent_prompt_lower and intents.matches("short_no", user_text))
+        )
 
         # Detect explicit decline of certifications when last question was about certifications
-        user_declined_certifications = False
-        if "certification" in last_agent_prompt_lower or "certifications" in last_agent_prompt_lower:
-            cert_negative_replies = [
-                "no",
-                "nope",
-                "none",
-                "no i dont have",
-                "no i don't have",
-                "i dont have",
-                "i don't have",
-                "dont have",
-                "don't have",
-                "no certification",
-                "no certifications",
-                "no certificate",
-                "no certificates",
-            ]
-            stripped_lower = user_lower.strip()
-            if any(stripped_lower.startswith(reply) for reply in cert_negative_replies):
-                user_declined_certifications = True
+        user_declined_certifications = "certification" in last_agent_prompt_lower and (
+            intents.matches("no_certifications", user_text) or intents.matches("refusal", user_text)
+        )
 
-            if not user_declined_certifications and any(token in stripped_lower for token in telugu_negative_tokens):
-                user_declined_certifications = True
+        question_key = _QUESTION_KEYS.get(last_agent_prompt.strip())
+        parsed = self._fast_path_reply(
+            session,
+            question_key,
+            user_text,
+            preferred_language,
+            declined={
+                "experience": user_declined_experience,
+                "certifications": user_declined_certifications,
+            },
+        )
+        turn = AgentTurn(
+            user_text=user_text,
+            last_agent_prompt=last_agent_prompt,
+            preferred_language=preferred_language,
+            declined_experience=user_declined_experience,
+            declined_certifications=user_declined_certifications,
+            parsed=parsed,
+        )
+        if parsed is not None:
+            return turn
 
+        context = build_agent_context(session)
+        messages = context.messages
         preferred_language_note = preferred_language or "auto"
 
+        if getattr(settings, "AGENT_CV_PROTOCOL", "patch") == "patch":
+            cv_rule = (
+                "1) If the user provides CV information, record only what changed as JSON Patch (RFC 6902) operations "
+                "against the 'CV collected so far' document: use \"add\" to set a value (new or existing key), "
+                "\"remove\" to delete one, and \"/section/-\" to append a list entry. Use only these keys: "
+            )
+            update_rule = "8) ALWAYS add patch operations for any new information the user provides, even if the answer is in another language.\n"
+            reply_format = (
+                "Respond strictly in JSON: {{\"agent_text\":\"...\",\"cv_patch\":[{{\"op\":\"add\",\"path\":\"/personal_info/email\",\"value\":\"...\"}}],"
+                "\"next_action\":\"ask|answer|complete\",\"language\":\"<iso>\"}}. Use an empty cv_patch when nothing changed."
+            )
+        else:
+            cv_rule = "1) If the user provides CV information, update the structured CV JSON using only these keys: "
+            update_rule = "8) ALWAYS update cv_json with any new information the user provides, even if the answer is in another language.\n"
+            reply_format = "Respond strictly in JSON: {{\"agent_text\":\"...\",\"cv_json\":{{...}},\"next_action\":\"ask|answer|complete\",\"language\":\"<iso>\"}}."
+
         instruction = (
             "You are a helpful CV-building assistant. Follow these rules:\n"
-            "1) If the user provides CV information, update the structured CV JSON using only these keys: "
-            "personal_info(name,email,phone,address,github,linkedin,portfolio), education(degree,institute,start_year,end_year,gpa), "
+            + cv_rule
+            + "personal_info(name,email,phone,address,github,linkedin,portfolio), education(degree,institute,start_year,end_year,gpa), "
             "experience(company,role,start_date,end_date,description), summary(text), skills(list of strings or categorized object), "
             "projects(project_name,description,technologies,date), certifications(name,issuer,year).\n"
             "2) For experience descriptions, format as bullet points separated by newlines (\\n) when user provides multiple points.\n"
@@ -587,23 +607,136 @@ class AgentCore:
             "5) If the user request is unrelated to CV building, answer briefly and set next_action to \"answer\".\n"
             "6) Detect the user's language (ISO 639-1). Use '{preferred_language_note}' as the preferred language if it is not 'auto'; otherwise mirror the user's language.\n"
             "7) Provide the assistant reply (agent_text) in that language.\n"
-            "8) ALWAYS update cv_json with any new information the user provides, even if the answer is in another language.\n"
-            "9) For social links (GitHub, LinkedIn), extract username or full URL from user input.\n"
-            "Respond strictly in JSON: {{\"agent_text\":\"...\",\"cv_json\":{{...}},\"next_action\":\"ask|answer|complete\",\"language\":\"<iso>\"}}."
+            + update_rule
+            + "9) For social links (GitHub, LinkedIn), extract username or full URL from user input.\n"
+            + reply_format
         ).format(preferred_language_note=preferred_language_note)
         messages.append({"role": "user", "content": instruction + f"\n\nUser said: {user_text}"})
+        context.accounting["prompt_tokens"] = count_message_tokens(messages)
+        turn.messages = messages
+        turn.accounting = context.accounting
+        return turn
 
+    def _parse_reply(self, resp):
+        """Parse the LLM's JSON reply; None when it answered in plain text."""
         try:
-            resp = openai_chat_completion(None, messages, model="gpt-3.5-turbo", temperature=0)
-        except Exception as e:
-            return {"error": str(e)}
-
-        try:
-            parsed = json.loads(resp)
+            return json.loads(resp)
         except Exception:
-            return {"agent_text": resp, "cv_json": session.cv_json, "next_action": "answer"}
-
-        normalized_cv = self._normalize_cv_json(session, parsed.get("cv_json", session.cv_json))
+            return None
+
+    def _plain_reply(self, session, resp, delta):
+        """Response for an LLM reply that was not JSON: only the user's turn is stored, the CV is unchanged."""
+        session.commit_turn()
+        if delta:
+            return {"agent_text": resp, "cv_json_patch": [], "next_action": "answer"}
+        return {"agent_text": resp, "cv_json": session.cv_json, "next_action": "answer"}
+
+    def process_user_message(self, session, user_text, delta=False):
+        """
+        Core interaction between agent and user. With ``delta`` the response
+        carries ``cv_json_patch`` (JSON Patch ops for this turn) instead of the
+        full ``cv_json``.
+
+        The caller stages the user's turn (session.stage_turn); it is written
+        together with the reply and the CV in a single commit, so a failed LLM
+        call stores nothing. Raises SessionConflict if concurrent turns keep
+        winning the commit.
+        """
+        turn = self._prepare_turn(session, user_text)
+        if turn.parsed is None:
+            try:
+                resp = openai_chat_completion(None, turn.messages, model=AGENT_MODEL, temperature=0)
+            except Exception as e:
+                return {"error": str(e)}
+
+            turn.parsed = self._parse_reply(resp)
+            if turn.parsed is None:
+                return self._plain_reply(session, resp, delta)
+        return self._complete_turn(session, turn, delta=delta)
+
+    async def aprocess_user_message(self, session, user_text, delta=False):
+        """
+        Async process_user_message. The LLM call is awaited on the event loop;
+        turn preparation (which may refresh the conversation summary) and the
+        session save run in worker threads.
+        """
+        turn = await sync_to_async(self._prepare_turn, thread_sensitive=False)(session, user_text)
+        if turn.parsed is None:
+            try:
+                resp = await aopenai_chat_completion(None, turn.messages, model=AGENT_MODEL, temperature=0)
+            except Exception as e:
+                return {"error": str(e)}
+
+            turn.parsed = self._parse_reply(resp)
+            if turn.parsed is None:
+                return await sync_to_async(self._plain_reply)(session, resp, delta)
+        return await sync_to_async(self._complete_turn)(session, turn, delta=delta)
+
+    def stream_user_message(self, session, user_text):
+        """
+        Streaming variant of process_user_message. Yields ("token", text) as
+        agent_text arrives from the LLM, then one ("final", response) where
+        response carries the authoritative agent_text (the next required
+        question can still replace the streamed one) and ``cv_json_patch``.
+        """
+        turn = self._prepare_turn(session, user_text)
+        if turn.parsed is None:
+            field_stream = JSONStringFieldStream("agent_text")
+            chunks = []
+            try:
+                for chunk in openai_chat_completion_stream(None, turn.messages, model=AGENT_MODEL, temperature=0):
+                    chunks.append(chunk)
+                    text = field_stream.feed(chunk)
+                    if text:
+                        yield "token", text
+            except Exception as e:
+                yield "final", {"error": str(e)}
+                return
+
+            resp = "".join(chunks)
+            turn.parsed = self._parse_reply(resp)
+            if turn.parsed is None:
+                if not field_stream.done:
+                    yield "token", resp
+                yield "final", self._plain_reply(session, resp, delta=True)
+                return
+
+        yield "final", self._complete_turn(session, turn, delta=True)
+
+    def _apply_parsed_cv(self, session, parsed):
+        """
+        The normalized CV after a parsed reply, which carries a full
+        ``cv_json``, ``cv_patch`` operations or a fast-path ``cv_update``.
+        Returns ``(cv_json, skipped_ops)``.
+        """
+        if "cv_update" in parsed:
+            # Extracted values are already in canonical form; the merged
+            # document only needs the normalizer's section defaults.
+            return self._normalize_cv_json(session, {}, base_cv=fast_path.apply(session.cv_json, parsed["cv_update"])), 0
+        if "cv_json" in parsed or "cv_patch" not in parsed:
+            return self._normalize_cv_json(session, parsed.get("cv_json", session.cv_json)), 0
+        # Patch against the template-filled document so parent paths such as
+        # /personal_info exist, then normalize the result on its own: merging it
+        # over the old CV would undo removals.
+        patched, skipped = cv_patch.apply_model_patch(
+            self._merge_dict(self._base_template, session.cv_json), parsed["cv_patch"]
+        )
+        return self._normalize_cv_json(session, patched, base_cv={}), skipped
+
+    def _apply_turn(self, session, turn):
+        """
+        The session state after a parsed reply (LLM or fast path) and the next
+        prompt, computed from ``session`` without changing it.
+        """
+        parsed = turn.parsed
+        user_text = turn.user_text
+        intents = get_intent_matcher()
+        last_agent_prompt_lower = turn.last_agent_prompt.lower()
+        preferred_language = turn.preferred_language
+        user_declined_experience = turn.declined_experience
+        user_declined_certifications = turn.declined_certifications
+
+        normalized_cv, skipped_ops = self._apply_parsed_cv(session, parsed)
         meta = normalized_cv.setdefault("meta", {})
 
         parsed_language = parsed.get("language")
@@ -636,17 +769,8 @@ class AgentCore:
         elif meta.get("skip_certifications"):
             normalized_cv["certifications"] = []
 
-        project_followup_keywords = [
-            "more detail",
-            "responsibil",
-            "contribution",
-            "your role",
-            "your responsibilities",
-            "key contributions",
-        ]
-        is_project_followup = (
-            "project" in last_agent_prompt_lower
-            and any(keyword in last_agent_prompt_lower for keyword in project_followup_keywords)
+        is_project_followup = "project" in last_agent_prompt_lower and intents.matches(
+            "project_followup", last_agent_prompt_lower
         )
 
         if is_project_followup:
@@ -675,62 +799,17 @@ class AgentCore:
 
         is_complete = next_question is None
 
-        completion_prompt = "Thank you for providing the details. All key details are captured! Would you like me to generate your CV now?"
-
-        stripped_lower = user_lower.strip()
-        affirm_exact = {
-            "yes",
-            "y",
-            "yep",
-            "yup",
-            "yeah",
-            "sure",
-            "ok",
-            "okay",
-            "please",
-            "s",
-        }
-        affirm_contains = [
-            "generate",
-            "create",
-            "go ahead",
-            "do it",
-            "make it",
-            "ready",
-            "proceed",
-            "let's do",
-            "lets do",
-            "download",
-        ]
-        decline_exact = {
-            "no",
-            "not now",
-            "not yet",
-            "nope",
-            "later",
-        }
-        decline_contains = [
-            "don't",
-            "dont",
-            "maybe later",
-            "hold on",
-        ]
+        completion_prompt = COMPLETION_PROMPT
 
-        intent_generate = (
-            stripped_lower in affirm_exact
-            or any(phrase in user_lower for phrase in affirm_contains)
-        )
-        intent_decline = (
-            stripped_lower in decline_exact
-            or any(phrase in user_lower for phrase in decline_contains)
-        )
+        intent_generate = intents.matches("affirm", user_text)
+        intent_decline = intents.matches("decline", user_text)
 
         if is_complete:
             if intent_generate:
-                agent_text = "Great! I'll prepare your CV now. Please click the 'Generate Resume' button to view the preview and download your files."
+                agent_text = GENERATE_REPLY
                 next_action = "complete"
             elif intent_decline:
-                agent_text = "No problem. Let me know whenever you're ready to generate your CV."
+                agent_text = DECLINE_REPLY
                 next_action = "complete"
             else:
                 agent_text = completion_prompt
@@ -764,20 +843,61 @@ class AgentCore:
             next_action = "ask"
             agent_text = next_question or agent_text
 
-        session.cv_json = normalized_cv
-        session.is_complete = is_complete
-        session.conversation.append({"from": "agent", "text": agent_text})
-        session.save()
+        return TurnOutcome(
+            previous_cv=session.cv_json,
+            cv_json=normalized_cv,
+            skipped_ops=skipped_ops,
+            agent_text=agent_text,
+            next_action=next_action,
+            is_complete=is_complete,
+        )
 
+    def _complete_turn(self, session, turn, delta=False):
+        """
+        Apply a parsed reply, commit the turn in one write and return the response.
+
+        Patches and fast-path updates are re-applied to the fresh CV when
+        another request commits first. A full ``cv_json`` was written against
+        the CV this turn read, so if that has changed meanwhile the turn raises
+        SessionConflict rather than overwrite the newer CV.
+        """
+        from api.models import SessionConflict
+
+        outcome = None
+        read_cv = session.cv_json
+
+        def apply(current):
+            # Runs again on the fresh session if another request committed first.
+            nonlocal outcome
+            if "cv_json" in turn.parsed and current.cv_json != read_cv:
+                raise SessionConflict(f"session {current.session_id} CV changed during a full-document turn")
+            outcome = self._apply_turn(current, turn)
+            current.cv_json = outcome.cv_json
+            current.is_complete = outcome.is_complete
+            return [("agent", outcome.agent_text)]
+
+        commit_retries = session.commit_turn(apply)
+        parsed = turn.parsed
+        normalized_cv = outcome.cv_json
+        agent_text, next_action = outcome.agent_text, outcome.next_action
+
+        llm_cache = get_llm_cache()
         try:
             logger.info(
                 json.dumps(
                     {
                         "session_id": str(session.session_id),
-                        "user_text": user_text,
+                        "user_text": turn.user_text,
                         "agent_text": agent_text,
                         "next_action": next_action,
-                        "is_complete": is_complete,
+                        "is_complete": outcome.is_complete,
+                        "fast_path": turn.answered_locally,
+                        "cv_patch_ops": len(parsed["cv_patch"]) if isinstance(parsed.get("cv_patch"), list) else None,
+                        "cv_patch_skipped": outcome.skipped_ops,
+                        "commit_retries": commit_retries,
+                        "context": turn.accounting,
+                        "fast_path_served_fraction": fast_path.fast_path_stats.stats()["served_fraction"],
+                        "llm_cache_hit_rate": llm_cache.stats()["hit_rate"] if llm_cache else None,
                         "meta": normalized_cv.get("meta", {}),
                     }
                 )
@@ -785,4 +905,6 @@ class AgentCore:
         except Exception:
             pass
 
+        if delta:
+            return {"agent_text": agent_text, "cv_json_patch": cv_patch.diff(outcome.previous_cv, normalized_cv), "next_action": next_action}
         return {"agent_text": agent_text, "cv_json": normalized_cv, "next_action": next_action}
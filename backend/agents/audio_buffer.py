@@ -0,0 +1,83 @@
+"""
+Preallocated audio buffers for streamed PCM input.
+"""
+from typing import Optional
+
+import numpy as np
+
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+class PCMRingBuffer:
+    """Fixed-capacity float32 ring buffer fed with PCM16 (or float) frames.
+
+    Every sample is stored twice, at ``i`` and ``i + capacity``, so any window
+    of up to ``capacity`` unread samples is a contiguous slice of the backing
+    array. ``peek``/``read`` therefore always return zero-copy views that can
+    be handed straight to Whisper.
+
+    Views stay valid until the writer wraps around and overwrites them, so a
+    caller must finish using a view before writing ``capacity`` more samples.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive number of samples")
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity * 2, dtype=np.float32)
+        self._read = 0
+        self._write = 0
+        self.bytes_copied = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    @property
+    def free(self) -> int:
+        return self.capacity - len(self)
+
+    def clear(self) -> None:
+        self._read = 0
+        self._write = 0
+        self.bytes_copied = 0
+
+    def write(self, frame: np.ndarray) -> int:
+        """
+        Convert ``frame`` into the buffer in place. Writes at most ``free``
+        samples and returns how many were consumed from ``frame``.
+        """
+        count = min(frame.size, self.free)
+        if count == 0:
+            return 0
+
+        start = self._write % self.capacity
+        dest = self._data[start:start + count]
+        if frame.dtype == np.int16:
+            np.multiply(frame[:count], PCM16_SCALE, out=dest)
+        else:
+            dest[:] = frame[:count]
+
+        # Mirror the freshly written samples into the other half.
+        head = min(count, self.capacity - start)
+        self._data[start + self.capacity:start + self.capacity + head] = dest[:head]
+        if count > head:
+            self._data[:count - head] = dest[head:]
+
+        self._write += count
+        self.bytes_copied += 2 * count * self._data.itemsize
+        return count
+
+    def peek(self, count: Optional[int] = None) -> np.ndarray:
+        """Return a view of the next ``count`` unread samples (all by default)."""
+        available = len(self)
+        count = available if count is None else min(count, available)
+        start = self._read % self.capacity
+        return self._data[start:start + count]
+
+    def consume(self, count: int) -> None:
+        self._read += min(count, len(self))
+
+    def read(self, count: Optional[int] = None) -> np.ndarray:
+        view = self.peek(count)
+        self.consume(view.size)
+        return view
@@ -0,0 +1,55 @@
+"""
+JSON Patch (RFC 6902) deltas for cv_json.
+
+With AGENT_CV_PROTOCOL = "patch" the LLM returns only the operations that
+change the CV instead of the whole document, and clients that send
+``delta: true`` get the turn's changes back as a patch instead of the full
+cv_json. Paths are only accepted under the CV's known top-level sections.
+"""
+import copy
+
+import jsonpatch
+import jsonpointer
+
+from utils.logger import logger
+
+SECTIONS = frozenset(
+    ["personal_info", "summary", "education", "experience", "skills", "projects", "certifications", "meta"]
+)
+_OPS = frozenset(["add", "replace", "remove"])
+
+
+def _allowed(operation):
+    if not isinstance(operation, dict) or operation.get("op") not in _OPS:
+        return False
+    path = operation.get("path")
+    if not isinstance(path, str) or not path.startswith("/"):
+        return False
+    return path.split("/")[1] in SECTIONS
+
+
+def apply_model_patch(cv_json, operations):
+    """
+    Apply the LLM's patch operations to a copy of ``cv_json``. Operations that
+    are malformed, outside the CV sections or do not apply are skipped one by
+    one, so a single bad path does not discard the rest of the turn.
+    Returns ``(document, skipped)``.
+    """
+    document = copy.deepcopy(cv_json)
+    skipped = 0
+    for operation in operations if isinstance(operations, list) else []:
+        if not _allowed(operation):
+            skipped += 1
+            continue
+        try:
+            # Each op either applies fully or raises before touching the document.
+            document = jsonpatch.apply_patch(document, [operation], in_place=True)
+        except (jsonpatch.JsonPatchException, jsonpointer.JsonPointerException, TypeError) as exc:
+            logger.warning("Skipping CV patch operation %s: %s", operation, exc)
+            skipped += 1
+    return document, skipped
+
+
+def diff(before, after):
+    """The patch turning ``before`` into ``after``, as a list of operations."""
+    return jsonpatch.make_patch(before or {}, after or {}).patch
@@ -0,0 +1,194 @@
+"""
+Deterministic local stand-in for the LLM (LLM_BACKEND=fake), for load tests
+and offline development.
+
+Replies are scripted in a fixtures file (FAKE_LLM_FIXTURES, by default
+fake_llm_fixtures.json next to this module):
+
+- ``agent``: rules tried in order against the user's text; the first
+  ``match`` regex (case-insensitive) wins, and ``{group}`` placeholders in
+  its ``agent_text`` and ``cv`` update are filled from the match. The update
+  is sent as cv_patch operations or as cv_json, whichever the instruction
+  asks for. ``default`` answers when no rule matches.
+- ``summary``: the running conversation summary.
+- ``fallback``: any other prompt.
+
+CV refinement prompts get their input cv_json back unchanged. The same
+prompt always gets the same reply; only the simulated latency is random,
+drawn from FAKE_LLM_LATENCY with a seeded generator (FAKE_LLM_SEED) so a
+run replays the same delays in the same order.
+"""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .openai_tools import ChatBackend
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fake_llm_fixtures.json"
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_REFINE_MARKER = "\nInput CV JSON:\n"
+_SUMMARY_MARKER = "Update the running summary"
+_USER_MARKER = "\n\nUser said: "
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Delay sampler, in seconds, for a latency spec in milliseconds:
+    ``fixed:300``, ``uniform:100-500``, ``normal:300,50`` (clipped at 0) or
+    ``lognormal:300,0.5`` (median, sigma). Empty or ``0`` means no delay.
+    """
+    spec = (spec or "").strip()
+    if spec in ("", "0"):
+        return lambda rng: 0.0
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in re.split(r"[,-]", params) if value.strip()]
+        if kind == "fixed" and len(values) == 1:
+            delay = values[0] / 1000
+            return lambda rng: delay
+        if kind == "uniform" and len(values) == 2:
+            low, high = values
+            return lambda rng: rng.uniform(low, high) / 1000
+        if kind == "normal" and len(values) == 2:
+            mean, deviation = values
+            return lambda rng: max(0.0, rng.gauss(mean, deviation)) / 1000
+        if kind == "lognormal" and len(values) == 2:
+            median, sigma = values
+            return lambda rng: median * rng.lognormvariate(0, sigma) / 1000
+    except ValueError:
+        pass
+    raise ValueError(
+        f"Invalid FAKE_LLM_LATENCY {spec!r}; use fixed:MS, uniform:LOW-HIGH, normal:MEAN,SD or lognormal:MEDIAN,SIGMA"
+    )
+
+
+def _fill(value, groups):
+    """``value`` with placeholders replaced; entries whose value comes out empty are dropped."""
+    if isinstance(value, str):
+        return _PLACEHOLDER.sub(lambda match: groups.get(match.group(1)) or "", value).strip()
+    if isinstance(value, list):
+        return [_fill(item, groups) for item in value]
+    if isinstance(value, dict):
+        filled = {key: _fill(item, groups) for key, item in value.items()}
+        return {key: item for key, item in filled.items() if item != ""}
+    return value
+
+
+def _patch_operations(update):
+    """JSON Patch ops that apply a partial cv update (dict sections by key, list entries appended)."""
+    operations = []
+    for section, value in update.items():
+        if isinstance(value, dict):
+            operations += [{"op": "add", "path": f"/{section}/{key}", "value": item} for key, item in value.items()]
+        elif isinstance(value, list):
+            operations += [{"op": "add", "path": f"/{section}/-", "value": item} for item in value]
+        else:
+            operations.append({"op": "add", "path": f"/{section}", "value": value})
+    return operations
+
+
+class FakeChatBackend(ChatBackend):
+    """
+    Scripted replies after a simulated delay. ``calls`` counts completions
+    served and ``simulated_seconds`` adds up the delays drawn for them.
+    """
+
+    name = "fake"
+
+    def __init__(self, fixtures: Optional[dict] = None, latency: str = "", token_ms: float = 0, seed: int = 0) -> None:
+        if fixtures is None:
+            with open(DEFAULT_FIXTURES, encoding="utf-8") as handle:
+                fixtures = json.load(handle)
+        self.fixtures = fixtures
+        self._rules = [(re.compile(rule["match"], re.IGNORECASE), rule) for rule in fixtures.get("agent", [])]
+        self._latency = parse_latency(latency)
+        self.token_delay = token_ms / 1000
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.simulated_seconds = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "FakeChatBackend":
+        from django.conf import settings
+
+        fixtures = None
+        path = getattr(settings, "FAKE_LLM_FIXTURES", "")
+        if path:
+            with open(path, encoding="utf-8") as handle:
+                fixtures = json.load(handle)
+        return cls(
+            fixtures,
+            latency=getattr(settings, "FAKE_LLM_LATENCY", ""),
+            token_ms=getattr(settings, "FAKE_LLM_TOKEN_MS", 0),
+            seed=getattr(settings, "FAKE_LLM_SEED", 0),
+        )
+
+    def reply(self, messages) -> str:
+        """The scripted reply to ``messages``, without any delay."""
+        prompt = messages[-1].get("content", "") if messages else ""
+        if _REFINE_MARKER in prompt:
+            cv_json = json.loads(prompt.split(_REFINE_MARKER, 1)[1])
+            return json.dumps({"cv_json": cv_json, "notes": "Unchanged by the fake LLM backend."}, ensure_ascii=False)
+        if prompt.startswith(_SUMMARY_MARKER):
+            return self.fixtures.get("summary", "")
+        if _USER_MARKER in prompt:
+            instruction, user_text = prompt.rsplit(_USER_MARKER, 1)
+            return self._agent_reply(instruction, user_text)
+        return self.fixtures.get("fallback", "")
+
+    def _agent_reply(self, instruction, user_text):
+        for pattern, rule in self._rules:
+            match = pattern.search(user_text)
+            if match:
+                groups = {key: (value or "").strip() for key, value in match.groupdict().items()}
+                agent_text, update = _fill(rule.get("agent_text", ""), groups), _fill(rule.get("cv", {}), groups)
+                break
+        else:
+            default = self.fixtures.get("default", {})
+            agent_text, update = default.get("agent_text", ""), default.get("cv", {})
+        reply = {"agent_text": agent_text}
+        if '"cv_patch"' in instruction:
+            reply["cv_patch"] = _patch_operations(update)
+        else:
+            reply["cv_json"] = update
+        reply.update(next_action="ask", language="en")
+        return json.dumps(reply, ensure_ascii=False)
+
+    def _pieces(self, content):
+        """``content`` split into ~token-sized chunks."""
+        return [content[i:i + 4] for i in range(0, len(content), 4)] or [""]
+
+    def _delay(self, pieces):
+        """Draw the wait before the first chunk; the reply's total simulated time is recorded."""
+        with self._lock:
+            delay = self._latency(self._rng)
+            self.calls += 1
+            self.simulated_seconds += delay + self.token_delay * (pieces - 1)
+        return delay
+
+    def complete(self, messages, model, temperature, max_tokens):
+        content = self.reply(messages)
+        pieces = len(self._pieces(content))
+        # A non-streamed reply arrives once the whole completion is generated.
+        time.sleep(self._delay(pieces) + self.token_delay * (pieces - 1))
+        return content
+
+    async def acomplete(self, messages, model, temperature, max_tokens):
+        content = self.reply(messages)
+        pieces = len(self._pieces(content))
+        await asyncio.sleep(self._delay(pieces) + self.token_delay * (pieces - 1))
+        return content
+
+    def stream(self, messages, model, temperature, max_tokens):
+        pieces = self._pieces(self.reply(messages))
+        time.sleep(self._delay(len(pieces)))
+        for index, piece in enumerate(pieces):
+            if index and self.token_delay:
+                time.sleep(self.token_delay)
+            yield piece
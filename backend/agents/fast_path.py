@@ -0,0 +1,226 @@
+"""
+Deterministic answers to the agent's fixed questions.
+
+When the last agent turn was one of ``agent_core.QUESTIONS`` and the reply is
+a plain structured answer (an email, a phone number, a year, a date, a
+profile link or a decline), the CV update can be read off the text without
+asking the LLM. Each extractor returns a sparse ``cv_json`` update plus a
+confidence; anything below the threshold falls back to the LLM.
+"""
+import re
+import threading
+from typing import Optional, Tuple
+
+from utils.validators import validate_email, validate_phone, validate_url
+
+_EMAIL = re.compile(r"[\w.%+-]+\s*@\s*[\w-]+(?:\s*\.\s*[\w-]+)+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{5,}\d")
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_YEAR_MONTH = re.compile(r"\b((?:19|20)\d{2})[-/.](0?[1-9]|1[0-2])\b")
+_MONTH_YEAR = re.compile(r"\b([a-z]{3,9})\.?,?\s+((?:19|20)\d{2})\b")
+_URL = re.compile(r"(?:https?://)?(?:www\.)?(github\.com|linkedin\.com)/\S+", re.IGNORECASE)
+_PRESENT = re.compile(r"\b(present|current(?:ly)?|ongoing|till (?:date|now)|still working|now)\b")
+_WORD = re.compile(r"[^\W\d_]+(?:'[a-z]+)?")
+
+_MONTHS = {
+    name: index
+    for index, names in enumerate(
+        [
+            ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+            ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+            ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+# Words a user wraps around a bare value ("my email is ...", "I finished in 2020").
+# Anything else left over means the reply may carry more than the value, so the
+# turn goes to the LLM.
+_FILLER = {
+    "a", "am", "an", "and", "at", "be", "can", "contact", "course", "did", "e", "email", "end", "ended",
+    "finish", "finished", "from", "graduated", "graduation", "here", "i", "i'm", "id", "in", "is", "it",
+    "it's", "its", "joined", "mail", "me", "mobile", "my", "no", "number", "of", "ok", "okay", "on",
+    "phone", "reach", "role", "sure", "that", "the", "this", "to", "was", "yeah", "year", "yes",
+    "you", "start", "started", "starting", "since", "completed", "complete", "passed", "out", "left",
+    "profile", "link", "github", "linkedin", "account", "um", "uh", "so", "still", "work", "working",
+    "job", "there",
+}
+
+HIGH_CONFIDENCE = 1.0
+LOW_CONFIDENCE = 0.5
+
+
+def _confidence(text: str, value_span: Tuple[int, int]) -> float:
+    residual = text[: value_span[0]] + " " + text[value_span[1]:]
+    extra = [word for word in _WORD.findall(residual.lower()) if word not in _FILLER and word not in _MONTHS]
+    return HIGH_CONFIDENCE if not extra else LOW_CONFIDENCE
+
+
+def _email(text, _):
+    match = _EMAIL.search(text)
+    if not match:
+        return None
+    valid, email = validate_email(re.sub(r"\s+", "", match.group()))
+    if not valid:
+        return None
+    return {"personal_info": {"email": email}}, _confidence(text, match.span())
+
+
+def _phone(text, _):
+    matches = _PHONE.findall(text)
+    if len(matches) != 1:
+        return None
+    valid, phone = validate_phone(matches[0])
+    if not valid:
+        return None
+    return {"personal_info": {"phone": phone}}, _confidence(text, _PHONE.search(text).span())
+
+
+def _year(field):
+    def extract(text, _):
+        matches = list(_YEAR.finditer(text))
+        if len(matches) != 1:
+            return None
+        return {"education": [{field: matches[0].group()}]}, _confidence(text, matches[0].span())
+
+    return extract
+
+
+def _date(field):
+    def extract(text, _):
+        lowered = text.lower()
+        if field == "end_date":
+            match = _PRESENT.search(lowered)
+            if match:
+                if _YEAR.search(lowered):
+                    return None
+                return {"experience": [{field: "Present"}]}, _confidence(lowered, match.span())
+
+        match = _YEAR_MONTH.search(lowered)
+        if match:
+            value = f"{match.group(1)}-{int(match.group(2)):02d}"
+        else:
+            match = _MONTH_YEAR.search(lowered)
+            if match and match.group(1) in _MONTHS:
+                value = f"{match.group(2)}-{_MONTHS[match.group(1)]:02d}"
+            else:
+                years = list(_YEAR.finditer(lowered))
+                if len(years) != 1:
+                    return None
+                match = years[0]
+                value = match.group()
+        if len(_YEAR.findall(lowered)) > 1:
+            return None
+        return {"experience": [{field: value}]}, _confidence(lowered, match.span())
+
+    return extract
+
+
+def _decline(meta_key, section):
+    def extract(text, declined):
+        if not declined.get(section):
+            return None
+        # Short replies are a plain "no"; longer ones may explain or add details.
+        confidence = HIGH_CONFIDENCE if len(text.split()) <= 6 else LOW_CONFIDENCE
+        return {"meta": {meta_key: True}, section: []}, confidence
+
+    return extract
+
+
+def _links(text):
+    """Bare GitHub/LinkedIn links are unambiguous whatever was asked."""
+    matches = list(_URL.finditer(text))
+    if not matches:
+        return None
+    personal = {}
+    residual = _URL.sub(" ", text)
+    for match in matches:
+        kind = "github" if match.group(1).lower().startswith("github") else "linkedin"
+        valid, url = validate_url(match.group().rstrip(".,;"), kind)
+        if not valid:
+            return None
+        personal[kind] = url
+    extra = [word for word in _WORD.findall(residual.lower()) if word not in _FILLER]
+    return {"personal_info": personal}, HIGH_CONFIDENCE if not extra else LOW_CONFIDENCE
+
+
+EXTRACTORS = {
+    "email": _email,
+    "phone": _phone,
+    "start_year": _year("start_year"),
+    "end_year": _year("end_year"),
+    "start_date": _date("start_date"),
+    "end_date": _date("end_date"),
+    "experience": _decline("skip_experience", "experience"),
+    "certifications": _decline("skip_certifications", "certifications"),
+}
+
+
+def extract(question_key: Optional[str], user_text: str, declined: Optional[dict] = None):
+    """
+    Return ``(cv_update, confidence)`` for a reply to ``question_key``, or None
+    when no extractor applies. ``declined`` carries the decline flags
+    AgentCore already computed, keyed by section.
+    """
+    text = (user_text or "").strip()
+    if not text:
+        return None
+    result = None
+    extractor = EXTRACTORS.get(question_key)
+    if extractor is not None:
+        result = extractor(text, declined or {})
+    if result is None:
+        result = _links(text)
+    return result
+
+
+def apply(cv_json: dict, update: dict) -> dict:
+    """
+    Return ``cv_json`` with a sparse extractor update applied, without
+    changing it: only the sections the update touches are copied, the rest
+    are shared. List updates target the first entry, which is the one the
+    fixed questions ask about.
+    """
+    merged = dict(cv_json or {})
+    for section, value in update.items():
+        if isinstance(value, dict):
+            target = merged.get(section)
+            merged[section] = {**(target if isinstance(target, dict) else {}), **value}
+        elif value == []:
+            merged[section] = []
+        else:
+            entries = merged.get(section)
+            entries = list(entries) if isinstance(entries, list) else []
+            first = entries[0] if entries and isinstance(entries[0], dict) else {}
+            entries[:1] = [{**first, **value[0]}]
+            merged[section] = entries
+    return merged
+
+
+class FastPathStats:
+    """Counts how many agent turns were answered without the LLM."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = {"turns": 0, "served": 0, "low_confidence": 0}
+        self._by_question = {}
+
+    def record(self, question_key: Optional[str], served: bool, low_confidence: bool = False) -> None:
+        with self._lock:
+            self._stats["turns"] += 1
+            if served:
+                self._stats["served"] += 1
+                self._by_question[question_key] = self._by_question.get(question_key, 0) + 1
+            elif low_confidence:
+                self._stats["low_confidence"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, by_question=dict(self._by_question))
+        stats["served_fraction"] = stats["served"] / stats["turns"] if stats["turns"] else 0.0
+        return stats
+
+
+fast_path_stats = FastPathStats()
@@ -0,0 +1,111 @@
+"""
+Phrase-list intents for the agent's turn rules (declines, confirmations,
+project follow-ups).
+
+Phrases live in intent_data/<language>.json as
+``{"intent": {"exact": [...], "prefix": [...], "contains": [...]}}``; every
+file in the folder is loaded and phrases for the same intent are merged, so
+a language is added by dropping in a file. Each intent compiles to a single
+regex, so matching is one scan of the text instead of one ``in`` test per
+phrase.
+"""
+import functools
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+DATA_DIR = Path(__file__).resolve().parent / "intent_data"
+MODES = ("exact", "prefix", "contains")
+
+
+def _trie_pattern(phrases):
+    """
+    Alternation of ``phrases`` as a character trie (``no(?: experience| work)``),
+    so the regex engine follows one branch per character instead of trying
+    every phrase at every position.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def _drop_implied(phrases, implied):
+    """Phrases that can only match where a shorter one already does add nothing to a yes/no match."""
+    phrases = sorted(set(phrases), key=len)
+    kept = []
+    for phrase in phrases:
+        if not any(implied(phrase, shorter) for shorter in kept):
+            kept.append(phrase)
+    return kept
+
+
+def compile_intent(phrases: Dict[str, List[str]]):
+    """
+    One pattern for an intent, searched against lowercased, stripped text:
+    ``exact`` phrases must be the whole text, ``prefix`` phrases start it and
+    ``contains`` phrases may appear anywhere (substring match, as in the
+    original ``phrase in text`` checks).
+    """
+    parts = []
+    if phrases.get("exact"):
+        parts.append(rf"\A{_trie_pattern(set(phrases['exact']))}\Z")
+    if phrases.get("prefix"):
+        prefixes = _drop_implied(phrases["prefix"], lambda phrase, shorter: phrase.startswith(shorter))
+        parts.append(rf"\A{_trie_pattern(prefixes)}")
+    if phrases.get("contains"):
+        contained = _drop_implied(phrases["contains"], lambda phrase, shorter: shorter in phrase)
+        parts.append(_trie_pattern(contained))
+    return re.compile("|".join(f"(?:{part})" for part in parts)) if parts else None
+
+
+class IntentMatcher:
+    """Compiled intents loaded from per-language phrase files."""
+
+    def __init__(self, intents: Dict[str, Dict[str, List[str]]]) -> None:
+        self.intents = intents
+        self._patterns = {name: compile_intent(phrases) for name, phrases in intents.items()}
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Path]) -> "IntentMatcher":
+        merged = {}
+        for path in sorted(paths):
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            for name, phrases in data.items():
+                unknown = set(phrases) - set(MODES)
+                if unknown:
+                    raise ValueError(f"{path.name}: unknown match mode(s) {sorted(unknown)} for intent {name!r}")
+                target = merged.setdefault(name, {})
+                for mode, values in phrases.items():
+                    target.setdefault(mode, []).extend(value.lower() for value in values)
+        return cls(merged)
+
+    def matches(self, intent: str, text: str) -> bool:
+        """Whether ``text`` expresses ``intent``. Unknown intents never match."""
+        pattern = self._patterns.get(intent)
+        return bool(pattern and pattern.search((text or "").lower().strip()))
+
+    def classify(self, text: str) -> set:
+        """Every intent ``text`` matches."""
+        text = (text or "").lower().strip()
+        return {name for name, pattern in self._patterns.items() if pattern and pattern.search(text)}
+
+
+@functools.lru_cache(maxsize=1)
+def get_intent_matcher() -> IntentMatcher:
+    return IntentMatcher.from_files(DATA_DIR.glob("*.json"))
@@ -0,0 +1,73 @@
+"""
+Incremental extraction of one string field from a streamed JSON object.
+
+The agent's reply is a JSON document whose ``agent_text`` value is what the
+user should see first. JSONStringFieldStream decodes that value chunk by
+chunk as the LLM streams tokens, without waiting for the document to close.
+"""
+import json
+import re
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JSONStringFieldStream:
+    """Feed raw JSON chunks; get back newly decoded characters of ``field``."""
+
+    def __init__(self, field: str) -> None:
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._position = 0
+        self._inside = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        if self.done:
+            return ""
+        self._buffer += chunk
+        if not self._inside:
+            match = self._key.search(self._buffer)
+            if match is None:
+                return ""
+            self._inside = True
+            self._position = match.end()
+
+        out = []
+        buffer = self._buffer
+        i = self._position
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != "\\":
+                out.append(char)
+                i += 1
+                continue
+            # Escape sequences may be split across chunks; wait for the rest.
+            if i + 1 >= len(buffer):
+                break
+            code = buffer[i + 1]
+            if code == "u":
+                if i + 6 > len(buffer):
+                    break
+                out.append(self._unicode(buffer, i))
+                i += 6
+                # Keep surrogate pairs together.
+                if 0xD800 <= ord(out[-1]) <= 0xDBFF:
+                    if i + 6 > len(buffer):
+                        out.pop()
+                        i -= 6
+                        break
+                    out[-1] = json.loads('"%s"' % buffer[i - 6:i + 6])
+                    i += 6
+                continue
+            out.append(_ESCAPES.get(code, code))
+            i += 2
+        self._position = i
+        return "".join(out)
+
+    @staticmethod
+    def _unicode(buffer, i):
+        return chr(int(buffer[i + 2:i + 6], 16))
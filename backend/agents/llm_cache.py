@@ -0,0 +1,208 @@
+"""
+Response cache for deterministic LLM calls.
+
+The agent and the CV refiner re-send identical prompts: the same
+instruction, history and user text, or the same unchanged cv_json to
+polish. Temperature-0 completions are keyed by a hash of (model,
+temperature, max_tokens, messages), with whitespace and Unicode form
+normalized, and served from an in-process LRU or a SQLite file shared by
+workers. Entries expire after a TTL; the least recently used go first when
+the cache is full.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+
+from utils.logger import logger
+
+
+def _normalize(text):
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(model, temperature, max_tokens, messages) -> str:
+    """Stable key for a chat call; ``messages`` are {'role', 'content'} dicts."""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [[message.get("role", "user"), _normalize(message.get("content", ""))] for message in messages],
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()).hexdigest()
+
+
+class LLMCache(ABC):
+    """Base class: hit/miss accounting around a backend's _get/_set."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self._get(key)
+        except Exception as exc:
+            logger.warning("LLM cache read failed: %s", exc)
+            value = None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self._set(key, value)
+        except Exception as exc:
+            logger.warning("LLM cache write failed: %s", exc)
+            return
+        self._count("stores")
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @abstractmethod
+    def _get(self, key):
+        """The cached value for ``key``, or None."""
+
+    @abstractmethod
+    def _set(self, key, value):
+        """Store ``value`` under ``key``."""
+
+
+class MemoryLLMCache(LLMCache):
+    """Per-process LRU."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400) -> None:
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            self._count("evictions", evicted)
+
+
+class SQLiteLLMCache(LLMCache):
+    """Cache in a SQLite file, so it survives restarts and is shared by workers on one host."""
+
+    def __init__(self, path, max_entries: int = 1024, ttl: float = 86400) -> None:
+        super().__init__(max_entries, ttl)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_used_at ON llm_cache (used_at)")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM llm_cache WHERE stored_at < ? OR key IN ("
+                "SELECT key FROM llm_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (now - self.ttl, self.max_entries),
+            )
+            evicted = cursor.rowcount
+        if evicted > 0:
+            self._count("evictions", evicted)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """The configured cache (LLM_CACHE_BACKEND: memory, sqlite or none), or None."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = getattr(settings, "LLM_CACHE_BACKEND", "memory")
+                options = {
+                    "max_entries": getattr(settings, "LLM_CACHE_SIZE", 1024),
+                    "ttl": getattr(settings, "LLM_CACHE_TTL", 86400),
+                }
+                if backend == "memory":
+                    _cache = MemoryLLMCache(**options)
+                elif backend == "sqlite":
+                    path = getattr(settings, "LLM_CACHE_PATH", None) or os.path.join(settings.BASE_DIR, "llm_cache.sqlite3")
+                    _cache = SQLiteLLMCache(path, **options)
+                elif backend == "none":
+                    _cache = False
+                else:
+                    raise ValueError(f"Unknown LLM_CACHE_BACKEND {backend!r}; choose memory, sqlite or none")
+    return _cache or None
+
+
+def cache_for(temperature) -> Optional[LLMCache]:
+    """The cache for a call at ``temperature``; sampled (non-zero) calls are never cached."""
+    if temperature != 0:
+        return None
+    return get_llm_cache()
@@ -1,9 +1,68 @@
-def get_conversation_for_agent(session):
-    """
-    Convert stored conversation into messages consumable by LLM.
-    """
-    messages = []
-    # Add system prompt to instruct agent
+"""
+Conversation context for the agent prompt.
+
+Instead of replaying the whole session every turn, the prompt carries the
+current cv_json, a running summary of older turns (cached on the session and
+refreshed every few turns) and only the most recent turns, trimmed to a
+token budget.
+
+The summary is written by an LLM call on a background thread
+(AGENT_SUMMARY_BACKGROUND), so no turn waits for it: the turn that asks for a
+refresh starts it, and a later turn of the same session picks up the result.
+Until then the unsummarized turns simply stay in the prompt.
+"""
+import functools
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+
+from django.conf import settings
+
+from utils.logger import logger
+
+# Summaries in flight, keyed by (session_id, summary_turns): (fold_until, Future).
+_MAX_PENDING_SUMMARIES = 1024
+_pending_summaries = OrderedDict()
+_summary_lock = threading.Lock()
+_summary_executor = None
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken missing, or its vocabulary cannot be downloaded.
+        return None
+
+
+def count_tokens(text):
+    """Token count for ``text``; roughly 4 characters per token without tiktoken."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages):
+    # ~4 tokens of chat-format overhead per message.
+    return sum(count_tokens(message.get("content", "")) + 4 for message in messages)
+
+
+@dataclass
+class AgentContext:
+    messages: List[dict]
+    accounting: dict = field(default_factory=dict)
+
+
+def _system_message(session):
     preferred_language = "auto"
     try:
         meta = session.cv_json.get("meta", {}) if isinstance(session.cv_json, dict) else {}
@@ -17,7 +76,7 @@ def get_conversation_for_agent(session):
         else "Mirror the user's language in every reply. "
     )
 
-    system = {
+    return {
         "role": "system",
         "content": (
             "You are a CV Assistant for blue-collar / basic education users (PUC, Diploma, Degree). "
@@ -27,8 +86,148 @@ def get_conversation_for_agent(session):
             + language_clause
         )
     }
-    messages.append(system)
-    for item in session.conversation:
-        role = "assistant" if item.get("from") == "agent" else "user"
-        messages.append({"role": role, "content": item.get("text", "")})
-    return messages
+
+
+def _cv_message(session):
+    cv_json = session.cv_json if isinstance(session.cv_json, dict) else {}
+    collected = {key: value for key, value in cv_json.items() if key != "meta" and value}
+    return {
+        "role": "system",
+        "content": "CV collected so far: " + json.dumps(collected, ensure_ascii=False, separators=(",", ":")),
+    }
+
+
+def _turn_message(item):
+    role = "assistant" if item.get("from") == "agent" else "user"
+    return {"role": role, "content": item.get("text", "")}
+
+
+def _summary_prompt(session, fold_until):
+    folded = session.get_turns(session.summary_turns, fold_until)
+    transcript = "\n".join(
+        f"{'Assistant' if item.get('from') == 'agent' else 'User'}: {item.get('text', '')}" for item in folded
+    )
+    return (
+        "Update the running summary of a CV-building conversation. Keep facts the user gave, "
+        "what they declined or asked to change, and their language. At most 120 words.\n\n"
+        f"Current summary:\n{session.context_summary or '(none)'}\n\nNew turns:\n{transcript}"
+    )
+
+
+def _summarize(prompt):
+    """The summary LLM's answer to ``prompt``, or None when the call failed."""
+    from .openai_tools import openai_chat_completion
+
+    try:
+        summary = openai_chat_completion(
+            None,
+            [{"role": "user", "content": prompt}],
+            model=getattr(settings, "AGENT_SUMMARY_MODEL", "gpt-3.5-turbo"),
+            temperature=0,
+        )
+    except Exception as exc:
+        # The cv_json message still carries every collected fact; retry next turn.
+        logger.warning("Conversation summary failed: %s", exc)
+        return None
+    return summary.strip()
+
+
+def _refresh_summary(session, fold_until):
+    """Fold conversation[summary_turns:fold_until] into session.context_summary."""
+    summary = _summarize(_summary_prompt(session, fold_until))
+    if summary is not None:
+        session.context_summary = summary
+        session.summary_turns = fold_until
+
+
+def _get_summary_executor():
+    global _summary_executor
+    if _summary_executor is None:
+        with _summary_lock:
+            if _summary_executor is None:
+                _summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-summary")
+    return _summary_executor
+
+
+def _refresh_summary_in_background(session, fold_until):
+    """
+    _refresh_summary without waiting for the LLM: apply a summary this session
+    finished since an earlier turn, else start one (the turns to fold are read
+    here, the LLM call runs on the summary thread).
+    """
+    key = (getattr(session, "session_id", id(session)), session.summary_turns)
+    with _summary_lock:
+        pending = _pending_summaries.get(key)
+        if pending is not None and pending[1].done():
+            del _pending_summaries[key]
+    if pending is not None:
+        folded_until, future = pending
+        if not future.done():
+            return
+        if future.result() is not None:
+            session.context_summary = future.result()
+            session.summary_turns = folded_until
+            return
+        # The call failed; start over below.
+    future = _get_summary_executor().submit(_summarize, _summary_prompt(session, fold_until))
+    with _summary_lock:
+        _pending_summaries[key] = (fold_until, future)
+        while len(_pending_summaries) > _MAX_PENDING_SUMMARIES:
+            _pending_summaries.popitem(last=False)
+
+
+def build_agent_context(session, keep_turns=None, token_budget=None):
+    """
+    Messages for the next agent call: system prompt, current cv_json, the
+    running summary and the last ``keep_turns`` turns. Older recent turns are
+    dropped first when the total exceeds ``token_budget``.
+
+    May update ``session.context_summary`` / ``session.summary_turns``; the
+    caller saves the session.
+    """
+    keep_turns = keep_turns if keep_turns is not None else getattr(settings, "AGENT_CONTEXT_TURNS", 8)
+    token_budget = token_budget if token_budget is not None else getattr(settings, "AGENT_CONTEXT_TOKEN_BUDGET", 3000)
+    summarize_every = getattr(settings, "AGENT_SUMMARY_EVERY", 10)
+
+    window_start = max(session.turn_count - keep_turns, 0)
+    if window_start - session.summary_turns >= summarize_every:
+        if getattr(settings, "AGENT_SUMMARY_BACKGROUND", True):
+            _refresh_summary_in_background(session, window_start)
+        else:
+            _refresh_summary(session, window_start)
+    # Anything before the window that has not been summarized yet stays in the
+    # prompt until the next refresh, so no turn silently disappears.
+    window_start = min(window_start, session.summary_turns)
+
+    head = [_system_message(session), _cv_message(session)]
+    if session.context_summary:
+        head.append({"role": "system", "content": "Earlier in this conversation: " + session.context_summary})
+    turns = [_turn_message(item) for item in session.get_turns(window_start)]
+
+    head_tokens = count_message_tokens(head)
+    turn_tokens = [count_message_tokens([turn]) for turn in turns]
+    dropped = 0
+    # Always keep the newest turn, even over budget.
+    while len(turns) - dropped > 1 and head_tokens + sum(turn_tokens[dropped:]) > token_budget:
+        dropped += 1
+
+    messages = head + turns[dropped:]
+    accounting = {
+        "system_tokens": count_message_tokens(head[:1]),
+        "cv_tokens": count_message_tokens(head[1:2]),
+        "summary_tokens": count_message_tokens(head[2:]),
+        "turn_tokens": sum(turn_tokens[dropped:]),
+        "turns_included": len(turns) - dropped,
+        "turns_dropped": dropped,
+        "turns_summarized": session.summary_turns,
+        "budget": token_budget,
+    }
+    accounting["context_tokens"] = head_tokens + accounting["turn_tokens"]
+    return AgentContext(messages=messages, accounting=accounting)
+
+
+def get_conversation_for_agent(session):
+    """
+    Convert stored conversation into messages consumable by LLM.
+    """
+    return build_agent_context(session).messages
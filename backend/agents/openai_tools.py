@@ -1,7 +1,14 @@
+import asyncio
 import json
+import threading
+import weakref
+from abc import ABC, abstractmethod
 
+import httpx
 from django.conf import settings
 
+from .llm_cache import cache_for, cache_key
+
 try:
     # Newer split packages (recommended)
     from langchain_openai import ChatOpenAI
@@ -22,8 +29,187 @@ except ImportError:
     from langchain.schema import HumanMessage, SystemMessage, AIMessage  # type: ignore
 
 
+# One pooled HTTP client per process, shared by every LLM client below, so
+# calls reuse keep-alive connections instead of opening a TLS session each time.
+_http_client = None
+_openai_client = None
+_chat_clients = {}
+# Async clients are bound to the event loop they first ran on, and runserver /
+# WSGI workers serve async views through async_to_sync with a new loop per
+# request: event loop -> (httpx.AsyncClient, {(model, temperature, max_tokens): ChatOpenAI}).
+_async_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide pooled httpx client used for OpenAI calls."""
+    global _http_client
+    if _http_client is None:
+        with _clients_lock:
+            if _http_client is None:
+                max_connections = getattr(settings, "OPENAI_MAX_CONNECTIONS", 20)
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                    ),
+                    timeout=getattr(settings, "OPENAI_TIMEOUT", 60.0),
+                )
+    return _http_client
+
+
+def _loop_clients():
+    """The (httpx.AsyncClient, ChatOpenAI by key) pair for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.get(loop)
+        if clients is None:
+            # Pooled connections can keep a finished loop alive; drop those entries.
+            for closed in [other for other in _async_clients.keys() if other.is_closed()]:
+                del _async_clients[closed]
+            max_connections = getattr(settings, "OPENAI_MAX_CONNECTIONS", 20)
+            http_async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                timeout=getattr(settings, "OPENAI_TIMEOUT", 60.0),
+            )
+            clients = _async_clients[loop] = (http_async_client, {})
+    return clients
+
+
+def get_async_http_client():
+    """Async counterpart of get_http_client: the pooled client of the running event loop."""
+    return _loop_clients()[0]
+
+
+def _new_chat_client(model, temperature, max_tokens, http_client, http_async_client=None):
+    options = {"http_async_client": http_async_client} if http_async_client is not None else {}
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=settings.OPENAI_API_KEY,
+        openai_api_base=getattr(settings, "OPENAI_BASE_URL", None),
+        max_tokens=max_tokens,
+        http_client=http_client,
+        **options,
+    )
+
+
+def get_chat_client(model="gpt-3.5-turbo", temperature=0, max_tokens=800):
+    """Return a shared ChatOpenAI for (model, temperature, max_tokens), for invoke/stream."""
+    key = (model, temperature, max_tokens)
+    llm = _chat_clients.get(key)
+    if llm is None:
+        http_client = get_http_client()
+        with _clients_lock:
+            llm = _chat_clients.get(key)
+            if llm is None:
+                llm = _chat_clients[key] = _new_chat_client(model, temperature, max_tokens, http_client)
+    return llm
+
+
+def get_async_chat_client(model="gpt-3.5-turbo", temperature=0, max_tokens=800):
+    """ChatOpenAI for ainvoke/astream, shared within the running event loop."""
+    http_async_client, chat_clients = _loop_clients()
+    key = (model, temperature, max_tokens)
+    llm = chat_clients.get(key)
+    if llm is None:
+        llm = chat_clients[key] = _new_chat_client(
+            model, temperature, max_tokens, get_http_client(), http_async_client=http_async_client
+        )
+    return llm
+
+
+def get_openai_client():
+    """Return a shared raw OpenAI client on the same connection pool."""
+    global _openai_client
+    if _openai_client is None:
+        http_client = get_http_client()
+        with _clients_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+
+                _openai_client = OpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    base_url=getattr(settings, "OPENAI_BASE_URL", None),
+                    http_client=http_client,
+                )
+    return _openai_client
+
+
+# Completion budget for every agent, summary and refinement call.
+MAX_TOKENS = 800
+
+
+class ChatBackend(ABC):
+    """
+    Where chat completions come from. ``messages`` are {'role', 'content'}
+    dicts with any system prompt already first; every method returns or
+    yields the assistant's content. Selected with LLM_BACKEND.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def complete(self, messages, model, temperature, max_tokens):
+        """The assistant's reply."""
+
+    @abstractmethod
+    async def acomplete(self, messages, model, temperature, max_tokens):
+        """The assistant's reply, without blocking the event loop."""
+
+    @abstractmethod
+    def stream(self, messages, model, temperature, max_tokens):
+        """Yield the assistant's reply in pieces as they arrive."""
+
+
+class OpenAIChatBackend(ChatBackend):
+    """The OpenAI API via LangChain's ChatOpenAI on the pooled clients."""
+
+    name = "openai"
+
+    def complete(self, messages, model, temperature, max_tokens):
+        llm = get_chat_client(model=model, temperature=temperature, max_tokens=max_tokens)
+        # Newer langchain-openai uses .invoke instead of direct __call__
+        return llm.invoke(_to_langchain_messages(None, messages)).content
+
+    async def acomplete(self, messages, model, temperature, max_tokens):
+        llm = get_async_chat_client(model=model, temperature=temperature, max_tokens=max_tokens)
+        response = await llm.ainvoke(_to_langchain_messages(None, messages))
+        return response.content
+
+    def stream(self, messages, model, temperature, max_tokens):
+        llm = get_chat_client(model=model, temperature=temperature, max_tokens=max_tokens)
+        for chunk in llm.stream(_to_langchain_messages(None, messages)):
+            if chunk.content:
+                yield chunk.content
+
+
+_backend = None
+
+
+def get_llm_backend():
+    """The configured ChatBackend (LLM_BACKEND: openai or fake)."""
+    global _backend
+    if _backend is None:
+        with _clients_lock:
+            if _backend is None:
+                name = getattr(settings, "LLM_BACKEND", "openai")
+                if name == "openai":
+                    _backend = OpenAIChatBackend()
+                elif name == "fake":
+                    from .fake_llm import FakeChatBackend
+
+                    _backend = FakeChatBackend.from_settings()
+                else:
+                    raise ValueError(f"Unknown LLM_BACKEND {name!r}; choose openai or fake")
+    return _backend
+
+
 def openai_chat_completion(system_prompt, messages, model="gpt-3.5-turbo", temperature=0):
-    """Call an LLM via LangChain's ChatOpenAI.
+    """Call an LLM through the configured backend (LangChain's ChatOpenAI by default).
 
     Args:
         system_prompt: Optional high-level system instruction.
@@ -33,15 +219,78 @@ def openai_chat_completion(system_prompt, messages, model="gpt-3.5-turbo", tempe
 
     Returns:
         str: The assistant's message content.
+
+    Temperature-0 calls are answered from the LLM cache when the same
+    prompt was sent before.
     """
+    backend = get_llm_backend()
+    messages = _with_system_prompt(system_prompt, messages)
+    cache, key = _cache_lookup(backend, messages, model, temperature)
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return content
 
-    llm = ChatOpenAI(
-        model=model,
-        temperature=temperature,
-        openai_api_key=settings.OPENAI_API_KEY,
-        max_tokens=800,
-    )
+    content = backend.complete(messages, model=model, temperature=temperature, max_tokens=MAX_TOKENS)
+    if cache is not None:
+        cache.set(key, content)
+    return content
+
+
+async def aopenai_chat_completion(system_prompt, messages, model="gpt-3.5-turbo", temperature=0):
+    """Async openai_chat_completion: awaits the API without holding a thread."""
+    backend = get_llm_backend()
+    messages = _with_system_prompt(system_prompt, messages)
+    cache, key = _cache_lookup(backend, messages, model, temperature)
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            return content
+
+    content = await backend.acomplete(messages, model=model, temperature=temperature, max_tokens=MAX_TOKENS)
+    if cache is not None:
+        cache.set(key, content)
+    return content
+
+
+def openai_chat_completion_stream(system_prompt, messages, model="gpt-3.5-turbo", temperature=0):
+    """
+    Like openai_chat_completion, but yields content chunks as they arrive. A
+    cached reply is yielded as a single chunk.
+    """
+    backend = get_llm_backend()
+    messages = _with_system_prompt(system_prompt, messages)
+    cache, key = _cache_lookup(backend, messages, model, temperature)
+    if cache is not None:
+        content = cache.get(key)
+        if content is not None:
+            yield content
+            return
 
+    chunks = []
+    for chunk in backend.stream(messages, model=model, temperature=temperature, max_tokens=MAX_TOKENS):
+        chunks.append(chunk)
+        yield chunk
+    if cache is not None:
+        cache.set(key, "".join(chunks))
+
+
+def _with_system_prompt(system_prompt, messages):
+    if system_prompt:
+        return [{"role": "system", "content": system_prompt}, *messages]
+    return list(messages)
+
+
+def _cache_lookup(backend, messages, model, temperature):
+    """``(cache, key)`` for a chat call, or ``(None, None)`` when it is not cacheable."""
+    cache = cache_for(temperature)
+    if cache is None:
+        return None, None
+    # Keyed per backend, so replies from the fake never answer real calls.
+    return cache, cache_key(f"{backend.name}:{model}", temperature, MAX_TOKENS, messages)
+
+
+def _to_langchain_messages(system_prompt, messages):
     lc_messages = []
 
     if system_prompt:
@@ -56,17 +305,10 @@ def openai_chat_completion(system_prompt, messages, model="gpt-3.5-turbo", tempe
             lc_messages.append(AIMessage(content=content))
         else:
             lc_messages.append(HumanMessage(content=content))
+    return lc_messages
 
-    # Newer langchain-openai uses .invoke instead of direct __call__
-    response = llm.invoke(lc_messages)
-    return response.content
-
-
-def openai_refine_cv(cv_json, target_language="auto", model=None, temperature=0.2):
-    """Ask OpenAI to polish CV content while preserving schema."""
-
-    model_name = model or getattr(settings, "OPENAI_CV_MODEL", "gpt-4o-mini")
 
+def _refine_cv_prompt(cv_json, target_language):
     system_prompt = (
         "You are an expert resume writer. Improve the provided CV JSON so it looks professional "
         "and is written in the requested language. Preserve the same keys and structure."
@@ -83,15 +325,42 @@ def openai_refine_cv(cv_json, target_language="auto", model=None, temperature=0.
         + "\nInput CV JSON:\n"
         + json.dumps(cv_json, ensure_ascii=False)
     )
+    return system_prompt, [{"role": "user", "content": user_content}]
 
+
+def _parse_refinement(response):
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"OpenAI CV refinement returned invalid JSON: {exc}")
+
+
+def openai_refine_cv(cv_json, target_language="auto", model=None, temperature=0):
+    """
+    Ask OpenAI to polish CV content while preserving schema. At the default
+    temperature 0, refining an unchanged cv_json again is a cache hit.
+    """
+
+    model_name = model or getattr(settings, "OPENAI_CV_MODEL", "gpt-4o-mini")
+    system_prompt, messages = _refine_cv_prompt(cv_json, target_language)
     response = openai_chat_completion(
         system_prompt,
-        messages=[{"role": "user", "content": user_content}],
+        messages=messages,
         model=model_name,
         temperature=temperature,
     )
+    return _parse_refinement(response)
 
-    try:
-        return json.loads(response)
-    except json.JSONDecodeError as exc:
-        raise ValueError(f"OpenAI CV refinement returned invalid JSON: {exc}")
+
+async def aopenai_refine_cv(cv_json, target_language="auto", model=None, temperature=0):
+    """Async openai_refine_cv."""
+
+    model_name = model or getattr(settings, "OPENAI_CV_MODEL", "gpt-4o-mini")
+    system_prompt, messages = _refine_cv_prompt(cv_json, target_language)
+    response = await aopenai_chat_completion(
+        system_prompt,
+        messages=messages,
+        model=model_name,
+        temperature=temperature,
+    )
+    return _parse_refinement(response)
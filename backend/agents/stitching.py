@@ -0,0 +1,79 @@
+"""
+Merge word-timestamped transcripts from overlapping audio windows.
+"""
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+_NORMALIZE = re.compile(r"[^\w']+", re.UNICODE)
+
+
+@dataclass
+class Word:
+    start: float
+    end: float
+    text: str
+
+    @property
+    def midpoint(self) -> float:
+        return (self.start + self.end) / 2
+
+
+def _normalize(text: str) -> str:
+    return _NORMALIZE.sub("", text).lower()
+
+
+class TranscriptStitcher:
+    """
+    Commit each word of a stream exactly once across overlapping windows.
+
+    When a window is cut hard, the next window starts ``overlap`` seconds
+    earlier so the words around the cut are decoded with context on both
+    sides. Words are committed by midpoint: the earlier window owns everything
+    before the middle of the overlap, the later window owns the rest. A word
+    straddling the seam that both windows still emit is dropped by comparing
+    its text and timing against the last committed word.
+    """
+
+    def __init__(self, duplicate_gap: float = 0.25) -> None:
+        self.duplicate_gap = duplicate_gap
+        self.reset()
+
+    def reset(self, position: float = 0.0) -> None:
+        self.committed_until = position
+        self._last: Optional[Word] = None
+
+    def add_window(
+        self,
+        words: Iterable[Word],
+        window_start: float,
+        commit_until: float,
+    ) -> str:
+        """
+        ``words`` carry times relative to ``window_start`` (seconds on the
+        stream timeline). Words whose midpoint falls in
+        [committed_until, commit_until) are emitted; later words are left for
+        the next window.
+        """
+        committed: List[str] = []
+        for word in words:
+            absolute = Word(window_start + word.start, window_start + word.end, word.text)
+            if absolute.midpoint < self.committed_until:
+                continue
+            if absolute.midpoint >= commit_until:
+                break
+            if self._is_duplicate(absolute):
+                continue
+            committed.append(absolute.text)
+            self._last = absolute
+        self.committed_until = max(self.committed_until, commit_until)
+        return "".join(committed).strip()
+
+    def _is_duplicate(self, word: Word) -> bool:
+        last = self._last
+        if last is None:
+            return False
+        return (
+            _normalize(word.text) == _normalize(last.text)
+            and word.start - last.end < self.duplicate_gap
+        )
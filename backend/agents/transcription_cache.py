@@ -0,0 +1,177 @@
+"""
+Content-addressed cache of Whisper transcripts.
+
+Entries are keyed by a hash of the audio bytes plus every decoding option that
+can change the text (model, compute type, language, beam size), so retried
+uploads and repeated fixtures skip the Whisper pass entirely.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from utils.logger import logger
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def audio_digest(audio) -> str:
+    """SHA-256 of raw audio bytes, a float32 array, a file path or an UploadedFile."""
+    digest = hashlib.sha256()
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest.update(audio)
+    elif isinstance(audio, np.ndarray):
+        array = np.ascontiguousarray(audio)
+        digest.update(f"{array.dtype.str}:{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    elif isinstance(audio, (str, os.PathLike)):
+        with open(audio, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+    elif hasattr(audio, "chunks"):
+        for chunk in audio.chunks():
+            digest.update(chunk)
+        audio.seek(0)
+    else:
+        raise TypeError(f"cannot hash audio of type {type(audio).__name__}")
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+    In-memory LRU with an optional on-disk tier (one JSON file per entry).
+
+    The disk tier holds about ``max_disk_entries`` files (0 for no limit): a
+    write that takes it over the limit deletes the least recently used files,
+    by mtime, down to 90% of it. Disk hits refresh a file's mtime.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None, max_disk_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+        # Files in the disk tier, counted on the first write; other processes
+        # sharing the directory are only seen when it is pruned.
+        self._disk_entries = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(digest: str, **options) -> str:
+        payload = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.sha256(f"{digest}|{payload}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, text)
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember(key, text)
+        self._write_disk(key, text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                text = json.load(handle)["text"]
+            os.utime(path)
+            return text
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key, text):
+        if not self.directory:
+            return
+        # Like a failed read, a failed write only costs a future miss.
+        path = self._path(key)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"text": text}, handle, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as exc:
+            logger.warning("Transcription cache write failed for %s: %s", key, exc)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+        if self.max_disk_entries <= 0:
+            return
+        with self._lock:
+            if self._disk_entries is not None:
+                self._disk_entries += 1
+            prune = self._disk_entries is None or self._disk_entries > self.max_disk_entries
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the least recently used disk entries (by mtime) down to 90% of max_disk_entries."""
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.stat(path).st_mtime, path))
+                    except OSError:
+                        pass
+        removed = 0
+        if len(files) > self.max_disk_entries:
+            files.sort()
+            for _, path in files[: len(files) - int(self.max_disk_entries * 0.9)]:
+                try:
+                    os.unlink(path)
+                    removed += 1
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_entries = len(files) - removed
+            self._stats["disk_evictions"] += removed
@@ -0,0 +1,80 @@
+"""
+Decoding policy for Whisper: beam size per chunk and per-session language pinning.
+"""
+import functools
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Latency/accuracy trade-offs selectable with TRANSCRIPTION_PROFILE.
+PROFILES = {
+    # Greedy everywhere: lowest latency, for slow CPUs.
+    "latency": {"partial_beam_size": 1, "final_beam_size": 1, "short_seconds": 0.0},
+    # Greedy for partial and short chunks, beam search for final utterances.
+    "balanced": {"partial_beam_size": 1, "final_beam_size": 5, "short_seconds": 2.0},
+    # The original behaviour: beam search on everything.
+    "accuracy": {"partial_beam_size": 5, "final_beam_size": 5, "short_seconds": 0.0},
+}
+
+_LANGUAGE_CODE = re.compile(r"^[a-z]{2,3}$")
+
+
+@functools.lru_cache(maxsize=1)
+def _whisper_languages():
+    try:
+        from faster_whisper.tokenizer import _LANGUAGE_CODES
+    except ImportError:
+        return None
+    return frozenset(_LANGUAGE_CODES)
+
+
+def whisper_language(code) -> Optional[str]:
+    """Map a stored preference such as 'te' or 'EN' to a Whisper language code, or None."""
+    if not isinstance(code, str):
+        return None
+    code = code.strip().lower().split("-")[0]
+    if code == "auto" or not _LANGUAGE_CODE.match(code):
+        return None
+    languages = _whisper_languages()
+    if languages is not None and code not in languages:
+        return None
+    return code
+
+
+@dataclass
+class TranscriptionPolicy:
+    partial_beam_size: int = 1
+    final_beam_size: int = 5
+    # Final chunks shorter than this are decoded greedily too.
+    short_seconds: float = 2.0
+    # Detected languages below this probability are not pinned.
+    min_language_probability: float = 0.7
+
+    @classmethod
+    def from_profile(cls, name: Optional[str]) -> "TranscriptionPolicy":
+        if name not in PROFILES:
+            raise ValueError(f"Unknown transcription profile {name!r}; choose from {', '.join(PROFILES)}")
+        return cls(**PROFILES[name])
+
+    def beam_size(self, duration: Optional[float] = None, final: bool = True) -> int:
+        if not final:
+            return self.partial_beam_size
+        if duration is not None and duration < self.short_seconds:
+            return self.partial_beam_size
+        return self.final_beam_size
+
+
+class SessionLanguage:
+    """
+    Tracks the language for one session: the stored preference if there is
+    one, otherwise the first confident detection. Once pinned, Whisper skips
+    language detection on every later chunk.
+    """
+
+    def __init__(self, preferred=None, min_probability: float = 0.7) -> None:
+        self.language = whisper_language(preferred)
+        self.min_probability = min_probability
+
+    def observe(self, language, probability) -> None:
+        if self.language is None and probability is not None and probability >= self.min_probability:
+            self.language = whisper_language(language)
@@ -0,0 +1,290 @@
+"""
+Shared Whisper inference pool.
+
+A bounded queue feeds N worker processes, each holding its own WhisperModel.
+Short in-memory utterances that share decoding options are batched together
+through faster-whisper's BatchedInferencePipeline, so concurrent sessions
+share encoder/decoder passes instead of contending on one model.
+"""
+import bisect
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from utils.logger import logger
+
+SAMPLE_RATE = 16000
+
+class TranscriptionResult(NamedTuple):
+    text: str
+    language: Optional[str] = None
+    language_probability: Optional[float] = None
+    # (start, end, word) tuples, only when word timestamps were requested.
+    words: Optional[List[Tuple[float, float, str]]] = None
+
+
+def run_model(model, audio, options) -> TranscriptionResult:
+    """Run one transcription on ``model`` and collect the lazy segment generator."""
+    segments, info = model.transcribe(audio, **options)
+    segments = list(segments)
+    words = None
+    if options.get("word_timestamps"):
+        words = [(w.start, w.end, w.word) for seg in segments for w in (seg.words or [])]
+    return TranscriptionResult(
+        text=" ".join(seg.text.strip() for seg in segments),
+        language=getattr(info, "language", None),
+        language_probability=getattr(info, "language_probability", None),
+        words=words,
+    )
+
+
+# Per-process model handles, populated by _init_worker inside each worker.
+_worker_model = None
+_worker_pipeline = None
+
+
+def _init_worker(model_size, device, compute_type, cpu_threads):
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+
+
+def _worker_transcribe(audio, options):
+    return run_model(_worker_model, audio, options)
+
+
+def _worker_transcribe_batch(audios, options, batch_size):
+    """Transcribe several utterances in one batched pass, one result per input."""
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        from faster_whisper import BatchedInferencePipeline
+
+        _worker_pipeline = BatchedInferencePipeline(_worker_model)
+
+    starts = []
+    clips = []
+    offset = 0
+    for audio in audios:
+        starts.append(offset / SAMPLE_RATE)
+        clips.append({"start": offset / SAMPLE_RATE, "end": (offset + audio.size) / SAMPLE_RATE})
+        offset += audio.size
+
+    segments, _ = _worker_pipeline.transcribe(
+        np.concatenate(audios),
+        clip_timestamps=clips,
+        batch_size=batch_size,
+        **options,
+    )
+    texts = [[] for _ in audios]
+    for seg in segments:
+        midpoint = (seg.start + seg.end) / 2
+        index = max(bisect.bisect_right(starts, midpoint) - 1, 0)
+        texts[index].append(seg.text.strip())
+    language = options.get("language")
+    return [TranscriptionResult(" ".join(parts), language, 1.0) for parts in texts]
+
+
+@dataclass
+class TranscriptionJob:
+    audio: Union[str, np.ndarray]
+    language: Optional[str]
+    beam_size: int
+    word_timestamps: bool = False
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def options(self):
+        options = {"language": self.language, "beam_size": self.beam_size}
+        if self.word_timestamps:
+            options["word_timestamps"] = True
+        return options
+
+
+class TranscriptionScheduler:
+    """Queue transcription requests onto a pool of Whisper worker processes."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 64,
+        batch_size: int = 8,
+        batch_window_ms: int = 20,
+        batch_max_seconds: float = 20.0,
+        model_size: str = "small",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+    ) -> None:
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window_ms / 1000
+        self.batch_max_samples = int(batch_max_seconds * SAMPLE_RATE)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, device, compute_type, cpu_threads),
+        )
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "batches": 0,
+            "batched_jobs": 0,
+            "in_flight": 0,
+            "max_queue_depth": 0,
+            "total_wait_seconds": 0.0,
+        }
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="whisper-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, audio, language=None, beam_size=5, word_timestamps=False, timeout=None) -> Future:
+        """
+        Enqueue a file path or 16 kHz float32 array. The future resolves to a
+        TranscriptionResult; ``words`` is filled when ``word_timestamps`` is set.
+        Raises queue.Full when the queue stays full for ``timeout`` seconds.
+        """
+        if isinstance(audio, np.ndarray):
+            # Callers may pass views into reusable buffers; take our own copy.
+            audio = np.array(audio, dtype=np.float32)
+        job = TranscriptionJob(
+            audio=audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+        )
+        self._queue.put(job, timeout=timeout)
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+        return job.future
+
+    def transcribe(self, audio, language=None, beam_size=5, word_timestamps=False, timeout=None) -> TranscriptionResult:
+        return self.submit(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+            timeout=timeout,
+        ).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        finished = stats["completed"] + stats["failed"]
+        stats["avg_wait_seconds"] = stats.pop("total_wait_seconds") / finished if finished else 0.0
+        stats["avg_batch_size"] = stats["batched_jobs"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def shutdown(self, wait=True) -> None:
+        self._queue.put(None)
+        if wait:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def _batch_key(self, job):
+        """Jobs can share a batch only if they are short arrays with a pinned language."""
+        if not isinstance(job.audio, np.ndarray) or job.language is None or job.word_timestamps:
+            return None
+        if job.audio.size > self.batch_max_samples:
+            return None
+        return (job.language, job.beam_size)
+
+    def _dispatch_loop(self):
+        carried = None
+        stopping = False
+        while not stopping:
+            job = carried or self._queue.get()
+            carried = None
+            if job is None:
+                break
+
+            # Wait for a free worker; requests pile up meanwhile and batch better.
+            self._slots.acquire()
+            batch = [job]
+            key = self._batch_key(job)
+            if key is not None:
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.batch_size:
+                    try:
+                        nxt = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    if nxt is None:
+                        stopping = True
+                        break
+                    if self._batch_key(nxt) != key:
+                        carried = nxt
+                        break
+                    batch.append(nxt)
+            self._run(batch)
+
+    def _run(self, batch):
+        batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+        if not batch:
+            self._slots.release()
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._stats["in_flight"] += len(batch)
+            self._stats["total_wait_seconds"] += sum(now - job.enqueued_at for job in batch)
+            if len(batch) > 1:
+                self._stats["batches"] += 1
+                self._stats["batched_jobs"] += len(batch)
+
+        try:
+            if len(batch) == 1:
+                pending = self._executor.submit(_worker_transcribe, batch[0].audio, batch[0].options)
+            else:
+                pending = self._executor.submit(
+                    _worker_transcribe_batch,
+                    [job.audio for job in batch],
+                    batch[0].options,
+                    self.batch_size,
+                )
+        except Exception as exc:
+            self._finish(batch, error=exc)
+            return
+        pending.add_done_callback(lambda done: self._collect(batch, done))
+
+    def _collect(self, batch, done):
+        try:
+            result = done.result()
+        except Exception as exc:
+            logger.warning("Whisper worker failed: %s", exc)
+            self._finish(batch, error=exc)
+            return
+        results = [result] if len(batch) == 1 else result
+        self._finish(batch, results=results)
+
+    def _finish(self, batch, results=None, error=None):
+        for index, job in enumerate(batch):
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(results[index])
+        with self._lock:
+            self._stats["in_flight"] -= len(batch)
+            self._stats["failed" if error is not None else "completed"] += len(batch)
+        self._slots.release()
@@ -0,0 +1,214 @@
+"""
+Server-side text-to-speech off the request path.
+
+pyttsx3 engines are not thread-safe and ``runAndWait()`` blocks the caller, so
+a single worker thread owns the engine and renders queued text to WAV bytes.
+Rendered audio is kept in an LRU keyed by (voice, rate, text); the agent's
+fixed question catalogue is rendered at warm-up so most replies are served
+straight from the cache. With a shared ``store`` (a Django cache, see
+TTS_CACHE_ALIAS) rendered audio and in-flight renders are also published
+there, so any worker can answer a poll for audio another worker rendered.
+"""
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Iterable, Optional, Tuple
+
+from utils.logger import logger
+
+_STOP = object()
+
+
+def audio_key(key: str) -> str:
+    """Store key of the rendered audio for ``key``."""
+    return f"tts:audio:{key}"
+
+
+def pending_key(key: str) -> str:
+    """Store key marking ``key`` as queued for rendering on some worker."""
+    return f"tts:pending:{key}"
+
+
+class TTSService:
+    """Render text to audio bytes on one background thread, with a result cache."""
+
+    def __init__(
+        self,
+        voice: Optional[str] = None,
+        rate: Optional[int] = None,
+        max_entries: int = 256,
+        max_queue: int = 64,
+        store=None,
+        store_ttl: float = 86400,
+        pending_ttl: float = 120,
+    ) -> None:
+        self.voice = voice
+        self.rate = rate
+        self.max_entries = max_entries
+        self.store = store
+        self.store_ttl = store_ttl
+        self.pending_ttl = pending_ttl
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "rendered": 0, "failed": 0, "evictions": 0}
+        self._worker = threading.Thread(target=self._work_loop, name="tts-worker", daemon=True)
+        self._worker.start()
+
+    def key(self, text: str, voice: Optional[str] = None, rate: Optional[int] = None) -> str:
+        voice = voice or self.voice or ""
+        rate = rate or self.rate or ""
+        return hashlib.sha256(f"{voice}|{rate}|{text}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for ``key``, or None if it is not rendered (yet)."""
+        with self._lock:
+            audio = self._cache.get(key)
+            if audio is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return audio
+        audio = self._store_call("get", audio_key(key))
+        with self._lock:
+            if audio is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._remember(key, audio)
+            return audio
+
+    def is_pending(self, key: str) -> bool:
+        with self._lock:
+            if key in self._pending:
+                return True
+        return self._store_call("get", pending_key(key)) is not None
+
+    def submit(self, text: str, voice: Optional[str] = None, rate: Optional[int] = None) -> Tuple[str, Future]:
+        """
+        Queue ``text`` for rendering and return ``(key, future)``. The future
+        resolves to WAV bytes; cached and in-flight texts are not rendered twice.
+        Raises queue.Full when the worker is saturated.
+        """
+        key = self.key(text, voice, rate)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(self._cache[key])
+                return key, future
+            if key in self._pending:
+                return key, self._pending[key]
+            future = Future()
+            self._pending[key] = future
+        try:
+            self._queue.put_nowait(("render", key, text, voice or self.voice, rate or self.rate, future))
+        except queue.Full:
+            with self._lock:
+                self._pending.pop(key, None)
+            raise
+        self._store_call("set", pending_key(key), 1, self.pending_ttl)
+        return key, future
+
+    def render(self, text: str, voice: Optional[str] = None, rate: Optional[int] = None, timeout=None) -> bytes:
+        return self.submit(text, voice, rate)[1].result(timeout=timeout)
+
+    def prerender(self, texts: Iterable[str]) -> None:
+        """Queue every text for rendering without waiting for the results."""
+        for text in texts:
+            try:
+                self.submit(text)
+            except queue.Full:
+                logger.warning("TTS queue full; stopped pre-rendering")
+                return
+
+    def speak(self, text: str) -> None:
+        """Play ``text`` on the server's audio device from the worker thread."""
+        self._queue.put(("speak", None, text, self.voice, self.rate, None))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._cache), pending=len(self._pending))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._queue.put(_STOP)
+        if wait:
+            self._worker.join()
+
+    def _work_loop(self):
+        engine = None
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            kind, key, text, voice, rate, future = item
+            try:
+                if engine is None:
+                    import pyttsx3
+
+                    engine = pyttsx3.init()
+                self._configure(engine, voice, rate)
+                if kind == "speak":
+                    engine.say(text)
+                    engine.runAndWait()
+                    continue
+                audio = self._render(engine, text)
+            except Exception as exc:
+                logger.warning("TTS rendering failed: %s", exc)
+                if future is not None:
+                    with self._lock:
+                        self._pending.pop(key, None)
+                        self._stats["failed"] += 1
+                    self._store_call("delete", pending_key(key))
+                    future.set_exception(exc)
+                continue
+            self._store_call("set", audio_key(key), audio, self.store_ttl)
+            self._store_call("delete", pending_key(key))
+            with self._lock:
+                self._pending.pop(key, None)
+                self._stats["rendered"] += 1
+                self._remember(key, audio)
+            future.set_result(audio)
+
+    def _store_call(self, method, *args):
+        """Call the shared store; it is optional, so its failures only cost sharing."""
+        if self.store is None:
+            return None
+        try:
+            return getattr(self.store, method)(*args)
+        except Exception as exc:
+            logger.warning("TTS store %s failed: %s", method, exc)
+            return None
+
+    @staticmethod
+    def _configure(engine, voice, rate):
+        if voice:
+            engine.setProperty("voice", voice)
+        if rate:
+            engine.setProperty("rate", rate)
+
+    @staticmethod
+    def _render(engine, text):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            engine.save_to_file(text, path)
+            engine.runAndWait()
+            with open(path, "rb") as handle:
+                return handle.read()
+        finally:
+            os.remove(path)
+
+    def _remember(self, key, audio):
+        self._cache[key] = audio
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self._stats["evictions"] += 1
@@ -0,0 +1,92 @@
+"""
+Energy-based voice activity detection for streamed audio.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class VADDecision:
+    keep: bool
+    end_of_utterance: bool = False
+    # True when the utterance was cut at max length rather than at silence.
+    forced: bool = False
+
+
+class EnergyVADSegmenter:
+    """
+    Classifies short analysis windows (``window_ms``) as speech or silence and
+    tracks utterance boundaries.
+
+    A window counts as speech when its RMS level is above both the absolute
+    ``threshold_db`` and the adaptive noise floor plus ``margin_db``. After the
+    last speech window, up to ``hangover_ms`` of trailing audio is kept so short
+    pauses between words do not end the utterance. Silence outside an
+    utterance is dropped (``keep=False``).
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_ms: int = 30,
+        threshold_db: float = -45.0,
+        margin_db: float = 10.0,
+        hangover_ms: int = 300,
+        max_utterance_ms: int = 15000,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.window_samples = sample_rate * window_ms // 1000
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.hangover_samples = sample_rate * hangover_ms // 1000
+        self.max_utterance_samples = sample_rate * max_utterance_ms // 1000
+        self.noise_floor_db = threshold_db - margin_db
+        self.reset()
+
+    def reset(self) -> None:
+        self.in_utterance = False
+        self.utterance_samples = 0
+        self._silent_samples = 0
+
+    @staticmethod
+    def level_db(window: np.ndarray) -> float:
+        """RMS level in dBFS of a float32 or raw PCM16 window."""
+        if window.size == 0:
+            return -120.0
+        rms = float(np.sqrt(np.mean(np.square(window, dtype=np.float32))))
+        if window.dtype == np.int16:
+            rms /= 32768.0
+        return 20.0 * np.log10(max(rms, 1e-6))
+
+    def is_speech(self, window: np.ndarray) -> bool:
+        level = self.level_db(window)
+        speech = level > max(self.threshold_db, self.noise_floor_db + self.margin_db)
+        if not speech:
+            # Track the background level slowly so steady noise is ignored.
+            self.noise_floor_db = 0.95 * self.noise_floor_db + 0.05 * level
+        return speech
+
+    def process(self, window: np.ndarray) -> VADDecision:
+        """Classify one analysis window and update utterance state."""
+        speech = self.is_speech(window)
+
+        if not self.in_utterance:
+            if not speech:
+                return VADDecision(keep=False)
+            self.in_utterance = True
+            self.utterance_samples = 0
+
+        self.utterance_samples += window.size
+        if speech:
+            self._silent_samples = 0
+        else:
+            self._silent_samples += window.size
+
+        if self.utterance_samples >= self.max_utterance_samples:
+            self.reset()
+            return VADDecision(keep=True, end_of_utterance=True, forced=True)
+        if self._silent_samples >= self.hangover_samples:
+            self.reset()
+            return VADDecision(keep=True, end_of_utterance=True)
+        return VADDecision(keep=True)
@@ -1,37 +1,356 @@
+import asyncio
+import base64
+import functools
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 
 import numpy as np
-from faster_whisper import WhisperModel
-import pyttsx3
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+
+from .audio_buffer import PCMRingBuffer
+from .stitching import TranscriptStitcher, Word
+from .transcription_cache import TranscriptionCache, audio_digest
+from .transcription_policy import SessionLanguage, TranscriptionPolicy, whisper_language
+from .transcription_pool import TranscriptionResult, TranscriptionScheduler, run_model
+from .tts_service import TTSService, audio_key as tts_audio_key, pending_key as tts_pending_key
+from .vad import EnergyVADSegmenter
+from utils.audio_decoder import decode_upload
+from utils.logger import logger
+
+# Model handles are created on first use so that processes which never
+# transcribe (management commands, most web workers, tests) never import
+# faster-whisper/pyttsx3 or load model weights. Call warm_up() to load early.
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+_tts_service = None
+_tts_lock = threading.Lock()
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+_transcription_cache = None
+_cache_lock = threading.Lock()
+
+_async_executor = None
+_executor_lock = threading.Lock()
+
+SAMPLE_RATE = 16000
+
+
+def whisper_options():
+    """Whisper model settings (WHISPER_* in settings.py)."""
+    return {
+        "model_size": getattr(settings, "WHISPER_MODEL_SIZE", "small"),
+        "device": getattr(settings, "WHISPER_DEVICE", "cpu"),
+        "compute_type": getattr(settings, "WHISPER_COMPUTE_TYPE", "int8"),
+        "cpu_threads": int(getattr(settings, "WHISPER_CPU_THREADS", 0) or 0),
+        "num_workers": int(getattr(settings, "WHISPER_NUM_WORKERS", 1) or 1),
+    }
+
+
+def get_whisper_model():
+    """Return the in-process Whisper model, loading it on first call."""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                # Make sure model files are available or faster-whisper will download them.
+                from faster_whisper import WhisperModel
+
+                options = whisper_options()
+                logger.info("Loading Whisper model %s (%s)", options["model_size"], options["compute_type"])
+                _whisper_model = WhisperModel(
+                    options["model_size"],
+                    device=options["device"],
+                    compute_type=options["compute_type"],
+                    cpu_threads=options["cpu_threads"],
+                    num_workers=options["num_workers"],
+                )
+    return _whisper_model
+
+
+def get_tts_service():
+    """Return the process-wide TTS worker, starting it on first call."""
+    global _tts_service
+    if _tts_service is None:
+        with _tts_lock:
+            if _tts_service is None:
+                _tts_service = TTSService(
+                    voice=getattr(settings, "TTS_VOICE", None),
+                    rate=getattr(settings, "TTS_RATE", None),
+                    max_entries=getattr(settings, "TTS_CACHE_SIZE", 256),
+                    store=get_tts_store(),
+                    store_ttl=getattr(settings, "TTS_CACHE_TTL", 86400),
+                )
+    return _tts_service
+
+
+def get_tts_store():
+    """The cache shared by all workers for rendered reply audio (TTS_CACHE_ALIAS), or None."""
+    alias = getattr(settings, "TTS_CACHE_ALIAS", "")
+    return caches[alias] if alias else None
+
+
+def lookup_reply_audio(key):
+    """
+    ``(audio, pending)`` for a reply audio key, from the shared store and this
+    process's TTS worker if it is running. Never starts the worker.
+    """
+    service = _tts_service
+    if service is not None:
+        audio = service.get(key)
+        return audio, audio is None and service.is_pending(key)
+    store = get_tts_store()
+    if store is None:
+        return None, False
+    try:
+        audio = store.get(tts_audio_key(key))
+        return audio, audio is None and store.get(tts_pending_key(key)) is not None
+    except Exception as exc:
+        logger.warning("TTS store lookup failed: %s", exc)
+        return None, False
+
+
+def warm_up(transcription=True, tts=False):
+    """
+    Load model handles ahead of the first request. Runs a one-second silent
+    clip through Whisper so weights are paged in, not just constructed, and
+    queues the agent's fixed prompts for TTS rendering.
+    """
+    if transcription:
+        silence = np.zeros(16000, dtype=np.float32)
+        scheduler = get_transcription_scheduler()
+        if scheduler is not None:
+            for _ in range(scheduler.workers):
+                scheduler.submit(silence)
+        else:
+            _transcribe(silence, language="en", beam_size=1)
+    if tts:
+        from .agent_core import fixed_prompts
+
+        get_tts_service().prerender(fixed_prompts())
+
+
+def start_warm_up():
+    """
+    Run warm_up on a background thread when VOICE_WARMUP_ON_START is set.
+    Called from the server entry points (asgi.py, wsgi.py), so management
+    commands and the autoreloader's parent process never load the models.
+    """
+    if not getattr(settings, "VOICE_WARMUP_ON_START", False):
+        return None
+    thread = threading.Thread(
+        target=warm_up,
+        kwargs={"tts": getattr(settings, "TTS_REPLY_AUDIO", False)},
+        name="voice-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def get_transcription_scheduler():
+    """
+    Return the process-wide worker pool, or None when WHISPER_POOL_WORKERS is 0
+    and transcription runs on the in-process model.
+    """
+    global _scheduler
+    workers = int(getattr(settings, "WHISPER_POOL_WORKERS", 0) or 0)
+    if workers <= 0:
+        return None
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                options = whisper_options()
+                _scheduler = TranscriptionScheduler(
+                    workers=workers,
+                    max_queue=getattr(settings, "WHISPER_POOL_MAX_QUEUE", 64),
+                    batch_size=getattr(settings, "WHISPER_POOL_BATCH_SIZE", 8),
+                    batch_window_ms=getattr(settings, "WHISPER_POOL_BATCH_WINDOW_MS", 20),
+                    model_size=options["model_size"],
+                    device=options["device"],
+                    compute_type=options["compute_type"],
+                    cpu_threads=options["cpu_threads"],
+                )
+    return _scheduler
+
+
+def get_transcription_policy(profile=None):
+    """Decoding policy for TRANSCRIPTION_PROFILE (latency, balanced or accuracy)."""
+    return TranscriptionPolicy.from_profile(profile or _transcription_profile())
+
+
+def _transcription_profile():
+    return getattr(settings, "TRANSCRIPTION_PROFILE", "balanced")
+
+
+def _run_whisper(audio, language=None, beam_size=5, word_timestamps=False) -> TranscriptionResult:
+    scheduler = get_transcription_scheduler()
+    if scheduler is not None:
+        return scheduler.transcribe(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+            timeout=getattr(settings, "WHISPER_POOL_SUBMIT_TIMEOUT", 5),
+        )
+    options = {"language": language, "beam_size": beam_size}
+    if word_timestamps:
+        options["word_timestamps"] = True
+    return run_model(get_whisper_model(), audio, options)
+
+
+def _transcribe(audio, language=None, beam_size=5):
+    return _run_whisper(audio, language=language, beam_size=beam_size).text
+
+
+def _transcribe_final(audio, language=None):
+    """Transcribe a complete recording with the beam size the policy picks for its length."""
+    duration = audio.size / SAMPLE_RATE if isinstance(audio, np.ndarray) else None
+    beam_size = get_transcription_policy().beam_size(duration, final=True)
+    return _transcribe(audio, language=language, beam_size=beam_size)
+
+
+def get_transcription_cache():
+    """Return the process-wide transcript cache, or None when TRANSCRIPTION_CACHE_SIZE is 0."""
+    global _transcription_cache
+    size = int(getattr(settings, "TRANSCRIPTION_CACHE_SIZE", 0) or 0)
+    if size <= 0:
+        return None
+    if _transcription_cache is None:
+        with _cache_lock:
+            if _transcription_cache is None:
+                _transcription_cache = TranscriptionCache(
+                    max_entries=size,
+                    directory=getattr(settings, "TRANSCRIPTION_CACHE_DIR", None) or None,
+                    max_disk_entries=getattr(settings, "TRANSCRIPTION_CACHE_DISK_ENTRIES", 10000),
+                )
+    return _transcription_cache
+
+
+def _cached_transcribe(digest, load_audio, language=None):
+    """Look the transcript up by audio digest; only call load_audio() on a miss."""
+    cache = get_transcription_cache()
+    if cache is None:
+        return _transcribe_final(load_audio(), language=language)
+
+    options = whisper_options()
+    # The profile fixes the beam size for a given recording, so it stands in for it here.
+    key = cache.make_key(
+        digest,
+        model_size=options["model_size"],
+        compute_type=options["compute_type"],
+        language=language,
+        profile=_transcription_profile(),
+    )
+    text = cache.get(key)
+    if text is None:
+        text = _transcribe_final(load_audio(), language=language)
+        cache.set(key, text)
+    return text
 
-# Initialize Whisper model (medium/large may be slower). We'll use 'small' by default.
-# Make sure model files are available or faster-whisper will download them.
-_whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
 
 def transcribe_audio_file(filepath, language=None):
     """
     Returns plain text transcription from file.
+    Pass the session's language when known to skip Whisper's language detection.
     """
-    segments, info = _whisper_model.transcribe(filepath, language=language, beam_size=5)
-    text = " ".join([seg.text.strip() for seg in segments])
-    return text
+    language = whisper_language(language)
+    if get_transcription_cache() is None:
+        return _transcribe_final(filepath, language=language)
+    return _cached_transcribe(audio_digest(filepath), lambda: filepath, language=language)
+
+
+def transcribe_upload(upload, language=None):
+    """
+    Transcribe a Django UploadedFile without writing it to disk first.
+    Repeated uploads of identical bytes are answered from the cache without decoding.
+    """
+    language = whisper_language(language)
+    if get_transcription_cache() is None:
+        return _transcribe_final(decode_upload(upload), language=language)
+    return _cached_transcribe(audio_digest(upload), lambda: decode_upload(upload), language=language)
+
+
+def get_transcription_executor():
+    """Threads that run blocking transcription on behalf of async views."""
+    global _async_executor
+    if _async_executor is None:
+        with _executor_lock:
+            if _async_executor is None:
+                _async_executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "WHISPER_ASYNC_THREADS", 4),
+                    thread_name_prefix="whisper-async",
+                )
+    return _async_executor
+
+
+async def atranscribe_upload(upload, language=None):
+    """transcribe_upload for async views; decoding and Whisper run on the transcription executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_transcription_executor(),
+        functools.partial(transcribe_upload, upload, language=language),
+    )
+
 
-_tts_engine = pyttsx3.init()
 def speak_text(text):
     """
     Speak agent text locally on server (useful for demos). For production,
     consider sending text to frontend TTS or using better cloud TTS.
     """
-    _tts_engine.say(text)
-    _tts_engine.runAndWait()
+    get_tts_service().speak(text)
+
+
+def reply_audio(text):
+    """
+    Audio for an agent reply without waiting on the synthesizer: base64 WAV
+    when it is already rendered, otherwise a URL that serves it once the
+    background render finishes.
+    """
+    if not text:
+        return {}
+    service = get_tts_service()
+    key = service.key(text)
+    audio = service.get(key)
+    if audio is not None:
+        return {"agent_audio": base64.b64encode(audio).decode("ascii")}
+    try:
+        service.submit(text)
+    except queue.Full:
+        logger.warning("TTS queue full; reply sent without audio")
+        return {}
+    return {"agent_audio_url": reverse("tts_audio", args=[key])}
 
 
 @dataclass
 class StreamingConfig:
     sample_rate: int = 16000
+    # "vad" emits utterances bounded by silence; "fixed" cuts every chunk_seconds.
+    segmentation: str = "vad"
     chunk_seconds: int = 3
+    # Ring buffer size; must hold at least one full chunk or utterance.
+    buffer_seconds: int = 6
+    vad_window_ms: int = 30
+    vad_threshold_db: float = -45.0
+    vad_hangover_ms: int = 300
+    min_utterance_ms: int = 250
+    max_utterance_ms: int = 15000
+    # Audio re-decoded across hard cuts (fixed chunks, max-length utterances);
+    # 0 disables overlap-and-merge stitching.
+    overlap_ms: int = 0
+    # Session language preference (e.g. meta.preferred_language); None or "auto" detects
+    # on the first utterance and pins the result.
+    language: Optional[str] = None
+    # Transcription profile; None uses TRANSCRIPTION_PROFILE.
+    profile: Optional[str] = None
 
 
 class StreamingVoiceProcessor:
@@ -39,35 +358,150 @@ class StreamingVoiceProcessor:
 
     def __init__(self, config: Optional[StreamingConfig] = None) -> None:
         self.config = config or StreamingConfig()
-        self._buffer = np.array([], dtype=np.float32)
+        capacity_seconds = max(
+            self.config.buffer_seconds,
+            self.config.chunk_seconds,
+            self.config.max_utterance_ms / 1000,
+        )
+        self._buffer = PCMRingBuffer(int(self.config.sample_rate * capacity_seconds))
+        self._vad = EnergyVADSegmenter(
+            sample_rate=self.config.sample_rate,
+            window_ms=self.config.vad_window_ms,
+            threshold_db=self.config.vad_threshold_db,
+            hangover_ms=self.config.vad_hangover_ms,
+            max_utterance_ms=self.config.max_utterance_ms,
+        )
+        self._min_utterance_samples = self.config.sample_rate * self.config.min_utterance_ms // 1000
+        self._overlap_samples = self.config.sample_rate * self.config.overlap_ms // 1000
+        if self._overlap_samples >= self.config.sample_rate * self.config.chunk_seconds:
+            raise ValueError("overlap_ms must be shorter than chunk_seconds")
+        self._stitcher = TranscriptStitcher()
+        self._policy = get_transcription_policy(self.config.profile)
+        self._language = SessionLanguage(
+            self.config.language, min_probability=self._policy.min_language_probability
+        )
+        # Samples consumed from the buffer: the timeline used for stitching.
+        self._consumed = 0
+        self.skipped_samples = 0
+
+    @property
+    def language(self) -> Optional[str]:
+        """Language pinned for this session, once known."""
+        return self._language.language
+
+    @property
+    def bytes_copied(self) -> int:
+        """Bytes written into the audio buffer since the session started."""
+        return self._buffer.bytes_copied
 
     def reset(self) -> None:
-        self._buffer = np.array([], dtype=np.float32)
+        self._buffer.clear()
+        self._vad.reset()
+        self._stitcher.reset()
+        self._consumed = 0
+        self.skipped_samples = 0
 
     def add_frame(self, pcm_frame: bytes | np.ndarray) -> Optional[str]:
         """
-        Append a PCM16 frame to the internal buffer. When enough audio is
-        accumulated, run Whisper and return the transcription chunk.
+        Append a PCM16 frame to the internal buffer. When a complete utterance
+        (or fixed-size chunk) is accumulated, run Whisper and return its text.
         """
 
         if isinstance(pcm_frame, bytes):
-            frame = np.frombuffer(pcm_frame, dtype=np.int16).astype(np.float32) / 32768.0
+            frame = np.frombuffer(pcm_frame, dtype=np.int16)
         else:
-            frame = pcm_frame.astype(np.float32)
+            frame = pcm_frame
 
-        self._buffer = np.concatenate([self._buffer, frame])
+        if self.config.segmentation == "fixed":
+            texts = self._add_fixed(frame)
+        else:
+            texts = self._add_vad(frame)
+        return " ".join(texts) or None
+
+    def flush(self) -> Optional[str]:
+        """Transcribe whatever audio is still buffered (end of stream)."""
+        self._vad.reset()
+        return self._emit() or None
 
+    def _add_fixed(self, frame: np.ndarray) -> list:
         threshold = self.config.sample_rate * self.config.chunk_seconds
-        if self._buffer.size < threshold:
-            return None
+        texts = []
+        offset = 0
+        while offset < frame.size:
+            offset += self._buffer.write(frame[offset:])
+            while len(self._buffer) >= threshold:
+                texts.append(self._emit(threshold, hard_cut=True))
+        return [text for text in texts if text]
+
+    def _add_vad(self, frame: np.ndarray) -> list:
+        window_size = self._vad.window_samples
+        texts = []
+        for start in range(0, frame.size, window_size):
+            window = frame[start:start + window_size]
+            decision = self._vad.process(window)
+            if not decision.keep:
+                # Silence between utterances never reaches the buffer or Whisper.
+                self.skipped_samples += window.size
+                continue
+            offset = 0
+            while offset < window.size:
+                written = self._buffer.write(window[offset:])
+                if not written:
+                    texts.append(self._emit(hard_cut=True))
+                offset += written
+            if decision.end_of_utterance:
+                texts.append(self._emit(hard_cut=decision.forced))
+        return [text for text in texts if text]
+
+    def _emit(self, count: Optional[int] = None, hard_cut: bool = False) -> str:
+        """
+        Transcribe the next ``count`` buffered samples (all by default). On a
+        hard cut with overlap enabled, the tail stays buffered as context for
+        the next window and the stitcher decides which words each window owns.
+        """
+        window = self._buffer.peek(count)
+        stitching = self._overlap_samples > 0 and (hard_cut or self._stitcher.committed_until > 0)
+        if not stitching:
+            self._advance(window.size)
+            if window.size < self._min_utterance_samples:
+                return ""
+            return self._transcribe_chunk(window, final=not hard_cut)
+
+        sample_rate = self.config.sample_rate
+        start = self._consumed / sample_rate
+        end = start + window.size / sample_rate
+        if hard_cut:
+            keep = min(self._overlap_samples, window.size)
+            commit_until = end - keep / sample_rate / 2
+        else:
+            keep = 0
+            commit_until = float("inf")
+        words = self._transcribe_words(window, final=not hard_cut)
+        text = self._stitcher.add_window(words, start, commit_until)
+        self._advance(window.size - keep)
+        if not hard_cut:
+            # Utterance closed at silence; the next one starts without context.
+            self._stitcher.reset()
+        return text
 
-        chunk = self._buffer[:threshold]
-        self._buffer = self._buffer[threshold:]
+    def _advance(self, count: int) -> None:
+        self._buffer.consume(count)
+        self._consumed += count
 
-        segments, _ = _whisper_model.transcribe(
-            chunk.reshape(1, -1),
-            language="en",
-            beam_size=5,
+    def _run(self, chunk: np.ndarray, final: bool, word_timestamps: bool = False) -> TranscriptionResult:
+        # Greedy for partial (hard-cut) and short chunks, beam search for finals.
+        beam_size = self._policy.beam_size(chunk.size / self.config.sample_rate, final=final)
+        result = _run_whisper(
+            chunk,
+            language=self._language.language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
         )
-        text = " ".join(seg.text.strip() for seg in segments)
-        return text or None
+        self._language.observe(result.language, result.language_probability)
+        return result
+
+    def _transcribe_chunk(self, chunk: np.ndarray, final: bool = True) -> str:
+        return self._run(chunk, final).text
+
+    def _transcribe_words(self, chunk: np.ndarray, final: bool = False) -> list:
+        return [Word(*word) for word in self._run(chunk, final, word_timestamps=True).words or []]
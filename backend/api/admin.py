@@ -1,7 +1,13 @@
 from django.contrib import admin
-from .models import CVSession
+from .models import ArchivedSession, CVSession
 
 @admin.register(CVSession)
 class CVSessionAdmin(admin.ModelAdmin):
     list_display = ['session_id', 'created_at', 'is_complete']
     readonly_fields = ['session_id', 'created_at', 'updated_at']
+
+
+@admin.register(ArchivedSession)
+class ArchivedSessionAdmin(admin.ModelAdmin):
+    list_display = ['session_id', 'archive', 'archived_at', 'last_active_at', 'turn_count']
+    search_fields = ['session_id']
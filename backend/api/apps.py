@@ -1,5 +1,15 @@
 from django.apps import AppConfig
 
+
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from . import session_cache
+        from .models import CVSession
+
+        post_save.connect(session_cache.invalidate_changed, sender=CVSession, dispatch_uid="cvsession-cache-save")
+        post_delete.connect(session_cache.invalidate_changed, sender=CVSession, dispatch_uid="cvsession-cache-delete")
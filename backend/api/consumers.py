@@ -0,0 +1,125 @@
+import json
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from agents.agent_core import AgentCore
+from agents.voice_handler import StreamingConfig, StreamingVoiceProcessor, reply_audio
+from utils.logger import logger
+from . import session_cache
+from .models import SessionConflict
+
+# instantiate agent once (reuse)
+agent = AgentCore()
+
+
+class TranscriptionConsumer(AsyncWebsocketConsumer):
+    """
+    Streaming transcription for one CVSession. Requires an authenticated user
+    (Django session, or a DRF token via api.middleware.TokenAuthMiddleware);
+    anonymous connections are closed with 4401, unknown sessions with 4404.
+
+    Client -> server:
+        binary messages: raw PCM16 mono frames at 16 kHz (e.g. 20 ms each)
+        {"type": "end"}: the user stopped talking; transcribe the rest and run the agent
+        {"type": "reset"}: drop buffered audio and any partial transcript
+    Server -> client:
+        {"type": "partial", "text": ...} as utterances are decoded
+        {"type": "final", "text": ...} once the turn is complete
+        {"type": "agent", "agent_text": ..., "cv_json": ..., "next_action": ...}
+            plus agent_audio (base64 WAV) or agent_audio_url when TTS_REPLY_AUDIO is on
+        {"type": "error", "error": ...}
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+        self.session_id = self.scope["url_route"]["kwargs"]["session_id"]
+        session = await self._get_session()
+        if session is None:
+            await self.close(code=4404)
+            return
+        meta = session.cv_json.get("meta", {}) if isinstance(session.cv_json, dict) else {}
+        self.processor = StreamingVoiceProcessor(
+            StreamingConfig(language=meta.get("preferred_language"))
+        )
+        self.parts = []
+        await self.accept()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data:
+            try:
+                # Whisper runs outside the shared sync thread so sessions decode in parallel.
+                text = await sync_to_async(self.processor.add_frame, thread_sensitive=False)(bytes_data)
+            except Exception as exc:
+                logger.warning("Streaming transcription failed: %s", exc)
+                await self._send_json({"type": "error", "error": str(exc)})
+                return
+            if text:
+                self.parts.append(text)
+                await self._send_json({"type": "partial", "text": text})
+            return
+
+        try:
+            message = json.loads(text_data or "{}")
+        except json.JSONDecodeError:
+            await self._send_json({"type": "error", "error": "invalid JSON message"})
+            return
+
+        message_type = message.get("type")
+        if message_type == "end":
+            await self._finish_turn()
+        elif message_type == "reset":
+            self.processor.reset()
+            self.parts = []
+        else:
+            await self._send_json({"type": "error", "error": f"unknown message type: {message_type}"})
+
+    async def _finish_turn(self):
+        try:
+            tail = await sync_to_async(self.processor.flush, thread_sensitive=False)()
+        except Exception as exc:
+            logger.warning("Streaming transcription failed: %s", exc)
+            await self._send_json({"type": "error", "error": str(exc)})
+            return
+        if tail:
+            self.parts.append(tail)
+        text = " ".join(self.parts).strip()
+        self.parts = []
+        await self._send_json({"type": "final", "text": text})
+        if not text:
+            return
+
+        agent_response = await database_sync_to_async(self._run_agent_turn, thread_sensitive=False)(text)
+        if agent_response is None:
+            await self._send_json({"type": "error", "error": "session not found"})
+            return
+        if "error" in agent_response:
+            # A commit conflict or an LLM failure: nothing was stored for this turn.
+            await self._send_json({"type": "error", "error": agent_response["error"]})
+            return
+        await self._send_json({"type": "agent", **agent_response})
+
+    def _run_agent_turn(self, text):
+        session = session_cache.get_session(self.session_id)
+        if session is None:
+            return None
+        session.stage_turn("user", text)
+        try:
+            agent_response = agent.process_user_message(session, text)
+        except SessionConflict as exc:
+            return {"error": str(exc)}
+        if getattr(settings, "TTS_REPLY_AUDIO", False) and agent_response.get("agent_text"):
+            agent_response.update(reply_audio(agent_response["agent_text"]))
+        return agent_response
+
+    @database_sync_to_async
+    def _get_session(self):
+        return session_cache.get_session(self.session_id)
+
+    async def _send_json(self, payload):
+        await self.send(text_data=json.dumps(payload, ensure_ascii=False))
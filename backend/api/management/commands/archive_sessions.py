@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.session_archive import SUFFIXES, archive_sessions, run_forever
+
+
+class Command(BaseCommand):
+    help = (
+        "Move sessions idle for --idle-days (SESSION_ARCHIVE_AFTER_DAYS) to a compressed JSON lines file "
+        "in SESSION_ARCHIVE_DIR and delete them from the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--idle-days", type=float, default=None)
+        parser.add_argument("--compression", choices=sorted(SUFFIXES), default=None)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="only report what would be archived")
+        parser.add_argument("--vacuum", action="store_true", help="compact the database afterwards (SQLite)")
+        parser.add_argument(
+            "--every", type=float, default=None,
+            help="keep running, archiving every EVERY seconds (SESSION_ARCHIVE_INTERVAL); 0 runs once",
+        )
+
+    def handle(self, *args, **options):
+        idle_days = options["idle_days"]
+        if idle_days is None:
+            idle_days = getattr(settings, "SESSION_ARCHIVE_AFTER_DAYS", 30)
+        every = options["every"]
+        if every is None:
+            every = getattr(settings, "SESSION_ARCHIVE_INTERVAL", 0)
+        job = dict(
+            idle_for=timedelta(days=idle_days),
+            compression=options["compression"],
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            vacuum=options["vacuum"],
+        )
+        if every > 0:
+            self.stdout.write(f"archiving sessions idle for {idle_days:g} days every {every:g} seconds")
+            run_forever(every, **job)
+        report = archive_sessions(**job)
+        if options["dry_run"]:
+            self.stdout.write(f"dry run: would archive {report.sessions} sessions idle for {idle_days:g} days")
+        for line in report.lines():
+            self.stdout.write(line)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.session_archive import restore_archive, restore_sessions
+
+
+class Command(BaseCommand):
+    help = "Restore archived sessions by id, or every session in an archive file (--archive)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("session_ids", nargs="*")
+        parser.add_argument("--archive", help="path of an archive file to restore completely")
+
+    def handle(self, *args, **options):
+        if options["archive"]:
+            restored = restore_archive(options["archive"])
+        elif options["session_ids"]:
+            restored = restore_sessions(options["session_ids"])
+        else:
+            raise CommandError("pass session ids or --archive PATH")
+        for session_id in restored:
+            self.stdout.write(session_id)
+        self.stdout.write(f"restored {len(restored)} sessions")
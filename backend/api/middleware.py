@@ -0,0 +1,41 @@
+"""
+DRF token authentication for WebSocket connections.
+
+Browsers cannot set headers on a WebSocket handshake, so the token is read
+from an ``Authorization: Token <key>`` header or a ``?token=<key>`` query
+parameter. Without one, the user set by channels' AuthMiddlewareStack (the
+Django session) is kept.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+
+
+@database_sync_to_async
+def _token_user(key):
+    from django.contrib.auth.models import AnonymousUser
+    from rest_framework.authtoken.models import Token
+
+    token = Token.objects.select_related("user").filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return AnonymousUser()
+    return token.user
+
+
+def _token_key(scope):
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            keyword, _, key = value.decode("latin-1").partition(" ")
+            if keyword.lower() == "token" and key.strip():
+                return key.strip()
+    keys = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("token")
+    return keys[0] if keys else None
+
+
+class TokenAuthMiddleware(BaseMiddleware):
+    async def __call__(self, scope, receive, send):
+        key = _token_key(scope)
+        if key:
+            scope = dict(scope, user=await _token_user(key))
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_usercv_skill_project_experience_education_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvsession',
+            name='context_summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='cvsession',
+            name='summary_turns',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_conversations_to_turns(apps, schema_editor):
+    CVSession = apps.get_model("api", "CVSession")
+    ConversationTurn = apps.get_model("api", "ConversationTurn")
+    for session in CVSession.objects.only("id", "conversation").iterator():
+        conversation = session.conversation if isinstance(session.conversation, list) else []
+        turns = [
+            ConversationTurn(
+                session_id=session.id,
+                index=index,
+                speaker="agent" if item.get("from") == "agent" else "user",
+                text=item.get("text", "") or "",
+            )
+            for index, item in enumerate(item for item in conversation if isinstance(item, dict))
+        ]
+        ConversationTurn.objects.bulk_create(turns)
+        CVSession.objects.filter(id=session.id).update(turn_count=len(turns))
+
+
+def copy_turns_to_conversations(apps, schema_editor):
+    CVSession = apps.get_model("api", "CVSession")
+    ConversationTurn = apps.get_model("api", "ConversationTurn")
+    for session in CVSession.objects.only("id").iterator():
+        turns = ConversationTurn.objects.filter(session_id=session.id).order_by("index")
+        CVSession.objects.filter(id=session.id).update(
+            conversation=[{"from": turn.speaker, "text": turn.text} for turn in turns]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_cvsession_context_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvsession',
+            name='turn_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ConversationTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('speaker', models.CharField(choices=[('user', 'User'), ('agent', 'Agent')], max_length=8)),
+                ('text', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='api.cvsession')),
+            ],
+            options={
+                'ordering': ['session', 'index'],
+                'constraints': [models.UniqueConstraint(fields=('session', 'index'), name='conversation_turn_order')],
+            },
+        ),
+        migrations.RunPython(copy_conversations_to_turns, copy_turns_to_conversations),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_conversationturn'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='cvsession',
+            name='conversation',
+        ),
+    ]
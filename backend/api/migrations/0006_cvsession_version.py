@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_remove_cvsession_conversation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvsession',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+import utils.fields
+
+
+def pack_cv_json(apps, schema_editor):
+    CVSession = apps.get_model("api", "CVSession")
+    for session in CVSession.objects.only("id", "cv_json").iterator():
+        CVSession.objects.filter(id=session.id).update(cv_json_packed=session.cv_json)
+
+
+def unpack_cv_json(apps, schema_editor):
+    CVSession = apps.get_model("api", "CVSession")
+    for session in CVSession.objects.only("id", "cv_json_packed").iterator():
+        CVSession.objects.filter(id=session.id).update(cv_json=session.cv_json_packed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_archivedsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cvsession',
+            name='cv_json_packed',
+            field=utils.fields.CompressedJSONField(default=dict),
+        ),
+        migrations.RunPython(pack_cv_json, unpack_cv_json),
+        migrations.RemoveField(
+            model_name='cvsession',
+            name='cv_json',
+        ),
+        migrations.RenameField(
+            model_name='cvsession',
+            old_name='cv_json_packed',
+            new_name='cv_json',
+        ),
+    ]
@@ -1,20 +1,246 @@
-from django.db import models
+import random
+import time
+
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import User
 import uuid
 from django.utils import timezone
 
+from utils.fields import CompressedJSONField
+
+
+class SessionConflict(Exception):
+    """A turn could not be committed: other requests kept updating the session first."""
+
 
 class CVSession(models.Model):
     session_id = models.CharField(max_length=64, default=uuid.uuid4, unique=True)
     created_at = models.DateTimeField(default=timezone.now)
-    updated_at = models.DateTimeField(auto_now=True)
-    cv_json = models.JSONField(default=dict)
-    conversation = models.JSONField(default=list)
+    # Indexed for the idle-session scan (archive_sessions).
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    cv_json = CompressedJSONField(default=dict)
     is_complete = models.BooleanField(default=False)
+    # Turns live in ConversationTurn, one row each; this is the next turn's index.
+    turn_count = models.PositiveIntegerField(default=0)
+    # Running LLM summary of conversation[:summary_turns], used by the agent
+    # context builder in place of replaying those turns.
+    context_summary = models.TextField(blank=True, default="")
+    summary_turns = models.PositiveIntegerField(default=0)
+    # Bumped by every commit; writes are conditional on the version they read.
+    version = models.PositiveIntegerField(default=0)
+
+    # What a turn commit writes (and reloads after losing a race).
+    TURN_FIELDS = ["cv_json", "is_complete", "turn_count", "context_summary", "summary_turns", "version"]
 
     def __str__(self):
         return str(self.session_id)
 
+    @property
+    def conversation(self):
+        """
+        Every turn as {'from': 'user'|'agent', 'text': ...}, oldest first,
+        including staged ones. Loaded once per instance; read-only, use
+        stage_turn or append_turn to add one.
+        """
+        if "_conversation" not in self.__dict__:
+            self._conversation = self.get_turns()
+        return tuple(self._conversation)
+
+    def _staged(self):
+        return self.__dict__.setdefault("_staged_turns", [])
+
+    @property
+    def recent_turns(self):
+        """
+        ``(first_index, [(speaker, text), ...])``: the newest stored turns kept
+        in memory (see load_recent_turns), or None.
+        """
+        return self.__dict__.get("_recent_turns")
+
+    @recent_turns.setter
+    def recent_turns(self, value):
+        self.__dict__["_recent_turns"] = value
+
+    def load_recent_turns(self, count=None):
+        """Keep the last ``count`` (CVSESSION_CACHE_TURNS) stored turns in memory."""
+        count = getattr(settings, "CVSESSION_CACHE_TURNS", 16) if count is None else count
+        stored = self.turn_count - len(self._staged())
+        start = max(stored - count, 0)
+        rows = []
+        if self.pk is not None and start < stored:
+            rows = list(
+                self.turns.filter(index__gte=start, index__lt=stored).order_by("index").values_list("speaker", "text")
+            )
+        self.recent_turns = (start, rows)
+
+    def _stored_turns(self, start, end):
+        """Stored turns ``start`` to ``end`` as (speaker, text) pairs, from recent_turns when they cover them."""
+        if start >= end:
+            return []
+        recent = self.recent_turns
+        if recent is not None and start >= recent[0]:
+            return recent[1][start - recent[0]:end - recent[0]]
+        if self.pk is None:
+            return []
+        return list(self.turns.filter(index__gte=start, index__lt=end).order_by("index").values_list("speaker", "text"))
+
+    def get_turns(self, start=0, end=None):
+        """Turns ``start`` to ``end`` (exclusive) as {'from', 'text'} dicts, oldest first."""
+        if "_conversation" in self.__dict__:
+            return self._conversation[start:end]
+        staged = self._staged()
+        stored = self.turn_count - len(staged)
+        end = self.turn_count if end is None else min(end, self.turn_count)
+        turns = self._stored_turns(start, min(end, stored)) + staged[max(start - stored, 0):max(end - stored, 0)]
+        return [{"from": speaker, "text": text} for speaker, text in turns]
+
+    def last_turn_text(self, speaker):
+        """Text of the most recent turn by ``speaker``, or ''."""
+        if "_conversation" in self.__dict__:
+            turns = [(item.get("from"), item.get("text", "")) for item in self._conversation]
+            complete = True
+        else:
+            recent = self.recent_turns
+            turns = (recent[1] if recent else []) + self._staged()
+            complete = self.pk is None or (recent is not None and recent[0] == 0)
+        for turn_speaker, text in reversed(turns):
+            if turn_speaker == speaker:
+                return text
+        if complete:
+            return ""
+        return self.turns.filter(speaker=speaker).order_by("-index").values_list("text", flat=True).first() or ""
+
+    def stage_turn(self, speaker, text):
+        """Add a turn in memory; the next commit_turn writes it."""
+        self._staged().append((speaker, text))
+        self.turn_count += 1
+        if "_conversation" in self.__dict__:
+            self._conversation.append({"from": speaker, "text": text})
+
+    def append_turn(self, speaker, text):
+        """Store one turn right away."""
+        self.stage_turn(speaker, text)
+        self.commit_turn()
+
+    def commit_turn(self, apply=None, retries=None):
+        """
+        Write the staged turns, the turns ``apply`` returns and the changed
+        TURN_FIELDS in one transaction, if the row is still at the version
+        this instance read.
+
+        ``apply(session)`` updates the session's fields in memory from its
+        current state and returns further (speaker, text) turns to append. If
+        another request committed first, the session is reloaded, ``apply``
+        runs again on the fresh state and the write is retried, up to
+        ``retries`` times (SESSION_COMMIT_RETRIES) before SessionConflict.
+        ``apply`` must rebase its change onto the state it is given, or raise
+        SessionConflict when it cannot, rather than write over a newer state.
+        Returns the number of retries it took. The committed state is written
+        through to the session cache.
+        """
+        retries = getattr(settings, "SESSION_COMMIT_RETRIES", 5) if retries is None else retries
+        staged = self._staged()
+        for attempt in range(retries + 1):
+            turns = staged + list(apply(self) if apply else [])
+            first_index = self.turn_count - len(staged)
+            with transaction.atomic():
+                committed = CVSession.objects.filter(pk=self.pk, version=self.version).update(
+                    cv_json=self.cv_json,
+                    is_complete=self.is_complete,
+                    turn_count=first_index + len(turns),
+                    context_summary=self.context_summary,
+                    summary_turns=self.summary_turns,
+                    version=self.version + 1,
+                    updated_at=timezone.now(),
+                )
+                if committed:
+                    ConversationTurn.objects.bulk_create(
+                        [
+                            ConversationTurn(session=self, index=first_index + offset, speaker=speaker, text=text)
+                            for offset, (speaker, text) in enumerate(turns)
+                        ]
+                    )
+            if committed:
+                from . import session_cache
+
+                if "_conversation" in self.__dict__:
+                    self._conversation += [{"from": speaker, "text": text} for speaker, text in turns[len(staged):]]
+                recent = self.recent_turns
+                if recent is not None:
+                    kept = recent[1] + [tuple(turn) for turn in turns]
+                    overflow = max(len(kept) - getattr(settings, "CVSESSION_CACHE_TURNS", 16), 0)
+                    self.recent_turns = (recent[0] + overflow, kept[overflow:])
+                self.turn_count = first_index + len(turns)
+                self.version += 1
+                staged.clear()
+                session_cache.store(self)
+                return attempt
+            if attempt < retries:
+                # Lost the race (or read a stale cached copy): start over from
+                # what the winner committed.
+                try:
+                    self.refresh_from_db(fields=self.TURN_FIELDS)
+                except CVSession.DoesNotExist:
+                    self._reattach()
+                self.__dict__.pop("_conversation", None)
+                self.turn_count += len(staged)
+                if self.recent_turns is not None:
+                    self.load_recent_turns()
+                time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+        raise SessionConflict(f"session {self.session_id} changed concurrently {retries + 1} times")
+
+    def _reattach(self):
+        """
+        Reload a session the archive job moved out while this instance held it:
+        restore it (under a new primary key) or raise SessionConflict if it is gone.
+        """
+        from . import session_archive
+
+        session_archive.restore_sessions([self.session_id])
+        current = CVSession.objects.filter(session_id=self.session_id).first()
+        if current is None:
+            raise SessionConflict(f"session {self.session_id} no longer exists")
+        self.pk = current.pk
+        for name in self.TURN_FIELDS:
+            setattr(self, name, getattr(current, name))
+
+
+class ConversationTurn(models.Model):
+    """One message of a CVSession conversation; turns are only ever appended."""
+    SPEAKERS = [("user", "User"), ("agent", "Agent")]
+
+    session = models.ForeignKey(CVSession, on_delete=models.CASCADE, related_name="turns")
+    index = models.PositiveIntegerField()
+    speaker = models.CharField(max_length=8, choices=SPEAKERS)
+    text = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["session", "index"]
+        constraints = [models.UniqueConstraint(fields=["session", "index"], name="conversation_turn_order")]
+
+    def __str__(self):
+        return f"{self.session_id}#{self.index} {self.speaker}"
+
+
+class ArchivedSession(models.Model):
+    """
+    A CVSession moved to cold storage by archive_sessions: which archive file
+    holds it, so it can be restored on demand. Removed again on restore.
+    """
+    session_id = models.CharField(max_length=64, unique=True)
+    # Relative to SESSION_ARCHIVE_DIR.
+    archive = models.CharField(max_length=255)
+    archived_at = models.DateTimeField(default=timezone.now)
+    last_active_at = models.DateTimeField()
+    turn_count = models.PositiveIntegerField(default=0)
+    # Size of the session's archive line before compression.
+    raw_bytes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.session_id} -> {self.archive}"
+
 
 # ==================== STRUCTURED CV MODELS ====================
 
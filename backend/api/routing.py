@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import consumers
+
+websocket_urlpatterns = [
+    path("ws/transcribe/<str:session_id>/", consumers.TranscriptionConsumer.as_asgi(), name="ws_transcribe"),
+]
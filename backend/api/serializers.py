@@ -3,6 +3,8 @@ from .models import CVSession, UserCV, Education, Experience, Skill, Project, Ce
 
 
 class CVSessionSerializer(serializers.ModelSerializer):
+    conversation = serializers.ReadOnlyField()
+
     class Meta:
         model = CVSession
         fields = '__all__'
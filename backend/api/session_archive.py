@@ -0,0 +1,292 @@
+"""
+Cold storage for idle CVSessions.
+
+archive_sessions() moves sessions that have not been updated for
+SESSION_ARCHIVE_AFTER_DAYS out of the database. Each one becomes a JSON
+line (its fields and every turn) in a gzip or zstd file under
+SESSION_ARCHIVE_DIR, an ArchivedSession row records which file holds it,
+and the session and its turns are deleted. The file is complete and synced
+to disk before anything is deleted, and a session updated while the job
+runs is left in place.
+
+restore_sessions() puts archived sessions back (session_cache does this when
+an archived session is read again); restore_archive() reloads a whole file.
+"""
+import gzip
+import io
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from utils.logger import logger
+from .models import ArchivedSession, ConversationTurn, CVSession
+
+SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+# The primary key is not kept; a restored session gets a new one.
+_FIELDS = [field.attname for field in CVSession._meta.concrete_fields if not field.primary_key]
+_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+@dataclass
+class ArchiveReport:
+    sessions: int = 0
+    turns: int = 0
+    # Sessions that were updated again before they could be deleted.
+    skipped: int = 0
+    raw_bytes: int = 0
+    archive_bytes: int = 0
+    db_bytes_before: Optional[int] = None
+    db_bytes_after: Optional[int] = None
+    path: Optional[str] = None
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """How much the database shrank (measured after a vacuum), else the archived data's uncompressed size."""
+        if self.db_bytes_before is not None and self.db_bytes_after is not None:
+            return self.db_bytes_before - self.db_bytes_after
+        return self.raw_bytes
+
+    def lines(self) -> List[str]:
+        ratio = self.raw_bytes / self.archive_bytes if self.archive_bytes else 0.0
+        lines = [
+            f"sessions archived: {self.sessions} ({self.turns} turns), skipped as active again: {self.skipped}",
+            f"archive: {self.path or '-'}, {self.archive_bytes} bytes for {self.raw_bytes} bytes of JSON ({ratio:.1f}x)",
+        ]
+        if self.db_bytes_before is not None:
+            after = "-" if self.db_bytes_after is None else self.db_bytes_after
+            lines.append(f"database: {self.db_bytes_before} bytes before, {after} after")
+        lines.append(f"reclaimed: {self.reclaimed_bytes} bytes")
+        return lines
+
+
+def archive_dir() -> Path:
+    return Path(getattr(settings, "SESSION_ARCHIVE_DIR", "") or Path(settings.BASE_DIR) / "session_archive")
+
+
+def _open(path, mode, compression):
+    """Text stream over a compressed archive file."""
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError("zstd session archives need the zstandard package (pip install zstandard)") from exc
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return gzip.open(path, mode + "t", encoding="utf-8")
+
+
+def _compression_of(path) -> str:
+    return "zstd" if str(path).endswith(SUFFIXES["zstd"]) else "gzip"
+
+
+def read_archive(path) -> Iterator[dict]:
+    """Every archived session in ``path`` as {'session': {...}, 'turns': [[index, speaker, text, created_at], ...]}."""
+    with _open(path, "r", _compression_of(path)) as archive:
+        for line in archive:
+            if line.strip():
+                yield json.loads(line)
+
+
+def database_bytes() -> Optional[int]:
+    """Size of the database (SQLite pages, or the session tables on PostgreSQL); None elsewhere."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("PRAGMA page_count")
+            pages = cursor.fetchone()[0]
+            cursor.execute("PRAGMA page_size")
+            return pages * cursor.fetchone()[0]
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT pg_total_relation_size(%s) + pg_total_relation_size(%s)",
+                [CVSession._meta.db_table, ConversationTurn._meta.db_table],
+            )
+            return cursor.fetchone()[0]
+    return None
+
+
+def vacuum_database() -> bool:
+    """Return the space freed by deleted rows to the filesystem (SQLite VACUUM); False when unsupported."""
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("VACUUM")
+    return True
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def archive_sessions(
+    idle_for: Optional[timedelta] = None,
+    compression: Optional[str] = None,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    vacuum: bool = False,
+    sessions=None,
+) -> ArchiveReport:
+    """
+    Archive sessions from ``sessions`` (default: all) not updated for
+    ``idle_for`` (SESSION_ARCHIVE_AFTER_DAYS) into a new file in
+    SESSION_ARCHIVE_DIR, then delete them. ``dry_run`` only counts what would
+    be archived; ``vacuum`` compacts the database afterwards.
+    """
+    if idle_for is None:
+        idle_for = timedelta(days=getattr(settings, "SESSION_ARCHIVE_AFTER_DAYS", 30))
+    compression = compression or getattr(settings, "SESSION_ARCHIVE_COMPRESSION", "gzip")
+    if compression not in SUFFIXES:
+        raise ValueError(f"Unknown SESSION_ARCHIVE_COMPRESSION {compression!r}; choose gzip or zstd")
+    cutoff = timezone.now() - idle_for
+    base = CVSession.objects.all() if sessions is None else sessions
+    report = ArchiveReport(db_bytes_before=database_bytes())
+    ids = list(base.filter(updated_at__lt=cutoff).order_by("pk").values_list("pk", flat=True))
+    if not ids:
+        return report
+
+    directory = archive_dir()
+    name = f"sessions-{timezone.now():%Y%m%dT%H%M%S%f}{SUFFIXES[compression]}"
+    partial = directory / f"{name}.part"
+    written = []  # (pk, ArchivedSession) per session in the file
+    if not dry_run:
+        directory.mkdir(parents=True, exist_ok=True)
+    with (nullcontext() if dry_run else _open(partial, "w", compression)) as archive:
+        for chunk in _chunks(ids, batch_size):
+            turns = defaultdict(list)
+            rows = (
+                ConversationTurn.objects.filter(session_id__in=chunk)
+                .order_by("session_id", "index")
+                .values_list("session_id", "index", "speaker", "text", "created_at")
+            )
+            for session_pk, *turn in rows:
+                turns[session_pk].append(turn)
+            for session in CVSession.objects.filter(pk__in=chunk).order_by("pk"):
+                record = {"session": {field: getattr(session, field) for field in _FIELDS}, "turns": turns[session.pk]}
+                line = json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")) + "\n"
+                if archive is not None:
+                    archive.write(line)
+                entry = ArchivedSession(
+                    session_id=session.session_id,
+                    archive=name,
+                    last_active_at=session.updated_at,
+                    turn_count=len(turns[session.pk]),
+                    raw_bytes=len(line.encode("utf-8")),
+                )
+                written.append((session.pk, entry))
+
+    if dry_run:
+        report.sessions = len(written)
+        report.turns = sum(entry.turn_count for _, entry in written)
+        report.raw_bytes = sum(entry.raw_bytes for _, entry in written)
+        return report
+
+    with open(partial, "rb") as archive:
+        os.fsync(archive.fileno())
+    path = directory / name
+    os.replace(partial, path)
+    report.path = str(path)
+    report.archive_bytes = path.stat().st_size
+
+    for chunk in _chunks(written, batch_size):
+        with transaction.atomic():
+            still_idle = set(
+                CVSession.objects.select_for_update()
+                .filter(pk__in=[pk for pk, _ in chunk], updated_at__lt=cutoff)
+                .values_list("pk", flat=True)
+            )
+            entries = [entry for pk, entry in chunk if pk in still_idle]
+            ArchivedSession.objects.filter(session_id__in=[entry.session_id for entry in entries]).delete()
+            ArchivedSession.objects.bulk_create(entries)
+            CVSession.objects.filter(pk__in=still_idle).delete()
+        report.sessions += len(entries)
+        report.turns += sum(entry.turn_count for entry in entries)
+        report.raw_bytes += sum(entry.raw_bytes for entry in entries)
+        report.skipped += len(chunk) - len(entries)
+    if vacuum and vacuum_database():
+        report.db_bytes_after = database_bytes()
+    return report
+
+
+def _restore(record) -> bool:
+    """Recreate one archived session and its turns; False when a session with its id already exists."""
+    fields = dict(record["session"])
+    for name in _DATETIME_FIELDS:
+        if fields.get(name):
+            fields[name] = parse_datetime(fields[name])
+    with transaction.atomic():
+        ArchivedSession.objects.filter(session_id=fields["session_id"]).delete()
+        if CVSession.objects.filter(session_id=fields["session_id"]).exists():
+            return False
+        # Saving sets updated_at to now: a restored session counts as active again.
+        session = CVSession(**fields)
+        session.save(force_insert=True)
+        ConversationTurn.objects.bulk_create(
+            [
+                ConversationTurn(session=session, index=index, speaker=speaker, text=text, created_at=parse_datetime(created))
+                for index, speaker, text, created in record["turns"]
+            ]
+        )
+    return True
+
+
+def restore_sessions(session_ids) -> List[str]:
+    """Restore the archived sessions among ``session_ids``; returns the ids restored."""
+    wanted = defaultdict(set)
+    for session_id, archive in ArchivedSession.objects.filter(session_id__in=list(session_ids)).values_list(
+        "session_id", "archive"
+    ):
+        wanted[archive].add(session_id)
+    restored = []
+    for archive, pending in wanted.items():
+        path = archive_dir() / archive
+        if not path.exists():
+            logger.warning("Session archive %s is missing; cannot restore %s", path, sorted(pending))
+            continue
+        for record in read_archive(path):
+            session_id = record["session"]["session_id"]
+            if session_id in pending:
+                pending.discard(session_id)
+                if _restore(record):
+                    restored.append(session_id)
+                if not pending:
+                    break
+    return restored
+
+
+def restore_archive(path) -> List[str]:
+    """Restore every session in the archive file ``path`` that is not in the database; returns their ids."""
+    return [record["session"]["session_id"] for record in read_archive(path) if _restore(record)]
+
+
+def run_forever(interval: float, **options) -> None:
+    """
+    Run archive_sessions(**options) every ``interval`` seconds until interrupted
+    (`manage.py archive_sessions --every`). Meant for one dedicated process, not
+    the web workers.
+    """
+    while True:
+        try:
+            report = archive_sessions(**options)
+            if report.sessions:
+                logger.info("Session archive: %s", "; ".join(report.lines()))
+        except Exception as exc:
+            logger.warning("Session archive run failed: %s", exc)
+        finally:
+            connection.close()
+        time.sleep(interval)
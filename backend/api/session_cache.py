@@ -0,0 +1,134 @@
+"""
+Hot CVSession cache.
+
+Every turn reads its session before calling the agent, and generate_cv and
+the session endpoint read it again. Sessions are served from the Django
+cache named by CVSESSION_CACHE_ALIAS (local memory, or Redis shared by all
+workers when REDIS_URL is set) together with their last
+CVSESSION_CACHE_TURNS turns, which is all the agent context needs, so while a
+session is hot the database only sees writes. A session that was archived
+(session_archive) is restored when it is read again.
+
+The cache is write-through: CVSession.commit_turn stores the committed state
+once the transaction commits, and saving a session any other way, or
+deleting it, drops its entry. A stale entry (one written by a per-process
+cache in another worker, or an out-of-order store) cannot lose a turn:
+commits are guarded by CVSession.version, so the first commit from it
+conflicts, reloads from the database and retries.
+"""
+import threading
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from . import session_archive
+from .models import CVSession
+
+_FIELDS = [field.attname for field in CVSession._meta.concrete_fields]
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+
+def _cache():
+    """The configured cache backend, or None when CVSESSION_CACHE_ALIAS is empty."""
+    alias = getattr(settings, "CVSESSION_CACHE_ALIAS", "")
+    return caches[alias] if alias else None
+
+
+def _key(session_id):
+    return f"cvsession:{session_id}"
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def stats() -> dict:
+    """Lookups served from the cache (hits) and from the database (misses), stores and invalidations."""
+    with _stats_lock:
+        current = dict(_stats)
+    lookups = current["hits"] + current["misses"]
+    current["hit_rate"] = current["hits"] / lookups if lookups else 0.0
+    return current
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def get_session(session_id) -> Optional[CVSession]:
+    """The session with ``session_id`` (a fresh instance per call), or None when it does not exist."""
+    cache = _cache()
+    if cache is None:
+        return _load(session_id)
+    entry = cache.get(_key(session_id))
+    if entry is not None:
+        _count("hits")
+        session = CVSession.from_db(DEFAULT_DB_ALIAS, _FIELDS, [entry["fields"][name] for name in _FIELDS])
+        session.recent_turns = (entry["turns"][0], list(entry["turns"][1]))
+        return session
+    _count("misses")
+    session = _load(session_id)
+    if session is not None:
+        session.load_recent_turns()
+        store(session)
+    return session
+
+
+aget_session = sync_to_async(get_session)
+
+
+def _load(session_id):
+    """The session from the database, restored from the session archive first if it was archived."""
+    session = CVSession.objects.filter(session_id=session_id).first()
+    if session is None and session_archive.restore_sessions([session_id]):
+        session = CVSession.objects.filter(session_id=session_id).first()
+    return session
+
+
+def store(session: CVSession) -> None:
+    """Cache ``session``'s stored state (without staged turns) once the current transaction commits."""
+    cache = _cache()
+    if cache is None or session.pk is None:
+        return
+    recent = session.recent_turns
+    if recent is None or len(session._staged()):
+        # Only a complete, committed view of the session may be cached.
+        cache.delete(_key(session.session_id))
+        return
+    entry = {
+        "fields": {name: getattr(session, name) for name in _FIELDS},
+        "turns": (recent[0], list(recent[1])),
+    }
+    timeout = getattr(settings, "CVSESSION_CACHE_TTL", 1800)
+
+    def write():
+        cache.set(_key(session.session_id), entry, timeout)
+        _count("stores")
+
+    transaction.on_commit(write)
+
+
+def invalidate(session_id) -> None:
+    """Drop the cached copy of a session; the next read loads it from the database."""
+    cache = _cache()
+    if cache is None:
+        return
+    cache.delete(_key(session_id))
+    _count("invalidations")
+
+
+def invalidate_changed(sender, instance, created=False, **kwargs):
+    """
+    post_save / post_delete receiver for CVSession: a session saved or deleted
+    outside commit_turn (the admin, a shell) is dropped from the cache.
+    """
+    if not created:
+        transaction.on_commit(lambda: invalidate(instance.session_id))
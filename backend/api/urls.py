@@ -1,14 +1,20 @@
 from django.urls import path
 from . import views
+from . import views_async
 from . import views_livekit
 
 urlpatterns = [
     path("create_session/", views.create_session, name="create_session"),
     path("voice_input/", views.voice_input, name="voice_input"),
     path("process_text/", views.process_text, name="process_text"),
+    path("process_text/stream/", views_async.process_text_stream, name="process_text_stream"),
     path("session/<str:session_id>/", views.get_session, name="get_session"),
     path("generate_cv/<str:session_id>/", views.generate_cv, name="generate_cv"),
+    path("async/process_text/", views_async.process_text, name="process_text_async"),
+    path("async/voice_input/", views_async.voice_input, name="voice_input_async"),
+    path("async/generate_cv/<str:session_id>/", views_async.generate_cv, name="generate_cv_async"),
     path("chat/", views.chat, name="chat"),
+    path("tts/<str:key>/", views.tts_audio, name="tts_audio"),
     path("livekit/token/", views_livekit.get_livekit_token, name="livekit_token"),
     
     # New CV endpoints
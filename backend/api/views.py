@@ -1,23 +1,24 @@
 import base64
 import os
-import tempfile
+import queue
+from django.conf import settings
 from django.http import JsonResponse, HttpResponse
 from rest_framework.decorators import api_view
 from rest_framework import status
-from agents.openai_tools import openai_refine_cv
+from agents.openai_tools import get_openai_client, openai_refine_cv
 from utils.pdf_generator import render_html
 from utils.docx_generator import generate_docx_bytes
 from utils.logger import logger
-from .models import CVSession
+from . import session_cache
+from .models import CVSession, SessionConflict
 from .serializers import CVSessionSerializer
-from agents.voice_handler import transcribe_audio_file, speak_text
+from agents.voice_handler import lookup_reply_audio, reply_audio, transcribe_upload, speak_text
 from agents.agent_core import AgentCore
-from openai import OpenAI
+from utils.audio_decoder import audio_upload_handlers
 
 # instantiate agent once (reuse)
 agent = AgentCore()
 
-# Initialize OpenAI client (moved inside function to ensure env vars are loaded)
 
 @api_view(["POST"])
 def create_session(request):
@@ -28,13 +29,17 @@ def create_session(request):
         "skills": [],
         "projects": [],
         "certifications": []
-    }, conversation=[])
+    })
+    s.recent_turns = (0, [])
+    session_cache.store(s)
     return JsonResponse({"session_id": s.session_id}, status=201)
 
+@audio_upload_handlers
 @api_view(["POST"])
 def voice_input(request):
     """
-    Accepts audio upload (multipart/form-data with 'audio' file and 'session_id')
+    Accepts audio upload (multipart/form-data with 'audio' file and 'session_id',
+    optional 'delta')
     Returns transcribed text.
     """
     audio = request.FILES.get("audio")
@@ -42,49 +47,83 @@ def voice_input(request):
     if not audio or not session_id:
         return JsonResponse({"error": "audio and session_id required"}, status=400)
 
-    # save temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp:
-        for chunk in audio.chunks():
-            tmp.write(chunk)
-        tmp_path = tmp.name
+    session = session_cache.get_session(session_id)
+    if session is None:
+        return JsonResponse({"error": "session not found"}, status=404)
+
+    # Reuse the language the agent already detected so Whisper can skip detection.
+    meta = session.cv_json.get("meta", {}) if isinstance(session.cv_json, dict) else {}
 
-    # transcribe using faster-whisper
+    # decode in memory and transcribe using faster-whisper
     try:
-        text = transcribe_audio_file(tmp_path)
+        text = transcribe_upload(audio, language=meta.get("preferred_language"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except queue.Full:
+        return JsonResponse({"error": "transcription service busy, please retry"}, status=503)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
-    # update conversation
+    # run through agent; the user's turn is stored with the reply
+    session.stage_turn("user", text)
     try:
-        session = CVSession.objects.get(session_id=session_id)
-        session.conversation.append({"from": "user", "text": text})
-        session.save()
-    except CVSession.DoesNotExist:
-        return JsonResponse({"error": "session not found"}, status=404)
-
-    # run through agent
-    agent_response = agent.process_user_message(session, text)
-    return JsonResponse(agent_response, status=200)
+        agent_response = agent.process_user_message(session, text, delta=_wants_delta(request.data))
+    except SessionConflict:
+        return _session_conflict()
+    return JsonResponse(_with_reply_audio(agent_response), status=200)
 
 @api_view(["POST"])
 def process_text(request):
     """
-    Accepts JSON: {'session_id':..., 'text': ...}
-    Returns agent response and updated JSON
+    Accepts JSON: {'session_id':..., 'text': ..., 'delta': bool}
+    Returns agent response and updated JSON; with 'delta' the update is a JSON
+    Patch (cv_json_patch) instead of the whole cv_json.
     """
     data = request.data
     session_id = data.get("session_id")
     text = data.get("text")
     if not session_id or text is None:
         return JsonResponse({"error": "session_id and text required"}, status=400)
-    try:
-        session = CVSession.objects.get(session_id=session_id)
-    except CVSession.DoesNotExist:
+    session = session_cache.get_session(session_id)
+    if session is None:
         return JsonResponse({"error": "session not found"}, status=404)
 
-    session.conversation.append({"from": "user", "text": text})
-    session.save()
-    agent_response = agent.process_user_message(session, text)
-    return JsonResponse(agent_response, status=200)
+    session.stage_turn("user", text)
+    try:
+        agent_response = agent.process_user_message(session, text, delta=_wants_delta(request.data))
+    except SessionConflict:
+        return _session_conflict()
+    return JsonResponse(_with_reply_audio(agent_response), status=200)
+
+
+def _session_conflict():
+    """409 for a turn that lost every commit retry to concurrent turns on the same session."""
+    return JsonResponse({"error": "session was updated by another request, please retry"}, status=409)
+
+
+def _wants_delta(data):
+    """Read the optional 'delta' flag from a JSON body or form data."""
+    return str(data.get("delta", "")).lower() in ("1", "true", "yes")
+
+
+def _with_reply_audio(agent_response):
+    """Attach synthesized speech for agent_text when TTS_REPLY_AUDIO is on."""
+    if getattr(settings, "TTS_REPLY_AUDIO", False) and agent_response.get("agent_text"):
+        agent_response.update(reply_audio(agent_response["agent_text"]))
+    return agent_response
+
+
+@api_view(["GET"])
+def tts_audio(request, key):
+    """
+    Serve rendered reply audio. Returns 202 while the render is still queued
+    so clients can poll, 404 once the key is unknown or evicted.
+    """
+    audio, pending = lookup_reply_audio(key)
+    if audio is not None:
+        return HttpResponse(audio, content_type="audio/wav")
+    if pending:
+        return JsonResponse({"status": "pending"}, status=202)
+    return JsonResponse({"error": "audio not found"}, status=404)
 
 
 def save_cv_to_database(user, cv_json):
@@ -208,9 +247,8 @@ def save_cv_to_database(user, cv_json):
 
 @api_view(["GET"])
 def get_session(request, session_id):
-    try:
-        session = CVSession.objects.get(session_id=session_id)
-    except CVSession.DoesNotExist:
+    session = session_cache.get_session(session_id)
+    if session is None:
         return JsonResponse({"error": "session not found"}, status=404)
     ser = CVSessionSerializer(session)
     return JsonResponse(ser.data, safe=False)
@@ -220,9 +258,8 @@ def generate_cv(request, session_id):
     """
     Generates PDF and DOCX and returns download links / binary.
     """
-    try:
-        session = CVSession.objects.get(session_id=session_id)
-    except CVSession.DoesNotExist:
+    session = session_cache.get_session(session_id)
+    if session is None:
         return JsonResponse({"error": "session not found"}, status=404)
 
     cv_json = session.cv_json or {}
@@ -240,10 +277,7 @@ def generate_cv(request, session_id):
     refinement_note = None
     try:
         refinement = openai_refine_cv(cv_json, target_language=target_language)
-        refined_cv = refinement.get("cv_json", cv_json)
-        session.cv_json = refined_cv
-        session.cv_json.setdefault("meta", {})["refined"] = True
-        session.save(update_fields=["cv_json", "updated_at"])
+        refined_cv = _store_refinement(session, cv_json, refinement.get("cv_json", cv_json))
     except Exception as exc:
         refined_cv = cv_json
         logger.warning("OpenAI CV refinement failed: %s", exc)
@@ -298,8 +332,7 @@ def chat(request):
     if not message:
         return JsonResponse({"error": "message required"}, status=400)
 
-    # Initialize OpenAI client here to ensure env vars are loaded
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    client = get_openai_client()
     try:
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -403,9 +436,8 @@ def get_user_cv(request):
 
 @api_view(["GET"])
 def get_session(request, session_id):
-    try:
-        session = CVSession.objects.get(session_id=session_id)
-    except CVSession.DoesNotExist:
+    session = session_cache.get_session(session_id)
+    if session is None:
         return JsonResponse({"error": "session not found"}, status=404)
     ser = CVSessionSerializer(session)
     return JsonResponse(ser.data, safe=False)
@@ -415,9 +447,8 @@ def generate_cv(request, session_id):
     """
     Generates PDF and DOCX and returns download links / binary.
     """
-    try:
-        session = CVSession.objects.get(session_id=session_id)
-    except CVSession.DoesNotExist:
+    session = session_cache.get_session(session_id)
+    if session is None:
         return JsonResponse({"error": "session not found"}, status=404)
 
     cv_json = session.cv_json or {}
@@ -435,21 +466,35 @@ def generate_cv(request, session_id):
     refinement_note = None
     try:
         refinement = openai_refine_cv(cv_json, target_language=target_language)
-        refined_cv = refinement.get("cv_json", cv_json)
-        session.cv_json = refined_cv
-        session.cv_json.setdefault("meta", {})["refined"] = True
-        session.save(update_fields=["cv_json", "updated_at"])
+        refined_cv = _store_refinement(session, cv_json, refinement.get("cv_json", cv_json))
     except Exception as exc:
         refined_cv = cv_json
         logger.warning("OpenAI CV refinement failed: %s", exc)
         refinement_note = "Skipped AI refinement due to an error. Using collected details as-is."
 
+    return _render_cv_response(session, refined_cv, [refinement_note] if refinement_note else [])
+
+
+def _store_refinement(session, cv_json, refined_cv):
+    """
+    Save the refined CV, marked as refined, unless a turn changed the CV while
+    it was being refined: that turn's newer cv_json wins. Returns the refined CV.
+    """
+    refined_cv = {**refined_cv, "meta": {**(refined_cv.get("meta") or {}), "refined": True}}
+
+    def apply(current):
+        if current.cv_json == cv_json:
+            current.cv_json = refined_cv
+        return []
+
+    session.commit_turn(apply)
+    return refined_cv
+
+
+def _render_cv_response(session, refined_cv, notes):
+    """Render the HTML preview and DOCX for a (refined) CV into the generate_cv response."""
     html_content = None
     docx_base64 = None
-    notes = []
-
-    if refinement_note:
-        notes.append(refinement_note)
 
     # Generate HTML preview
     try:
@@ -493,8 +538,7 @@ def chat(request):
     if not message:
         return JsonResponse({"error": "message required"}, status=400)
 
-    # Initialize OpenAI client here to ensure env vars are loaded
-    client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    client = get_openai_client()
     try:
         response = client.chat.completions.create(
             model="gpt-3.5-turbo",
@@ -0,0 +1,212 @@
+"""
+Async views served by the ASGI application (voice_to_cv/asgi.py).
+
+The /api/async/ endpoints mirror process_text, voice_input and generate_cv.
+LLM calls are awaited on the event loop and Whisper runs on the transcription
+executor, so one worker holds many in-flight turns instead of one thread each.
+"""
+import json
+import queue
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from agents.openai_tools import aopenai_refine_cv
+from agents.voice_handler import atranscribe_upload
+from utils.audio_decoder import audio_upload_handlers
+from utils.logger import logger
+from . import session_cache
+from .models import SessionConflict
+from .views import _render_cv_response, _session_conflict, _store_refinement, _wants_delta, _with_reply_audio, agent
+
+_STREAM_END = object()
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@database_sync_to_async
+def _permission_error(request):
+    """
+    Apply the API's DRF authentication and permission classes to a plain
+    Django async view. Returns an error response, or None when allowed.
+    """
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        for permission in api_settings.DEFAULT_PERMISSION_CLASSES:
+            if not permission().has_permission(drf_request, None):
+                if drf_request.successful_authenticator is None:
+                    return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+                return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+    except Exception as exc:
+        # AuthenticationFailed (bad token) and PermissionDenied (CSRF) carry a detail message.
+        return JsonResponse({"detail": str(getattr(exc, "detail", exc))}, status=getattr(exc, "status_code", 403))
+    request.user = drf_request.user
+    return None
+
+
+@csrf_exempt
+@require_POST
+async def process_text_stream(request):
+    """
+    Accepts JSON: {'session_id':..., 'text': ...}
+    Streams the agent reply as Server-Sent Events:
+        event: token  data: {"text": ...}   agent_text fragments as the LLM produces them
+        event: final  data: {"agent_text", "next_action", "cv_json_patch"}
+    The final agent_text replaces the streamed one (it may be the next
+    required question instead); apply cv_json_patch (JSON Patch) to the client's cv_json.
+    """
+    error = await _permission_error(request)
+    if error is not None:
+        return error
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"error": "invalid JSON"}, status=400)
+    session_id = data.get("session_id")
+    text = data.get("text")
+    if not session_id or text is None:
+        return JsonResponse({"error": "session_id and text required"}, status=400)
+
+    session = await session_cache.aget_session(session_id)
+    if session is None:
+        return JsonResponse({"error": "session not found"}, status=404)
+    session.stage_turn("user", text)
+
+    events = agent.stream_user_message(session, text)
+    # The agent turn is synchronous (LangChain stream, turn commit); advance it one
+    # event at a time off the event loop.
+    next_event = database_sync_to_async(lambda: next(events, _STREAM_END), thread_sensitive=False)
+
+    async def stream():
+        while True:
+            try:
+                event = await next_event()
+            except SessionConflict as exc:
+                yield _sse("final", {"error": str(exc)})
+                return
+            if event is _STREAM_END:
+                return
+            kind, payload = event
+            yield _sse(kind, {"text": payload} if kind == "token" else payload)
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _json_body(request):
+    try:
+        return json.loads(request.body or b"{}")
+    except json.JSONDecodeError:
+        return None
+
+
+@csrf_exempt
+@require_POST
+async def process_text(request):
+    """
+    Accepts JSON: {'session_id':..., 'text': ..., 'delta': bool}
+    Returns agent response and updated JSON, or a JSON Patch with 'delta'
+    """
+    error = await _permission_error(request)
+    if error is not None:
+        return error
+    data = _json_body(request)
+    if data is None:
+        return JsonResponse({"error": "invalid JSON"}, status=400)
+    session_id = data.get("session_id")
+    text = data.get("text")
+    if not session_id or text is None:
+        return JsonResponse({"error": "session_id and text required"}, status=400)
+    session = await session_cache.aget_session(session_id)
+    if session is None:
+        return JsonResponse({"error": "session not found"}, status=404)
+
+    session.stage_turn("user", text)
+    try:
+        agent_response = await agent.aprocess_user_message(session, text, delta=_wants_delta(data))
+    except SessionConflict:
+        return _session_conflict()
+    return JsonResponse(_with_reply_audio(agent_response), status=200)
+
+
+@audio_upload_handlers
+@csrf_exempt
+@require_POST
+async def voice_input(request):
+    """
+    Accepts audio upload (multipart/form-data with 'audio' file and 'session_id',
+    optional 'delta')
+    Returns the agent response for the transcribed text.
+    """
+    error = await _permission_error(request)
+    if error is not None:
+        return error
+    audio = request.FILES.get("audio")
+    session_id = request.POST.get("session_id")
+    if not audio or not session_id:
+        return JsonResponse({"error": "audio and session_id required"}, status=400)
+
+    session = await session_cache.aget_session(session_id)
+    if session is None:
+        return JsonResponse({"error": "session not found"}, status=404)
+    meta = session.cv_json.get("meta", {}) if isinstance(session.cv_json, dict) else {}
+
+    try:
+        text = await atranscribe_upload(audio, language=meta.get("preferred_language"))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except queue.Full:
+        return JsonResponse({"error": "transcription service busy, please retry"}, status=503)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+    session.stage_turn("user", text)
+    try:
+        agent_response = await agent.aprocess_user_message(session, text, delta=_wants_delta(request.POST))
+    except SessionConflict:
+        return _session_conflict()
+    return JsonResponse(_with_reply_audio(agent_response), status=200)
+
+
+@csrf_exempt
+@require_GET
+async def generate_cv(request, session_id):
+    """
+    Generates the HTML preview and DOCX; rendering runs in a worker thread.
+    """
+    error = await _permission_error(request)
+    if error is not None:
+        return error
+    session = await session_cache.aget_session(session_id)
+    if session is None:
+        return JsonResponse({"error": "session not found"}, status=404)
+
+    cv_json = session.cv_json or {}
+    if not cv_json.get("personal_info", {}).get("name"):
+        return JsonResponse({"error": "CV data is incomplete. Please provide at least your name."}, status=400)
+
+    target_language = (
+        cv_json.get("meta", {}).get("preferred_language")
+        if isinstance(cv_json.get("meta"), dict)
+        else None
+    ) or "auto"
+
+    notes = []
+    try:
+        refinement = await aopenai_refine_cv(cv_json, target_language=target_language)
+        refined_cv = await sync_to_async(_store_refinement)(session, cv_json, refinement.get("cv_json", cv_json))
+    except Exception as exc:
+        refined_cv = cv_json
+        logger.warning("OpenAI CV refinement failed: %s", exc)
+        notes.append("Skipped AI refinement due to an error. Using collected details as-is.")
+
+    return await sync_to_async(_render_cv_response, thread_sensitive=False)(session, refined_cv, notes)
@@ -0,0 +1,68 @@
+"""
+Agent prompt size benchmark
+Prompt tokens per turn for a synthetic session: full conversation replay (the
+original get_conversation_for_agent) versus build_agent_context. The summary
+LLM call is replaced by a fixed-length summary so no API key is needed.
+
+Run from the backend folder:
+    python -m benchmarks.bench_agent_context --turns 60
+"""
+
+import argparse
+from unittest import mock
+
+from benchmarks.common import setup_django
+
+SUMMARY = " ".join(["fact"] * 120)
+
+
+class SyntheticSession:
+    def __init__(self):
+        self.cv_json = {"personal_info": {"name": "Ravi Kumar", "email": "ravi@example.com"}, "skills": ["Welding"]}
+        self.conversation = []
+        self.context_summary = ""
+        self.summary_turns = 0
+
+    @property
+    def turn_count(self):
+        return len(self.conversation)
+
+    def get_turns(self, start=0, end=None):
+        return self.conversation[start:end]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=60)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from agents import memory_handler
+    from agents.memory_handler import build_agent_context, count_message_tokens
+
+    # Summarize in the turn that asks for it, so every run prints the same table.
+    settings.AGENT_SUMMARY_BACKGROUND = False
+
+    session = SyntheticSession()
+    print(f"{'turn':>5s} {'full replay':>12s} {'windowed':>9s} {'summarized':>11s}")
+    with mock.patch("agents.openai_tools.openai_chat_completion", return_value=SUMMARY) as summarize:
+        for turn in range(1, args.turns + 1):
+            session.conversation.append({"from": "user", "text": f"Answer number {turn} with a few details about my work."})
+            full = count_message_tokens(
+                [memory_handler._system_message(session)]
+                + [memory_handler._turn_message(item) for item in session.conversation]
+            )
+            context = build_agent_context(session)
+            if turn % 10 == 0 or turn == 1:
+                print(
+                    f"{turn:5d} {full:12d} {context.accounting['context_tokens']:9d} "
+                    f"{context.accounting['turns_summarized']:11d}"
+                )
+            session.conversation.append({"from": "agent", "text": "Thanks. Could you share your phone number?"})
+    print(f"summary refreshes: {summarize.call_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Agent reply streaming benchmark
+Time to first agent_text token over /api/process_text/stream/ versus time to
+the complete reply over /api/process_text/, against the local OpenAI stub
+streaming one chunk every --token-ms. Requests run in-process through the
+ASGI application. Uses (and creates sessions in) the configured database.
+
+Run from the backend folder:
+    python -m benchmarks.bench_agent_stream --turns 10 --token-ms 20
+"""
+
+import argparse
+import asyncio
+import statistics
+
+from benchmarks.common import asgi_post, bench_token, setup_django
+from benchmarks.stub_openai import start_stub
+
+
+async def run(args):
+    from api.models import CVSession
+    from voice_to_cv.asgi import application
+
+    token = await bench_token()
+    plain, ttft = [], []
+    for _ in range(args.turns):
+        session = await CVSession.objects.acreate(cv_json={})
+        body = {"session_id": str(session.session_id), "text": "I studied mechanical engineering"}
+        _, total = await asgi_post(application, "/api/process_text/", body, token)
+        plain.append(total * 1000)
+        first, _ = await asgi_post(application, "/api/process_text/stream/", body, token)
+        ttft.append(first * 1000)
+        await session.adelete()
+    print(f"complete reply (process_text)       median {statistics.median(plain):7.1f} ms")
+    print(f"first token (process_text/stream)   median {statistics.median(ttft):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--token-ms", type=int, default=20, help="stub delay between streamed chunks")
+    args = parser.parse_args()
+
+    server = start_stub(token_ms=args.token_ms)
+    setup_django()
+    from django.conf import settings
+
+    settings.OPENAI_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "sk-stub"
+    # Every turn must reach the stub; identical synthetic prompts would be cache hits.
+    settings.LLM_CACHE_BACKEND = "none"
+    settings.ALLOWED_HOSTS = ["*"]
+    asyncio.run(run(args))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Audio accumulator micro-benchmark
+Compares the original np.concatenate accumulator with PCMRingBuffer at 20 ms frames.
+
+Run from the backend folder:
+    python -m benchmarks.bench_audio_buffer --seconds 600
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from agents.audio_buffer import PCMRingBuffer
+
+SAMPLE_RATE = 16000
+
+
+def concat_accumulator(frames, chunk_samples):
+    """The original StreamingVoiceProcessor.add_frame buffering path."""
+    buffer = np.array([], dtype=np.float32)
+    copied = 0
+    chunks = 0
+    for pcm in frames:
+        frame = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        copied += frame.nbytes * 2  # astype + division
+        buffer = np.concatenate([buffer, frame])
+        copied += buffer.nbytes
+        if buffer.size >= chunk_samples:
+            chunk = buffer[:chunk_samples]
+            buffer = buffer[chunk_samples:]
+            chunks += int(chunk.size > 0)
+    return copied, chunks
+
+
+def ring_accumulator(frames, chunk_samples):
+    ring = PCMRingBuffer(chunk_samples * 2)
+    chunks = 0
+    for pcm in frames:
+        frame = np.frombuffer(pcm, dtype=np.int16)
+        offset = 0
+        while offset < frame.size:
+            offset += ring.write(frame[offset:])
+            while len(ring) >= chunk_samples:
+                chunk = ring.read(chunk_samples)
+                chunks += int(chunk.size > 0)
+    return ring.bytes_copied, chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=int, default=300, help="session length to simulate")
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--chunk-seconds", type=int, default=3)
+    args = parser.parse_args()
+
+    frame_samples = SAMPLE_RATE * args.frame_ms // 1000
+    chunk_samples = SAMPLE_RATE * args.chunk_seconds
+    rng = np.random.default_rng(0)
+    total = SAMPLE_RATE * args.seconds
+    audio = rng.integers(-3000, 3000, size=total, dtype=np.int16)
+    frames = [audio[i:i + frame_samples].tobytes() for i in range(0, total, frame_samples)]
+
+    print(f"{len(frames)} frames of {args.frame_ms} ms, {args.chunk_seconds} s chunks")
+    for name, func in (("concatenate", concat_accumulator), ("ring buffer", ring_accumulator)):
+        start = time.perf_counter()
+        copied, chunks = func(frames, chunk_samples)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:12s} {elapsed * 1000:9.1f} ms  "
+            f"{elapsed / len(frames) * 1e6:7.2f} us/frame  "
+            f"{copied / 1e6:9.1f} MB copied  {chunks} chunks"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Compressed JSON column benchmark
+Stored size and read / write latency of CV documents in a JSONField (the
+original cv_json / cv_data storage) and in a CompressedJSONField (compact
+UTF-8, zlib above COMPRESSED_JSON_THRESHOLD). Documents range from a fresh
+session to a long CV refined into Hindi and Telugu. Each write saves one
+row; each read loads it by primary key. Creates two scratch tables in the
+configured database and drops them afterwards.
+
+Run from the backend folder:
+    python -m benchmarks.bench_compressed_json --repeat 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.common import setup_django
+
+EMPTY_CV = {"personal_info": {}, "education": [], "experience": [], "skills": [], "projects": [], "certifications": []}
+HINDI = "जहाज़ के पतवार खंडों की फिटिंग और संरेखण, ब्लूप्रिंट पढ़ना और प्रशिक्षुओं को प्रशिक्षण देना। "
+TELUGU = "ఓడ హల్ విభాగాల అమరిక మరియు అలైన్‌మెంట్, బ్లూప్రింట్ చదవడం, అప్రెంటిస్‌లకు శిక్షణ. "
+
+
+def cv(jobs, text, repeat):
+    return {
+        "personal_info": {"name": "Ravi Kumar", "email": "ravi.kumar@example.com", "phone": "+91 98765 43210"},
+        "education": [{"degree": "B.Tech Mechanical Engineering", "institute": "Andhra University", "end_year": "2014"}],
+        "experience": [
+            {"company": f"Shipyard {index}", "role": "Fitter", "start_date": str(2005 + index),
+             "end_date": str(2006 + index), "description": text * repeat}
+            for index in range(jobs)
+        ],
+        "skills": ["welding", "fitting", "blueprint reading", "rigging", "arc welding"],
+        "projects": [{"project_name": "Dry dock pump overhaul", "description": text * repeat, "technologies": []}],
+        "certifications": [{"name": "Arc welding", "issuer": "NSDC", "year": "2019"}],
+        "meta": {"preferred_language": "hi", "refined": True},
+    }
+
+
+DOCUMENTS = {
+    "new session": EMPTY_CV,
+    "english cv": cv(3, "Fitted and aligned hull sections; read blueprints; trained apprentices. ", 2),
+    "hindi refined": cv(6, HINDI, 4),
+    "telugu refined": cv(10, TELUGU, 8),
+}
+
+
+def scratch_model(name, field):
+    from django.db import models
+
+    meta = type("Meta", (), {"app_label": "api", "db_table": f"bench_{name.lower()}"})
+    return type(name, (models.Model,), {"doc": field, "Meta": meta, "__module__": __name__})
+
+
+def timed_ms(action, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, models
+
+    from utils.fields import CompressedJSONField, encode_json
+
+    Plain = scratch_model("JsonPlainDoc", models.JSONField())
+    Packed = scratch_model("JsonPackedDoc", CompressedJSONField())
+    with connection.schema_editor() as editor:
+        editor.create_model(Plain)
+        editor.create_model(Packed)
+    try:
+        print(
+            f"{'document':15s} {'json bytes':>11s} {'stored bytes':>13s} {'ratio':>6s} "
+            f"{'write ms json/packed':>21s} {'read ms json/packed':>20s}"
+        )
+        for label, document in DOCUMENTS.items():
+            results = []
+            for model in (Plain, Packed):
+                row = model.objects.create(doc=document)
+                write = timed_ms(lambda: row.save(update_fields=["doc"]), args.repeat)
+                read = timed_ms(lambda: model.objects.get(pk=row.pk).doc, args.repeat)
+                if model.objects.get(pk=row.pk).doc != document:
+                    raise SystemExit(f"{label}: {model.__name__} did not round-trip")
+                results.append((write, read))
+            # What each column holds: JSONField's json.dumps text, and the marker byte plus payload.
+            plain_bytes = len(json.dumps(document).encode("utf-8"))
+            packed_bytes = len(encode_json(document))
+            (plain_write, plain_read), (packed_write, packed_read) = results
+            print(
+                f"{label:15s} {plain_bytes:11d} {packed_bytes:13d} {plain_bytes / packed_bytes:5.1f}x "
+                f"{plain_write:10.3f}/{packed_write:<10.3f} {plain_read:9.3f}/{packed_read:.3f}"
+            )
+    finally:
+        with connection.schema_editor() as editor:
+            editor.delete_model(Plain)
+            editor.delete_model(Packed)
+
+
+if __name__ == "__main__":
+    main()
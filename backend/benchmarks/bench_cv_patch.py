@@ -0,0 +1,83 @@
+"""
+CV delta protocol benchmark
+Replays a scripted CV-building session and, per turn, compares what the LLM
+has to write (the whole cv_json vs JSON Patch operations for the changed
+paths) and what the API sends back (full cv_json vs cv_json_patch). The
+patch the model would emit is taken as the diff between consecutive CVs.
+
+Run from the backend folder:
+    python -m benchmarks.bench_cv_patch --repeat 3
+"""
+
+import argparse
+import json
+
+from benchmarks.common import setup_django
+
+# One sparse update per turn, in the order the agent asks.
+UPDATES = [
+    {"personal_info": {"name": "Ravi Kumar"}},
+    {"personal_info": {"email": "ravi.kumar@example.com"}},
+    {"personal_info": {"phone": "9876543210"}},
+    {"personal_info": {"address": "Plot 12, Gajuwaka, Visakhapatnam"}},
+    {"education": [{"degree": "ITI Fitter", "institute": "Government ITI Visakhapatnam"}]},
+    {"education": [{"start_year": "2015", "end_year": "2017"}]},
+    {"experience": [{"company": "Hindustan Shipyard", "role": "Fitter"}]},
+    {"experience": [{"start_date": "2017-08", "end_date": "2021-03"}]},
+    {"experience": [{"description": "Fitted hull sections\nRead fabrication drawings\nTrained two apprentices"}]},
+    {"skills": ["Pipe fitting", "Arc welding", "Blueprint reading", "Forklift operation"]},
+    {"projects": [{"project_name": "Dry dock pump overhaul", "description": "Replaced seals and aligned shafts on two pumps"}]},
+    {"certifications": [{"name": "Welding Level 2", "issuer": "NSDC", "year": "2019"}]},
+]
+
+
+def grow(cv, update, repeat):
+    """Apply ``update``; each repeat of the script adds new entries instead of editing old ones."""
+    cv = json.loads(json.dumps(cv))
+    for section, value in update.items():
+        if isinstance(value, dict):
+            cv.setdefault(section, {}).update(value)
+        elif section == "skills":
+            cv[section] = cv.get(section, []) + [f"{skill} {repeat}" if repeat else skill for skill in value]
+        else:
+            entries = cv.setdefault(section, [])
+            if len(entries) <= repeat:
+                entries.append(dict(value[0]))
+            else:
+                entries[-1] = {**entries[-1], **value[0]}
+    return cv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="times to run the script (the CV keeps growing)")
+    args = parser.parse_args()
+
+    setup_django()
+    from agents.cv_patch import diff
+    from agents.memory_handler import count_tokens
+
+    cv = {}
+    totals = {"full_tokens": 0, "patch_tokens": 0, "full_bytes": 0, "patch_bytes": 0}
+    print(f"{'turn':>5s} {'LLM full':>9s} {'LLM patch':>10s} {'API full B':>11s} {'API patch B':>12s}")
+    turn = 0
+    for repeat in range(args.repeat):
+        for update in UPDATES if repeat == 0 else UPDATES[4:]:
+            turn += 1
+            after = grow(cv, update, repeat)
+            ops = diff(cv, after)
+            full = json.dumps(after, ensure_ascii=False)
+            patch = json.dumps(ops, ensure_ascii=False)
+            row = (count_tokens(full), count_tokens(patch), len(full.encode()), len(patch.encode()))
+            for key, value in zip(totals, row):
+                totals[key] += value
+            print(f"{turn:5d} {row[0]:9d} {row[1]:10d} {row[2]:11d} {row[3]:12d}")
+            cv = after
+    print(
+        f"total  LLM output tokens {totals['full_tokens']} -> {totals['patch_tokens']}  "
+        f"API payload bytes {totals['full_bytes']} -> {totals['patch_bytes']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
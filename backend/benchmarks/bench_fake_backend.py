@@ -0,0 +1,102 @@
+"""
+Offline request overhead benchmark
+Plays scripted CV conversations through /api/process_text/ and then
+/api/generate_cv/ with LLM_BACKEND=fake, so no network or API key is
+needed. The fake's simulated LLM time is subtracted from each request's
+wall time, leaving our own overhead (views, ORM, prompt building,
+normalization, rendering). Uses (and creates sessions in) the configured
+database.
+
+Run from the backend folder:
+    python -m benchmarks.bench_fake_backend --sessions 10 --latency lognormal:300,0.5
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import setup_django
+
+CONVERSATION = [
+    "Hi, my name is Ravi Kumar.",
+    "ravi.kumar@example.com",
+    "+91 98765 43210",
+    "I live in Visakhapatnam.",
+    "I studied mechanical engineering at Andhra University in 2014.",
+    "I worked at Hindustan Shipyard as a fitter from 2015 to 2020.",
+    "My skills are welding, fitting, blueprint reading.",
+    "I did a project called dry dock pump overhaul.",
+    "I am certified in arc welding from NSDC in 2019.",
+]
+
+
+def timed(backend, request):
+    """(wall ms, our ms) for one request: wall time minus the fake LLM's simulated time."""
+    simulated = backend.simulated_seconds
+    start = time.perf_counter()
+    response = request()
+    wall = time.perf_counter() - start
+    if response.status_code != 200:
+        raise SystemExit(f"request failed ({response.status_code}): {response.content[:200]!r}")
+    return wall * 1000, (wall - (backend.simulated_seconds - simulated)) * 1000
+
+
+def report(label, samples):
+    walls = sorted(wall for wall, _ in samples)
+    ours = sorted(own for _, own in samples)
+    print(
+        f"{label:13s} n={len(samples):4d}  wall median {statistics.median(walls):7.1f} ms  "
+        f"ours median {statistics.median(ours):6.1f} ms  p95 {ours[int(len(ours) * 0.95) - 1]:6.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", default="0", help="fake LLM latency spec, e.g. fixed:300 or uniform:100-500")
+    parser.add_argument("--token-ms", type=float, default=0, help="fake LLM delay per streamed chunk")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.LLM_BACKEND = "fake"
+    settings.FAKE_LLM_LATENCY = args.latency
+    settings.FAKE_LLM_TOKEN_MS = args.token_ms
+    # Every turn must reach the backend; the conversations repeat word for word.
+    settings.LLM_CACHE_BACKEND = "none"
+    settings.ALLOWED_HOSTS = ["*"]
+
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    from agents.openai_tools import get_llm_backend
+    from api.models import CVSession
+
+    backend = get_llm_backend()
+    client = APIClient()
+    client.force_authenticate(User.objects.get_or_create(username="benchmarks")[0])
+
+    turns, renders, created = [], [], []
+    for _ in range(args.sessions + 1):  # the first session warms imports and templates
+        session = CVSession.objects.create(cv_json={})
+        created.append(session.session_id)
+        session_turns = [
+            timed(backend, lambda: client.post(
+                "/api/process_text/", {"session_id": str(session.session_id), "text": text}, format="json"
+            ))
+            for text in CONVERSATION
+        ]
+        render = timed(backend, lambda: client.get(f"/api/generate_cv/{session.session_id}/"))
+        if len(created) > 1:
+            turns += session_turns
+            renders.append(render)
+    CVSession.objects.filter(session_id__in=created).delete()
+
+    print(f"{args.sessions} sessions, fake LLM latency {args.latency!r}, {backend.calls} LLM calls")
+    report("process_text", turns)
+    report("generate_cv", renders)
+
+
+if __name__ == "__main__":
+    main()
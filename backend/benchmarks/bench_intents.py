@@ -0,0 +1,171 @@
+"""
+Intent matching micro-benchmark
+Compares the original per-call phrase lists and ``any(phrase in text)`` loops
+from AgentCore with the compiled IntentMatcher, on a corpus of user replies
+paired with agent prompts. Reports disagreements (there should be none) and
+the time per turn for each.
+
+Run from the backend folder:
+    python -m benchmarks.bench_intents --iterations 2000
+"""
+
+import argparse
+import itertools
+import time
+
+from benchmarks.common import setup_django
+
+REPLIES = [
+    "no",
+    "No, I don't have experience",
+    "I am a fresher looking for my first job",
+    "nenu fresher",
+    "naaku experience ledu",
+    "పని అనుభవం లేదు job",
+    "I have 3 years of experience as a welder",
+    "I know welding and have experience with arc welding",
+    "nope",
+    "none",
+    "no certificates",
+    "I don't have any certifications",
+    "AWS certified, 2021",
+    "yes",
+    "s",
+    "ok please generate it",
+    "not now",
+    "maybe later",
+    "hold on, let me check",
+    "I worked on a pump overhaul project for two months",
+    "My role was fitting and my key contributions were alignment",
+    "Ravi Kumar",
+    "ravi.kumar@example.com",
+    "  Yeah  ",
+    "వద్దు",
+]
+PROMPTS = [
+    "Do you have any work experience you'd like to include?",
+    "Do you have any certifications to add?",
+    "Could you share a brief summary of your role and key contributions for your main project?",
+    "Thank you for providing the details. All key details are captured! Would you like me to generate your CV now?",
+    "What's your email address?",
+]
+
+
+def legacy_flags(user_text, last_agent_prompt):
+    """The original AgentCore checks, phrase lists rebuilt on every call."""
+    user_lower = user_text.lower()
+    last_agent_prompt_lower = last_agent_prompt.lower()
+    no_experience_phrases = [
+        "no experience", "don't have experience", "do not have experience", "dont have experience",
+        "no i dont have experience", "no, i don't have experience", "no, i dont have experience",
+        "no i don't have experience", "no experience yet", "fresher", "i am a fresher", "i'm a fresher",
+        "no work experience", "haven't worked", "havent worked", "never worked", "no prior experience",
+        "no experiance", "dont have experiance",
+    ]
+    declined_experience = any(phrase in user_lower for phrase in no_experience_phrases)
+    telugu_negative_tokens = ["ledu", "ledhu", "lādu", "లేదు", "లేడు", "వద్దు", "కావదు", "కావలెదు"]
+    if not declined_experience:
+        has_telugu_negative = any(token in user_lower for token in telugu_negative_tokens)
+        if has_telugu_negative and any(keyword in user_lower for keyword in ["experience", "exper", "job", "work"]):
+            declined_experience = True
+    if not declined_experience and "experienc" in user_lower:
+        negative_tokens = ["no", "don't", "dont", "do not", "haven't", "havent", "never", "none"]
+        declined_experience = any(token in user_lower for token in negative_tokens)
+    if not declined_experience and "experience" in last_agent_prompt_lower:
+        concise_negative_replies = [
+            "no", "nope", "none", "not yet", "no i dont have", "no i don't have", "i dont have",
+            "i don't have", "dont have", "don't have", "nil",
+        ]
+        declined_experience = any(user_lower.strip().startswith(reply) for reply in concise_negative_replies)
+
+    declined_certifications = False
+    if "certification" in last_agent_prompt_lower or "certifications" in last_agent_prompt_lower:
+        cert_negative_replies = [
+            "no", "nope", "none", "no i dont have", "no i don't have", "i dont have", "i don't have",
+            "dont have", "don't have", "no certification", "no certifications", "no certificate",
+            "no certificates",
+        ]
+        stripped_lower = user_lower.strip()
+        if any(stripped_lower.startswith(reply) for reply in cert_negative_replies):
+            declined_certifications = True
+        if not declined_certifications and any(token in stripped_lower for token in telugu_negative_tokens):
+            declined_certifications = True
+
+    project_followup_keywords = [
+        "more detail", "responsibil", "contribution", "your role", "your responsibilities", "key contributions",
+    ]
+    project_followup = "project" in last_agent_prompt_lower and any(
+        keyword in last_agent_prompt_lower for keyword in project_followup_keywords
+    )
+
+    stripped_lower = user_lower.strip()
+    affirm_exact = {"yes", "y", "yep", "yup", "yeah", "sure", "ok", "okay", "please", "s"}
+    affirm_contains = [
+        "generate", "create", "go ahead", "do it", "make it", "ready", "proceed", "let's do", "lets do", "download",
+    ]
+    decline_exact = {"no", "not now", "not yet", "nope", "later"}
+    decline_contains = ["don't", "dont", "maybe later", "hold on"]
+    affirm = stripped_lower in affirm_exact or any(phrase in user_lower for phrase in affirm_contains)
+    decline = stripped_lower in decline_exact or any(phrase in user_lower for phrase in decline_contains)
+    return declined_experience, declined_certifications, project_followup, affirm, decline
+
+
+def matcher_flags(intents, user_text, last_agent_prompt):
+    """The same checks as AgentCore now makes them."""
+    last_agent_prompt_lower = last_agent_prompt.lower()
+    declined_experience = (
+        intents.matches("no_experience", user_text)
+        or (intents.matches("refusal", user_text) and intents.matches("mentions_work", user_text))
+        or (intents.matches("mentions_experience", user_text) and intents.matches("negation", user_text))
+        or ("experience" in last_agent_prompt_lower and intents.matches("short_no", user_text))
+    )
+    declined_certifications = "certification" in last_agent_prompt_lower and (
+        intents.matches("no_certifications", user_text) or intents.matches("refusal", user_text)
+    )
+    project_followup = "project" in last_agent_prompt_lower and intents.matches(
+        "project_followup", last_agent_prompt_lower
+    )
+    return (
+        bool(declined_experience),
+        bool(declined_certifications),
+        bool(project_followup),
+        intents.matches("affirm", user_text),
+        intents.matches("decline", user_text),
+    )
+
+
+def per_turn_us(func, pairs, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for user_text, prompt in pairs:
+            func(user_text, prompt)
+    return (time.perf_counter() - start) / (iterations * len(pairs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000, help="passes over the corpus")
+    args = parser.parse_args()
+
+    setup_django()
+    from agents.intents import get_intent_matcher
+
+    intents = get_intent_matcher()
+    pairs = list(itertools.product(REPLIES, PROMPTS))
+    disagreements = [
+        (user_text, prompt)
+        for user_text, prompt in pairs
+        if legacy_flags(user_text, prompt) != matcher_flags(intents, user_text, prompt)
+    ]
+    for user_text, prompt in disagreements:
+        print(f"disagreement: {user_text!r} after {prompt!r}")
+
+    legacy = per_turn_us(legacy_flags, pairs, args.iterations)
+    compiled = per_turn_us(lambda user_text, prompt: matcher_flags(intents, user_text, prompt), pairs, args.iterations)
+    print(f"{len(pairs)} reply/prompt pairs, {len(disagreements)} disagreements")
+    print(f"phrase loops     {legacy:7.2f} us/turn")
+    print(f"intent matcher   {compiled:7.2f} us/turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+LLM response cache benchmark
+Replays a workload with repeated prompts (sessions opening with the same
+reply, a retried turn, a CV refined twice) through openai_chat_completion
+and openai_refine_cv against the local stub, once per cache backend, and
+reports time per call and the hit rate.
+
+Run from the backend folder:
+    python -m benchmarks.bench_llm_cache --sessions 20 --latency-ms 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import setup_django
+from benchmarks.stub_openai import start_stub
+
+CV = {"personal_info": {"name": "Ravi Kumar", "email": "ravi@example.com"}, "skills": ["Welding", "Fitting"]}
+
+
+def workload(sessions):
+    """(kind, payload) calls: every session opens the same way, then says something of its own."""
+    calls = []
+    for session in range(sessions):
+        calls.append(("chat", [{"role": "user", "content": "Hi, I want to make my CV"}]))
+        calls.append(("chat", [{"role": "user", "content": f"My name is Person {session}"}]))
+        if session % 4 == 0:
+            # A retried turn: same prompt, extra whitespace.
+            calls.append(("chat", [{"role": "user", "content": f"My name is  Person {session} "}]))
+    calls += [("refine", CV), ("refine", CV)]
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=200, help="simulated API latency")
+    args = parser.parse_args()
+
+    server = start_stub(latency_ms=args.latency_ms)
+    setup_django()
+    from django.conf import settings
+
+    settings.OPENAI_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "sk-stub"
+    from agents import llm_cache
+    from agents.openai_tools import openai_chat_completion, openai_refine_cv
+
+    calls = workload(args.sessions)
+    with tempfile.TemporaryDirectory() as folder:
+        settings.LLM_CACHE_PATH = os.path.join(folder, "llm_cache.sqlite3")
+        for backend in ("none", "memory", "sqlite"):
+            settings.LLM_CACHE_BACKEND = backend
+            llm_cache._cache = None
+            requests = server.requests
+            start = time.perf_counter()
+            for kind, payload in calls:
+                if kind == "chat":
+                    openai_chat_completion(None, payload, temperature=0)
+                else:
+                    try:
+                        openai_refine_cv(payload)
+                    except ValueError:
+                        pass  # the stub's reply is not a refinement; only the call cost matters
+            elapsed = (time.perf_counter() - start) / len(calls) * 1000
+            cache = llm_cache.get_llm_cache()
+            hit_rate = f"{cache.stats()['hit_rate']:.0%}" if cache else "-"
+            print(
+                f"{backend:7s} {elapsed:7.1f} ms/call  API requests {server.requests - requests:4d}/{len(calls)}  "
+                f"hit rate {hit_rate}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+LLM client reuse benchmark
+Compares building a ChatOpenAI / OpenAI client per call (the old
+openai_chat_completion and views.chat) with the shared client registry,
+against the local stub server so only client and connection overhead is
+measured.
+
+Run from the backend folder:
+    python -m benchmarks.bench_llm_clients --calls 200
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import setup_django
+from benchmarks.stub_openai import start_stub
+
+MESSAGES = [{"role": "user", "content": "My email is someone@example.com"}]
+
+
+def run(label, call, calls, server):
+    connections = server.connections
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:20s} median {statistics.median(timings):6.2f} ms  "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:6.2f} ms  "
+        f"connections {server.connections - connections}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=int, default=0, help="simulated API latency")
+    args = parser.parse_args()
+
+    server = start_stub(latency_ms=args.latency_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    setup_django()
+    from django.conf import settings
+
+    settings.OPENAI_BASE_URL = base_url
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "sk-stub"
+    from langchain_core.messages import HumanMessage
+    from openai import OpenAI
+
+    from agents.openai_tools import ChatOpenAI, get_chat_client, get_openai_client
+
+    prompt = [HumanMessage(content=MESSAGES[0]["content"])]
+
+    def chat_per_call():
+        llm = ChatOpenAI(
+            model="gpt-3.5-turbo",
+            temperature=0,
+            openai_api_key=settings.OPENAI_API_KEY,
+            openai_api_base=base_url,
+            max_tokens=800,
+        )
+        llm.invoke(prompt)
+
+    def chat_shared():
+        get_chat_client("gpt-3.5-turbo", 0, 800).invoke(prompt)
+
+    def raw_per_call():
+        client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=base_url)
+        client.chat.completions.create(model="gpt-3.5-turbo", messages=MESSAGES)
+
+    def raw_shared():
+        get_openai_client().chat.completions.create(model="gpt-3.5-turbo", messages=MESSAGES)
+
+    print(f"{args.calls} calls, stub latency {args.latency_ms} ms")
+    run("ChatOpenAI per call", chat_per_call, args.calls, server)
+    run("ChatOpenAI shared", chat_shared, args.calls, server)
+    run("OpenAI per call", raw_per_call, args.calls, server)
+    run("OpenAI shared", raw_shared, args.calls, server)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+CV normalization micro-benchmark
+Times AgentCore._normalize_cv_json for one small turn update (a phone number)
+against stored CVs with a growing number of experiences and projects. The
+deep copy column is what the original implementation paid for copying the
+template and the stored CV alone, before any normalization.
+
+Run from the backend folder:
+    python -m benchmarks.bench_normalize --sizes 5 20 80 --iterations 500
+"""
+
+import argparse
+import copy
+import time
+
+from benchmarks.common import setup_django
+
+
+class StoredSession:
+    def __init__(self, cv_json):
+        self.cv_json = cv_json
+
+
+def large_cv(entries):
+    return {
+        "personal_info": {
+            "name": "Ravi Kumar",
+            "email": "ravi.kumar@example.com",
+            "phone": "+91 98765 43210",
+            "address": "Gajuwaka, Visakhapatnam",
+            "github": "https://github.com/ravikumar",
+            "linkedin": "https://linkedin.com/in/ravikumar",
+        },
+        "summary": "Fitter and welder with experience in shipyards and fabrication shops.",
+        "education": [
+            {"degree": f"Course {i}", "institute": f"Institute {i}", "start_year": "2012", "end_year": "2014"}
+            for i in range(3)
+        ],
+        "experience": [
+            {
+                "company": f"Company {i}",
+                "role": "Fitter",
+                "start_date": "2015-01",
+                "end_date": "2016-06",
+                "description": "Fitted hull sections\nRead fabrication drawings\nTrained apprentices",
+            }
+            for i in range(entries)
+        ],
+        "skills": [f"Skill {i}" for i in range(entries)],
+        "projects": [
+            {
+                "project_name": f"Project {i}",
+                "description": "Overhauled dry dock pumps and aligned shafts",
+                "technologies": ["welding", "fitting"],
+            }
+            for i in range(entries)
+        ],
+        "certifications": [{"name": f"Certificate {i}", "issuer": "NSDC", "year": "2019"} for i in range(entries // 2)],
+        "meta": {"preferred_language": "en"},
+    }
+
+
+def per_call_ms(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 80], help="experiences/projects per CV")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from agents.agent_core import AgentCore
+    from utils.validators import validate_phone
+
+    agent = AgentCore()
+    update = {"personal_info": {"phone": "9876543210"}}
+    print(f"{'entries':>8s} {'deep copy ms':>13s} {'normalize ms':>13s}")
+    for size in args.sizes:
+        session = StoredSession(agent._normalize_cv_json(StoredSession({}), large_cv(size)))
+        deep = per_call_ms(
+            lambda: (copy.deepcopy(agent._base_template), copy.deepcopy(session.cv_json)), args.iterations
+        )
+        normalize = per_call_ms(lambda: agent._normalize_cv_json(session, update), args.iterations)
+        print(f"{size:8d} {deep:13.3f} {normalize:13.3f}")
+    print(f"validate_phone cache: {validate_phone.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Session archival benchmark
+Creates --sessions idle sessions of --turns turns each (a filled-in CV and
+a realistic conversation), archives them with each compression, and
+restores them all, checking every field and turn comes back. Reports the
+time per session, archive size against the JSON it holds and the database
+space reclaimed (measured after VACUUM with --vacuum, else the archived
+JSON size). Uses (and creates sessions in) the configured database; the
+archives go to a temporary folder.
+
+Run from the backend folder:
+    python -m benchmarks.bench_session_archive --sessions 200 --turns 40 --vacuum
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+
+from benchmarks.common import setup_django
+
+PREFIX = "bench-archive-"
+USER_TEXT = "I worked at Hindustan Shipyard as a fitter from 2015 to 2020, mostly on hull sections."
+AGENT_TEXT = "Thanks! What were your main responsibilities as a fitter?"
+CV_JSON = {
+    "personal_info": {"name": "Ravi Kumar", "email": "ravi.kumar@example.com", "phone": "+91 98765 43210"},
+    "education": [{"degree": "B.Tech Mechanical Engineering", "institute": "Andhra University", "end_year": "2014"}],
+    "experience": [
+        {"company": "Hindustan Shipyard", "role": "Fitter", "start_date": "2015", "end_date": "2020",
+         "description": "Fitted and aligned hull sections; read blueprints; trained apprentices."}
+    ],
+    "skills": ["welding", "fitting", "blueprint reading"],
+    "projects": [{"project_name": "Dry dock pump overhaul", "description": "", "technologies": []}],
+    "certifications": [{"name": "Arc welding", "issuer": "NSDC", "year": "2019"}],
+}
+
+
+def create_sessions(count, turns):
+    from django.utils import timezone
+
+    from api.models import ConversationTurn, CVSession
+
+    sessions = CVSession.objects.bulk_create(
+        [
+            CVSession(session_id=f"{PREFIX}{index}", cv_json=CV_JSON, turn_count=turns, context_summary="Shipyard fitter.")
+            for index in range(count)
+        ]
+    )
+    ConversationTurn.objects.bulk_create(
+        [
+            ConversationTurn(
+                session=session, index=index, speaker="user" if index % 2 == 0 else "agent",
+                text=USER_TEXT if index % 2 == 0 else AGENT_TEXT,
+            )
+            for session in sessions
+            for index in range(turns)
+        ],
+        batch_size=1000,
+    )
+    CVSession.objects.filter(session_id__startswith=PREFIX).update(updated_at=timezone.now() - timedelta(days=90))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--compressions", nargs="+", default=["gzip", "zstd"])
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM after archiving to measure reclaimed space")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from api.models import ArchivedSession, CVSession
+    from api.session_archive import archive_sessions, restore_sessions
+
+    print(f"{args.sessions} sessions x {args.turns} turns")
+    print(
+        f"{'compression':11s} {'archive ms/session':>19s} {'restore ms/session':>19s} "
+        f"{'json bytes':>11s} {'archive bytes':>14s} {'ratio':>6s} {'reclaimed':>10s}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        settings.SESSION_ARCHIVE_DIR = directory
+        try:
+            for compression in args.compressions:
+                create_sessions(args.sessions, args.turns)
+                ids = [f"{PREFIX}{index}" for index in range(args.sessions)]
+                start = time.perf_counter()
+                report = archive_sessions(
+                    idle_for=timedelta(days=30), compression=compression, vacuum=args.vacuum,
+                    sessions=CVSession.objects.filter(session_id__startswith=PREFIX),
+                )
+                archived = time.perf_counter() - start
+                if report.sessions != args.sessions or CVSession.objects.filter(session_id__in=ids).exists():
+                    raise SystemExit(f"{compression}: archived {report.sessions} of {args.sessions} sessions")
+                start = time.perf_counter()
+                restored = restore_sessions(ids)
+                restore_time = time.perf_counter() - start
+                sessions = CVSession.objects.filter(session_id__in=ids)
+                if len(restored) != args.sessions or any(
+                    session.cv_json != CV_JSON or len(session.get_turns()) != args.turns for session in sessions
+                ):
+                    raise SystemExit(f"{compression}: restored sessions differ from the originals")
+                print(
+                    f"{compression:11s} {archived / args.sessions * 1000:19.3f} {restore_time / args.sessions * 1000:19.3f} "
+                    f"{report.raw_bytes:11d} {report.archive_bytes:14d} "
+                    f"{report.raw_bytes / report.archive_bytes:5.1f}x {report.reclaimed_bytes:10d}"
+                )
+                sessions.delete()
+        finally:
+            CVSession.objects.filter(session_id__startswith=PREFIX).delete()
+            ArchivedSession.objects.filter(session_id__startswith=PREFIX).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Hot session cache benchmark
+Plays the bench_fake_backend conversation through /api/process_text/, then
+/api/session/ and /api/generate_cv/, with the CVSession cache off (every
+request loads the session and its turns from the database) and on
+(CVSESSION_CACHE_ALIAS, write-through). Reports database reads and writes
+per request, our time per request with the fake LLM's simulated time
+subtracted, and the cache hit rate. Uses (and creates sessions in) the
+configured database.
+
+Run from the backend folder:
+    python -m benchmarks.bench_session_cache --sessions 10
+"""
+
+import argparse
+import statistics
+
+from benchmarks.bench_fake_backend import CONVERSATION, timed
+from benchmarks.common import setup_django
+
+
+def run(client, backend, sessions):
+    """{endpoint: [(our ms, reads, writes), ...]} over ``sessions`` scripted conversations."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from api.models import CVSession
+
+    samples = {"process_text": [], "session": [], "generate_cv": []}
+
+    def measure(name, request):
+        with CaptureQueriesContext(connection) as queries:
+            _, ours = timed(backend, request)
+        reads = sum(query["sql"].lstrip().upper().startswith("SELECT") for query in queries.captured_queries)
+        writes = sum(
+            query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+            for query in queries.captured_queries
+        )
+        samples[name].append((ours, reads, writes))
+
+    created = []
+    try:
+        for _ in range(sessions):
+            session_id = client.post("/api/create_session/").json()["session_id"]
+            created.append(session_id)
+            for text in CONVERSATION:
+                measure("process_text", lambda: client.post(
+                    "/api/process_text/", {"session_id": session_id, "text": text}, format="json"
+                ))
+                measure("session", lambda: client.get(f"/api/session/{session_id}/"))
+            measure("generate_cv", lambda: client.get(f"/api/generate_cv/{session_id}/"))
+    finally:
+        CVSession.objects.filter(session_id__in=created).delete()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--latency", default="0", help="fake LLM latency spec")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.LLM_BACKEND = "fake"
+    settings.FAKE_LLM_LATENCY = args.latency
+    settings.LLM_CACHE_BACKEND = "none"
+    settings.ALLOWED_HOSTS = ["*"]
+
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    from agents.openai_tools import get_llm_backend
+    from api import session_cache
+
+    backend = get_llm_backend()
+    client = APIClient()
+    client.force_authenticate(User.objects.get_or_create(username="benchmarks")[0])
+    alias = settings.CVSESSION_CACHE_ALIAS or "cv_sessions"
+
+    run(client, backend, 1)  # warm imports and templates
+    print(f"{args.sessions} sessions x {len(CONVERSATION)} turns, fake LLM latency {args.latency!r}")
+    print(f"{'cache':6s} {'endpoint':13s} {'reads':>6s} {'writes':>7s} {'ours median ms':>15s}")
+    for label, cache_alias in (("off", ""), ("on", alias)):
+        settings.CVSESSION_CACHE_ALIAS = cache_alias
+        session_cache.reset_stats()
+        for name, rows in run(client, backend, args.sessions).items():
+            print(
+                f"{label:6s} {name:13s} {statistics.mean(r[1] for r in rows):6.2f} "
+                f"{statistics.mean(r[2] for r in rows):7.2f} {statistics.median(r[0] for r in rows):15.2f}"
+            )
+        if cache_alias:
+            stats = session_cache.stats()
+            print(f"cache hits {stats['hits']}, misses {stats['misses']}, hit rate {stats['hit_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Overlap stitching WER benchmark
+Concatenates speech fixtures back to back (no pauses, so fixed windows cut
+through words), streams them through StreamingVoiceProcessor in fixed-window
+mode and reports word error rate and CPU time with and without overlap.
+
+Run from the backend folder:
+    python -m benchmarks.bench_stitching --fixtures path/to/fixtures --overlap-ms 600
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import load_fixtures, setup_django, word_error_rate
+
+
+def stream(audio, config, frame_samples=320):
+    from agents.voice_handler import StreamingVoiceProcessor
+
+    processor = StreamingVoiceProcessor(config)
+    parts = []
+    for start in range(0, audio.size, frame_samples):
+        text = processor.add_frame(audio[start:start + frame_samples])
+        if text:
+            parts.append(text)
+    parts.append(processor.flush() or "")
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", required=True, help="folder of audio files with .txt transcripts")
+    parser.add_argument("--chunk-seconds", type=int, default=3)
+    parser.add_argument("--overlap-ms", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3, help="how many shuffled concatenations to score")
+    args = parser.parse_args()
+
+    setup_django()
+    from agents.voice_handler import StreamingConfig, warm_up
+
+    fixtures = load_fixtures(args.fixtures)
+    warm_up()
+    rng = np.random.default_rng(0)
+    samples = []
+    for _ in range(args.repeat):
+        order = rng.permutation(len(fixtures))
+        audio = np.concatenate([fixtures[i][1] for i in order]).astype(np.float32)
+        reference = " ".join(fixtures[i][2] for i in order)
+        samples.append((audio, reference))
+
+    configs = {
+        "hard cut": StreamingConfig(segmentation="fixed", chunk_seconds=args.chunk_seconds),
+        f"overlap {args.overlap_ms} ms": StreamingConfig(
+            segmentation="fixed", chunk_seconds=args.chunk_seconds, overlap_ms=args.overlap_ms
+        ),
+    }
+    audio_seconds = sum(audio.size for audio, _ in samples) / 16000
+    print(f"{len(samples)} concatenations, {audio_seconds:.0f} s of audio, {args.chunk_seconds} s windows")
+    for name, config in configs.items():
+        start = time.process_time()
+        errors = [word_error_rate(reference, stream(audio, config)) for audio, reference in samples]
+        cpu = time.process_time() - start
+        print(f"{name:18s} WER {np.mean(errors) * 100:6.2f}%  CPU {cpu:7.1f} s  ({cpu / audio_seconds:.3f} s per audio s)")
+
+
+if __name__ == "__main__":
+    main()
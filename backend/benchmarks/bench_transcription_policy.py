@@ -0,0 +1,62 @@
+"""
+Transcription profile benchmark
+Streams each fixture through StreamingVoiceProcessor (VAD segmentation) and
+transcribes it as a whole upload under every TRANSCRIPTION_PROFILE, reporting
+latency and word error rate.
+
+Run from the backend folder:
+    python -m benchmarks.bench_transcription_policy --fixtures path/to/fixtures
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.common import load_fixtures, setup_django, word_error_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", required=True, help="folder of audio files with .txt transcripts")
+    parser.add_argument("--language", default=None, help="session language preference, e.g. en")
+    args = parser.parse_args()
+
+    setup_django()
+    from agents.transcription_policy import PROFILES
+    from agents.voice_handler import (
+        StreamingConfig,
+        StreamingVoiceProcessor,
+        _transcribe,
+        get_transcription_policy,
+        warm_up,
+    )
+
+    fixtures = load_fixtures(args.fixtures)
+    warm_up()
+    print(f"{len(fixtures)} fixtures")
+    print(f"{'profile':10s} {'stream ms':>10s} {'stream WER':>11s} {'upload ms':>10s} {'upload WER':>11s}")
+    for profile in PROFILES:
+        policy = get_transcription_policy(profile)
+        stream_ms, stream_wer, upload_ms, upload_wer = [], [], [], []
+        for _, audio, reference in fixtures:
+            processor = StreamingVoiceProcessor(StreamingConfig(language=args.language, profile=profile))
+            start = time.perf_counter()
+            parts = [processor.add_frame(audio[i:i + 320]) for i in range(0, audio.size, 320)]
+            parts.append(processor.flush())
+            stream_ms.append((time.perf_counter() - start) * 1000)
+            stream_wer.append(word_error_rate(reference, " ".join(p for p in parts if p)))
+
+            start = time.perf_counter()
+            beam_size = policy.beam_size(audio.size / 16000, final=True)
+            text = _transcribe(audio, language=args.language, beam_size=beam_size)
+            upload_ms.append((time.perf_counter() - start) * 1000)
+            upload_wer.append(word_error_rate(reference, text))
+
+        print(
+            f"{profile:10s} {statistics.median(stream_ms):10.0f} {statistics.mean(stream_wer) * 100:10.2f}% "
+            f"{statistics.median(upload_ms):10.0f} {statistics.mean(upload_wer) * 100:10.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
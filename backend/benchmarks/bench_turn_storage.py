@@ -0,0 +1,82 @@
+"""
+Conversation turn write benchmark
+Cost of storing one turn (a user message and the agent reply) as a session's
+conversation grows. "json column" replays the original storage: the whole
+conversation list lives in a JSON column of the CVSession row, and both the
+view and the agent save the full row. It is reproduced by writing the list
+into cv_json of a scratch session. "turn rows" commits two ConversationTurn
+rows and the session fields in one versioned write, as AgentCore does
+(CVSession.commit_turn). Uses (and creates sessions in) the
+configured database.
+
+Run from the backend folder:
+    python -m benchmarks.bench_turn_storage --lengths 10 100 500 --turns 50
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django
+
+USER_TEXT = "I worked at Hindustan Shipyard as a fitter from 2015 to 2020, mostly on hull sections."
+AGENT_TEXT = "Thanks! What were your main responsibilities as a fitter?"
+
+
+def json_column(session, history, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        history.append({"from": "user", "text": USER_TEXT})
+        session.cv_json = history
+        session.save()
+        history.append({"from": "agent", "text": AGENT_TEXT})
+        session.cv_json = history
+        session.save()
+    return (time.perf_counter() - start) / turns * 1000
+
+
+def turn_rows(session, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        session.stage_turn("user", USER_TEXT)
+        session.stage_turn("agent", AGENT_TEXT)
+        session.commit_turn()
+    return (time.perf_counter() - start) / turns * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 500], help="turns already stored")
+    parser.add_argument("--turns", type=int, default=50, help="turns written per measurement")
+    args = parser.parse_args()
+
+    setup_django()
+    from api.models import ConversationTurn, CVSession
+
+    print(f"{'stored':>7s} {'json column ms':>15s} {'row bytes':>10s} {'turn rows ms':>13s}")
+    created = []
+    try:
+        for length in args.lengths:
+            history = [
+                {"from": "user" if index % 2 == 0 else "agent", "text": USER_TEXT if index % 2 == 0 else AGENT_TEXT}
+                for index in range(length)
+            ]
+            legacy = CVSession.objects.create(cv_json=list(history))
+            session = CVSession.objects.create(cv_json={}, turn_count=length)
+            created += [legacy.pk, session.pk]
+            ConversationTurn.objects.bulk_create(
+                [
+                    ConversationTurn(session=session, index=index, speaker=item["from"], text=item["text"])
+                    for index, item in enumerate(history)
+                ]
+            )
+            legacy_ms = json_column(legacy, history, args.turns)
+            row_bytes = len(json.dumps(history))
+            rows_ms = turn_rows(session, args.turns)
+            print(f"{length:7d} {legacy_ms:15.2f} {row_bytes:10d} {rows_ms:13.2f}")
+    finally:
+        CVSession.objects.filter(pk__in=created).delete()
+
+
+if __name__ == "__main__":
+    main()
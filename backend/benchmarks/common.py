@@ -0,0 +1,99 @@
+"""
+Shared helpers for the benchmarks.
+"""
+
+import json
+import os
+import re
+import time
+
+_WORD = re.compile(r"[\w']+", re.UNICODE)
+
+
+def setup_django():
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'voice_to_cv.settings')
+    django.setup()
+
+
+def words(text):
+    return _WORD.findall((text or "").lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_fixtures(directory):
+    """
+    Load (name, float32 16 kHz audio, transcript) triples from ``directory``.
+    Each audio file (wav/mp3/webm/...) needs a sibling .txt with its transcript.
+    """
+    from utils.audio_decoder import decode_audio
+
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(name)
+        transcript = os.path.join(directory, stem + ".txt")
+        if ext == ".txt" or not os.path.exists(transcript):
+            continue
+        with open(transcript, encoding="utf-8") as handle:
+            fixtures.append((stem, decode_audio(os.path.join(directory, name)), handle.read().strip()))
+    if not fixtures:
+        raise SystemExit(f"No audio fixtures with matching .txt transcripts in {directory}")
+    return fixtures
+
+
+async def bench_token():
+    """API token for a dedicated benchmark user (created on first use)."""
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    user, _ = await User.objects.aget_or_create(username="benchmarks")
+    token, _ = await Token.objects.aget_or_create(user=user)
+    return token.key
+
+
+async def asgi_post(application, path, body, token):
+    """Minimal ASGI HTTP client; returns (seconds to first body byte, seconds to end)."""
+    from asgiref.testing import ApplicationCommunicator
+
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "query_string": b"",
+    }
+    start = time.perf_counter()
+    communicator = ApplicationCommunicator(application, scope)
+    await communicator.send_input({"type": "http.request", "body": payload})
+    first = None
+    while True:
+        message = await communicator.receive_output(timeout=60)
+        if message["type"] == "http.response.body":
+            if first is None and message.get("body"):
+                first = time.perf_counter() - start
+            if not message.get("more_body"):
+                return first, time.perf_counter() - start
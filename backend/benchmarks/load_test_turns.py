@@ -0,0 +1,90 @@
+"""
+Concurrent agent turn load test
+Fires --concurrency simultaneous text turns at the sync DRF view
+(/api/process_text/) and at its async counterpart (/api/async/process_text/)
+through the ASGI application, with the local OpenAI stub answering after
+--latency-ms. Under ASGI each sync view turn blocks its own thread for the
+whole LLM round trip; async turns await the LLM on the event loop and only
+use threads for the ORM and the CPU-bound turn preparation.
+Uses (and creates sessions in) the configured database.
+
+Run from the backend folder:
+    python -m benchmarks.load_test_turns --concurrency 50 --latency-ms 300
+The in-process stub competes for the GIL with the app; for cleaner numbers run
+it separately (python -m benchmarks.stub_openai --latency-ms 300) and pass
+--stub-url http://127.0.0.1:8999/v1.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from benchmarks.common import asgi_post, bench_token, setup_django
+from benchmarks.stub_openai import start_stub
+
+
+async def burst(application, path, token, sessions):
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[
+            asgi_post(application, path, {"session_id": session, "text": "I studied mechanical engineering"}, token)
+            for session in sessions
+        ]
+    )
+    wall = time.perf_counter() - start
+    latencies = sorted(total * 1000 for _, total in results)
+    return wall, latencies
+
+
+async def run(args):
+    from api.models import CVSession
+    from voice_to_cv.asgi import application
+
+    token = await bench_token()
+    # Warm both paths (imports, LLM clients, connection pools) before timing.
+    warm = str((await CVSession.objects.acreate(cv_json={})).session_id)
+    for path in ("/api/process_text/", "/api/async/process_text/"):
+        await burst(application, path, token, [warm])
+    await CVSession.objects.filter(session_id=warm).adelete()
+
+    print(f"{args.concurrency} concurrent turns")
+    for label, path in (("sync view", "/api/process_text/"), ("async view", "/api/async/process_text/")):
+        sessions = [
+            str((await CVSession.objects.acreate(cv_json={})).session_id)
+            for _ in range(args.concurrency)
+        ]
+        wall, latencies = await burst(application, path, token, sessions)
+        print(
+            f"{label:10s} wall {wall:6.2f} s  throughput {len(latencies) / wall:6.1f} turns/s  "
+            f"median {statistics.median(latencies):7.0f} ms  max {latencies[-1]:7.0f} ms"
+        )
+        await CVSession.objects.filter(session_id__in=sessions).adelete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=300, help="stub LLM latency per call")
+    parser.add_argument("--stub-url", help="use an already running stub instead of an in-process one")
+    args = parser.parse_args()
+
+    server = None
+    if not args.stub_url:
+        server = start_stub(latency_ms=args.latency_ms)
+    setup_django()
+    from django.conf import settings
+
+    settings.OPENAI_BASE_URL = args.stub_url or f"http://127.0.0.1:{server.server_address[1]}/v1"
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "sk-stub"
+    # Every turn must reach the stub; identical synthetic prompts would be cache hits.
+    settings.LLM_CACHE_BACKEND = "none"
+    settings.OPENAI_MAX_CONNECTIONS = max(settings.OPENAI_MAX_CONNECTIONS, args.concurrency)
+    settings.ALLOWED_HOSTS = ["*"]
+    asyncio.run(run(args))
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Concurrent turns on one session
+Hammers a single CVSession from --threads threads, each sending --turns
+"My skills are ..." turns with a unique skill through AgentCore and the fake
+LLM backend (LLM_BACKEND=fake, --latency between reading the session and
+committing the turn). Every committed turn must keep its skill and both of
+its conversation rows. The same load through the original read / modify /
+save() pattern shows the lost updates it allowed. Uses (and creates sessions
+in) the configured database; committed turns read the session through the
+session cache, as the views do.
+
+Run from the backend folder:
+    python -m benchmarks.stress_session_commit --threads 16 --turns 10 --latency fixed:50
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setup_django
+
+
+def skills_of(cv_json):
+    """Every skill in ``cv_json``, lowercased, whether listed or categorized."""
+    skills = cv_json.get("skills") or []
+    if isinstance(skills, dict):
+        skills = [skill for values in skills.values() for skill in values]
+    return {str(skill).strip().lower() for skill in skills}
+
+
+def hammer(threads, turns, turn):
+    """Run ``turn(thread, index)`` from ``threads`` threads; returns (wall seconds, failures)."""
+    from django.db import connection
+
+    def worker(thread):
+        failures = 0
+        try:
+            for index in range(turns):
+                failures += not turn(thread, index)
+        finally:
+            connection.close()
+        return failures
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        failures = sum(pool.map(worker, range(threads)))
+    return time.perf_counter() - start, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=10, help="turns per thread")
+    parser.add_argument("--latency", default="fixed:50", help="fake LLM latency spec")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    settings.LLM_BACKEND = "fake"
+    settings.FAKE_LLM_LATENCY = args.latency
+    settings.LLM_CACHE_BACKEND = "none"
+
+    from agents.agent_core import AgentCore
+    from agents.fake_llm import parse_latency
+    from api import session_cache
+    from api.models import CVSession, SessionConflict
+
+    agent = AgentCore()
+    delay = parse_latency(args.latency)
+    rng, rng_lock = random.Random(0), threading.Lock()
+    total = args.threads * args.turns
+    retries = []
+    commit_turn = CVSession.commit_turn
+
+    def counted_commit(self, *commit_args, **commit_kwargs):
+        retries.append(commit_turn(self, *commit_args, **commit_kwargs))
+        return retries[-1]
+
+    def skill(thread, index):
+        return f"skill{thread}x{index}"
+
+    legacy = CVSession.objects.create(cv_json={"skills": []})
+    session = CVSession.objects.create(cv_json={"skills": []})
+    try:
+
+        def legacy_turn(thread, index):
+            current = CVSession.objects.get(pk=legacy.pk)
+            with rng_lock:
+                wait = delay(rng)
+            time.sleep(wait)  # the LLM call between reading and saving the row
+            current.cv_json = {**current.cv_json, "skills": current.cv_json["skills"] + [skill(thread, index)]}
+            current.save()
+            return True
+
+        def committed_turn(thread, index):
+            current = session_cache.get_session(session.session_id)
+            text = f"My skills are {skill(thread, index)}"
+            current.stage_turn("user", text)
+            try:
+                agent.process_user_message(current, text)
+            except SessionConflict:
+                return False
+            return True
+
+        wall, _ = hammer(args.threads, args.turns, legacy_turn)
+        legacy.refresh_from_db()
+        kept = len(skills_of(legacy.cv_json))
+        print(f"{args.threads} threads x {args.turns} turns on one session, fake LLM {args.latency!r}")
+        print(f"save()       {wall:6.2f} s  skills kept {kept:4d}/{total}  lost updates {total - kept}")
+
+        CVSession.commit_turn = counted_commit
+        wall, conflicts = hammer(args.threads, args.turns, committed_turn)
+        session.refresh_from_db()
+        expected = {skill(thread, index) for thread in range(args.threads) for index in range(args.turns)}
+        kept = len(expected & skills_of(session.cv_json))
+        indexes = list(session.turns.order_by("index").values_list("index", flat=True))
+        committed = total - conflicts
+        print(
+            f"commit_turn  {wall:6.2f} s  skills kept {kept:4d}/{committed} committed  "
+            f"409s {conflicts}  retries {sum(retries)} (max {max(retries, default=0)} per turn)"
+        )
+        print(
+            f"turn rows {len(indexes)} (expected {2 * committed}), turn_count {session.turn_count}, "
+            f"indexes contiguous: {indexes == list(range(len(indexes)))}, version {session.version}"
+        )
+        if kept != committed or len(indexes) != 2 * committed or indexes != list(range(len(indexes))):
+            raise SystemExit("committed turns were lost")
+    finally:
+        CVSession.commit_turn = commit_turn
+        CVSession.objects.filter(pk__in=[legacy.pk, session.pk]).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Local stand-in for the OpenAI chat completions API
+Answers POST /v1/chat/completions with a canned agent reply after an optional
+delay, over HTTP/1.1 keep-alive, and counts the TCP connections it accepts.
+Streaming requests get the reply as SSE chunks, one every --token-ms.
+
+Run from the backend folder:
+    python -m benchmarks.stub_openai --port 8999 --latency-ms 0
+then point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8999/v1
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = {
+    "agent_text": "Could you share your phone number?",
+    "cv_json": {},
+    "next_action": "ask",
+    "language": "en",
+}
+
+
+def _pieces():
+    """The reply split into ~token-sized chunks."""
+    content = json.dumps(REPLY)
+    return [content[i:i + 4] for i in range(0, len(content), 4)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle plus
+        # delayed ACKs add ~40 ms to every keep-alive response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if request.get("stream"):
+            self._stream(request)
+            return
+        if self.server.token_delay:
+            # A non-streamed reply arrives once the whole completion is generated.
+            time.sleep(self.server.token_delay * (len(_pieces()) - 1))
+        body = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": json.dumps(REPLY)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.requests += 1
+
+    def _stream(self, request):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, piece in enumerate(_pieces()):
+            if index and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            self._chunk(
+                "data: "
+                + json.dumps(
+                    {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": request.get("model", "stub"),
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                )
+                + "\n\n"
+            )
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        with self.server.lock:
+            self.server.requests += 1
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(port=0, latency_ms=0, token_ms=0):
+    """Start the stub on a background thread and return the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.latency = latency_ms / 1000
+    server.token_delay = token_ms / 1000
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, name="openai-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    parser.add_argument("--token-ms", type=int, default=0, help="delay between streamed chunks")
+    args = parser.parse_args()
+    server = start_stub(args.port, args.latency_ms, args.token_ms)
+    print(f"stub OpenAI API on http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
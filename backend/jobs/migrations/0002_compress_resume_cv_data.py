@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+import utils.fields
+
+
+def pack_cv_data(apps, schema_editor):
+    Resume = apps.get_model("jobs", "Resume")
+    for resume in Resume.objects.only("resume_id", "cv_data").iterator():
+        Resume.objects.filter(resume_id=resume.resume_id).update(cv_data_packed=resume.cv_data)
+
+
+def unpack_cv_data(apps, schema_editor):
+    Resume = apps.get_model("jobs", "Resume")
+    for resume in Resume.objects.only("resume_id", "cv_data_packed").iterator():
+        Resume.objects.filter(resume_id=resume.resume_id).update(cv_data=resume.cv_data_packed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='cv_data_packed',
+            field=utils.fields.CompressedJSONField(default=dict),
+            preserve_default=False,
+        ),
+        # Nullable while it is dropped, so unapplying can re-add it to a table with rows.
+        migrations.AlterField(
+            model_name='resume',
+            name='cv_data',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(pack_cv_data, unpack_cv_data),
+        migrations.RemoveField(
+            model_name='resume',
+            name='cv_data',
+        ),
+        migrations.RenameField(
+            model_name='resume',
+            old_name='cv_data_packed',
+            new_name='cv_data',
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
+from utils.fields import CompressedJSONField
+
 
 class UserProfile(models.Model):
     """Extended user profile with CV data"""
@@ -35,7 +37,7 @@ class Resume(models.Model):
     """User's uploaded/generated resumes"""
     resume_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
-    cv_data = models.JSONField()  # Stores the complete CV JSON from VoiceToCV
+    cv_data = CompressedJSONField()  # Stores the complete CV JSON from VoiceToCV
     file_url = models.URLField(blank=True)  # Storage URL for PDF/DOCX
     is_active = models.BooleanField(default=True)  # Currently active resume
     created_at = models.DateTimeField(auto_now_add=True)
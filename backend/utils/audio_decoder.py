@@ -0,0 +1,68 @@
+"""
+Decode uploaded audio into 16 kHz mono float32 arrays for Whisper.
+
+Uploads are decoded straight from the upload buffer with faster-whisper's
+PyAV decoder (the same one it uses for file paths), so no temporary file is
+written. The disk is only involved when Django has already spooled a large
+upload to a temporary file: views decorated with audio_upload_handlers keep
+uploads up to AUDIO_UPLOAD_MAX_MEMORY_SIZE in memory, other views use
+Django's FILE_UPLOAD_MAX_MEMORY_SIZE.
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+SAMPLE_RATE = 16000
+
+
+class AudioMemoryUploadHandler(MemoryFileUploadHandler):
+    """MemoryFileUploadHandler with the AUDIO_UPLOAD_MAX_MEMORY_SIZE limit instead of FILE_UPLOAD_MAX_MEMORY_SIZE."""
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        limit = getattr(settings, "AUDIO_UPLOAD_MAX_MEMORY_SIZE", settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        self.activated = content_length <= limit
+
+
+def audio_upload_handlers(view):
+    """
+    View decorator: parse this view's uploads with AudioMemoryUploadHandler.
+    Apply it outermost, since the handlers cannot change once the request
+    body has been read (by CSRF or authentication checks, for instance).
+    """
+
+    def use_handlers(request):
+        request.upload_handlers = [AudioMemoryUploadHandler(request), TemporaryFileUploadHandler(request)]
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            use_handlers(request)
+            return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            use_handlers(request)
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def decode_audio(source, sample_rate=SAMPLE_RATE):
+    """Decode a path or seekable file-like object into a float32 array."""
+    from av.error import FFmpegError
+    from faster_whisper.audio import decode_audio as _decode_audio
+
+    try:
+        return _decode_audio(source, sampling_rate=sample_rate)
+    except FFmpegError as exc:
+        # Corrupt or unsupported input.
+        raise ValueError(f"Could not decode audio: {exc}") from exc
+
+
+def decode_upload(upload, sample_rate=SAMPLE_RATE):
+    """Decode a Django UploadedFile without copying it to disk."""
+    if hasattr(upload, "temporary_file_path"):
+        return decode_audio(upload.temporary_file_path(), sample_rate=sample_rate)
+    upload.seek(0)
+    return decode_audio(upload.file, sample_rate=sample_rate)
@@ -0,0 +1,83 @@
+"""
+Model fields shared by the apps.
+"""
+import json
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+# First byte of a stored CompressedJSONField value.
+PLAIN = b"j"
+ZLIB = b"z"
+
+
+def encode_json(value, encoder=None, threshold=None, level=6) -> bytes:
+    """
+    ``value`` as compact UTF-8 JSON behind a marker byte, zlib-compressed
+    when the JSON is at least ``threshold`` (COMPRESSED_JSON_THRESHOLD) bytes
+    and compression makes it smaller.
+    """
+    if threshold is None:
+        threshold = getattr(settings, "COMPRESSED_JSON_THRESHOLD", 512)
+    data = json.dumps(value, cls=encoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(data) >= threshold:
+        packed = zlib.compress(data, level)
+        if len(packed) < len(data):
+            return ZLIB + packed
+    return PLAIN + data
+
+
+def decode_json(raw, decoder=None):
+    """The value stored by encode_json; plain JSON text (rows written before compression) is read as is."""
+    if isinstance(raw, str):
+        return json.loads(raw, cls=decoder)
+    raw = bytes(raw)
+    marker, data = raw[:1], raw[1:]
+    if marker == ZLIB:
+        data = zlib.decompress(data)
+    elif marker != PLAIN:
+        data = raw
+    return json.loads(data.decode("utf-8"), cls=decoder)
+
+
+class CompressedJSONField(models.JSONField):
+    """
+    A JSONField stored as bytes (see encode_json): compact UTF-8 JSON,
+    zlib-compressed above ``threshold`` bytes (COMPRESSED_JSON_THRESHOLD by
+    default). Reads and writes Python values like JSONField, and serializers
+    and forms treat it as one, but the database sees an opaque blob: no key,
+    contains or has_key lookups.
+    """
+
+    def __init__(self, *args, threshold=None, level=6, **kwargs):
+        self.threshold = threshold
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.threshold is not None:
+            kwargs["threshold"] = self.threshold
+        if self.level != 6:
+            kwargs["level"] = self.level
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def _check_supported(self, databases):
+        # Stored as a blob, so the database needs no JSON support.
+        return []
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if hasattr(value, "as_sql"):
+            return value
+        if value is None:
+            return None
+        return connection.Database.Binary(encode_json(value, self.encoder, self.threshold, self.level))
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decode_json(value, self.decoder)
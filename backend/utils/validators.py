@@ -1,10 +1,32 @@
 """
 Validation utilities for CV data.
 """
+import functools
 import re
 from typing import Optional, Dict, Any
 
 
+def _memoize(func):
+    """
+    Cache results per argument value. The validators are pure and the agent
+    re-validates the same personal_info values every turn; unhashable
+    arguments skip the cache.
+    """
+    cached = functools.lru_cache(maxsize=1024)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return cached(*args, **kwargs)
+        except TypeError:
+            return func(*args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@_memoize
 def validate_email(email: str) -> tuple[bool, Optional[str]]:
     """
     Validate email address format.
@@ -39,6 +61,7 @@ def validate_email(email: str) -> tuple[bool, Optional[str]]:
     return False, None
 
 
+@_memoize
 def validate_phone(phone: str) -> tuple[bool, Optional[str]]:
     """
     Validate and normalize phone number.
@@ -79,6 +102,7 @@ def validate_phone(phone: str) -> tuple[bool, Optional[str]]:
     return False, None
 
 
+@_memoize
 def validate_url(url: str, url_type: str = "generic") -> tuple[bool, Optional[str]]:
     """
     Validate URL format (GitHub, LinkedIn, Portfolio, etc.)
@@ -113,6 +137,7 @@ def validate_url(url: str, url_type: str = "generic") -> tuple[bool, Optional[st
     return False, None
 
 
+@_memoize
 def auto_correct_name(name: str) -> str:
     """
     Auto-correct common name spelling mistakes.
@@ -7,4 +7,23 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'voice_to_cv.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing consumers (they import models).
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from api.middleware import TokenAuthMiddleware  # noqa: E402
+from api.routing import websocket_urlpatterns  # noqa: E402
+from agents.voice_handler import start_warm_up  # noqa: E402
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    # Django session or DRF token (header or ?token=); the consumer rejects anonymous users.
+    "websocket": AllowedHostsOriginValidator(
+        AuthMiddlewareStack(TokenAuthMiddleware(URLRouter(websocket_urlpatterns)))
+    ),
+})
+
+start_warm_up()
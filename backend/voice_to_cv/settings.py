@@ -68,6 +68,30 @@ DATABASES = {
     }
 }
 
+# Hot CVSession cache (api/session_cache.py). Shared between workers through Redis when
+# REDIS_URL is set (needs the redis package), otherwise local memory per process.
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "cv_sessions": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "cv-sessions",
+              "OPTIONS": {"MAX_ENTRIES": 10000}}
+    ),
+    # Rendered reply audio, readable by every worker: Redis, or a directory shared by the
+    # workers on one host.
+    "tts_audio": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+              "LOCATION": os.getenv("TTS_CACHE_DIR") or str(BASE_DIR / "tts_cache"),
+              "OPTIONS": {"MAX_ENTRIES": 2000}}
+    ),
+}
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "en-us"
@@ -82,6 +106,117 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # OpenAI
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+# Point at a proxy or a local stub server (see benchmarks/stub_openai.py).
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+# Pooled keep-alive connections shared by every LLM client in the process.
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+# Whisper models are loaded lazily on first transcription.
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "small")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = library default
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+# Load voice models in the background when a server process starts (asgi.py / wsgi.py);
+# management commands never do.
+VOICE_WARMUP_ON_START = os.getenv("VOICE_WARMUP_ON_START", "False") == "True"
+
+# Audio uploads to the voice endpoints up to this size stay in memory and are decoded from
+# the upload buffer; larger ones are spooled to a temporary file. Only those views use it
+# (utils.audio_decoder.audio_upload_handlers); other uploads keep FILE_UPLOAD_MAX_MEMORY_SIZE.
+AUDIO_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv("AUDIO_SPILL_THRESHOLD_BYTES", str(10 * 1024 * 1024)))
+
+# Decoding policy: latency (greedy), balanced (greedy for partial/short chunks,
+# beam search for finals) or accuracy (beam search everywhere).
+TRANSCRIPTION_PROFILE = os.getenv("TRANSCRIPTION_PROFILE", "balanced")
+
+# Transcript cache keyed by audio hash + decoding options (0 disables).
+TRANSCRIPTION_CACHE_SIZE = int(os.getenv("TRANSCRIPTION_CACHE_SIZE", "256"))
+# Optional on-disk tier shared across processes and restarts.
+TRANSCRIPTION_CACHE_DIR = os.getenv("TRANSCRIPTION_CACHE_DIR", "")
+# Files kept in that tier; the least recently used are deleted beyond it (0 = no limit).
+TRANSCRIPTION_CACHE_DISK_ENTRIES = int(os.getenv("TRANSCRIPTION_CACHE_DISK_ENTRIES", "10000"))
+
+# Whisper worker pool (0 keeps transcription on the in-process model)
+WHISPER_POOL_WORKERS = int(os.getenv("WHISPER_POOL_WORKERS", "0"))
+WHISPER_POOL_MAX_QUEUE = int(os.getenv("WHISPER_POOL_MAX_QUEUE", "64"))
+WHISPER_POOL_BATCH_SIZE = int(os.getenv("WHISPER_POOL_BATCH_SIZE", "8"))
+WHISPER_POOL_BATCH_WINDOW_MS = int(os.getenv("WHISPER_POOL_BATCH_WINDOW_MS", "20"))
+WHISPER_POOL_SUBMIT_TIMEOUT = float(os.getenv("WHISPER_POOL_SUBMIT_TIMEOUT", "5"))
+# Threads that run decoding/Whisper for the async (ASGI) views.
+WHISPER_ASYNC_THREADS = int(os.getenv("WHISPER_ASYNC_THREADS", "4"))
+
+# Agent prompt context: current cv_json + last AGENT_CONTEXT_TURNS turns, with older
+# turns folded into a running summary every AGENT_SUMMARY_EVERY turns. The summary LLM call
+# runs on a background thread and a later turn picks it up; AGENT_SUMMARY_BACKGROUND=False
+# makes the turn that triggers it wait for it instead.
+AGENT_CONTEXT_TURNS = int(os.getenv("AGENT_CONTEXT_TURNS", "8"))
+AGENT_CONTEXT_TOKEN_BUDGET = int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "3000"))
+AGENT_SUMMARY_EVERY = int(os.getenv("AGENT_SUMMARY_EVERY", "10"))
+AGENT_SUMMARY_MODEL = os.getenv("AGENT_SUMMARY_MODEL", "gpt-3.5-turbo")
+AGENT_SUMMARY_BACKGROUND = os.getenv("AGENT_SUMMARY_BACKGROUND", "True") == "True"
+
+# Answer replies to fixed questions (email, phone, years, dates, declines) without
+# the LLM when the local extractor is at least this confident.
+AGENT_FAST_PATH = os.getenv("AGENT_FAST_PATH", "True") == "True"
+AGENT_FAST_PATH_MIN_CONFIDENCE = float(os.getenv("AGENT_FAST_PATH_MIN_CONFIDENCE", "0.9"))
+
+# How the LLM reports CV changes: "patch" (JSON Patch ops for changed paths only)
+# or "full" (the whole cv_json every turn).
+AGENT_CV_PROTOCOL = os.getenv("AGENT_CV_PROTOCOL", "patch")
+
+# A turn is committed in one write, guarded by CVSession.version; when another request
+# on the same session committed first it is re-applied, up to this many times (then 409).
+SESSION_COMMIT_RETRIES = int(os.getenv("SESSION_COMMIT_RETRIES", "5"))
+
+# Sessions are read through the CACHES[CVSESSION_CACHE_ALIAS] cache and written through
+# on every commit, so the database only sees writes while a session is hot. Empty disables.
+# Entries expire after CVSESSION_CACHE_TTL seconds and carry the last CVSESSION_CACHE_TURNS turns.
+CVSESSION_CACHE_ALIAS = os.getenv("CVSESSION_CACHE_ALIAS", "cv_sessions")
+CVSESSION_CACHE_TTL = int(os.getenv("CVSESSION_CACHE_TTL", "1800"))
+CVSESSION_CACHE_TURNS = int(os.getenv("CVSESSION_CACHE_TURNS", "16"))
+
+# CVSession.cv_json and Resume.cv_data are stored as compact UTF-8 JSON, zlib-compressed
+# once a document reaches this many bytes (utils/fields.py).
+COMPRESSED_JSON_THRESHOLD = int(os.getenv("COMPRESSED_JSON_THRESHOLD", "512"))
+
+# Sessions idle for SESSION_ARCHIVE_AFTER_DAYS are moved to compressed JSON lines files in
+# SESSION_ARCHIVE_DIR ("gzip", or "zstd" with the zstandard package) by
+# `manage.py archive_sessions`, and restored when they are read again. With
+# SESSION_ARCHIVE_INTERVAL (seconds) or --every, that command keeps running and archives on
+# that interval; run it as its own process (web workers never start the job).
+SESSION_ARCHIVE_DIR = os.getenv("SESSION_ARCHIVE_DIR") or str(BASE_DIR / "session_archive")
+SESSION_ARCHIVE_AFTER_DAYS = float(os.getenv("SESSION_ARCHIVE_AFTER_DAYS", "30"))
+SESSION_ARCHIVE_COMPRESSION = os.getenv("SESSION_ARCHIVE_COMPRESSION", "gzip")
+SESSION_ARCHIVE_INTERVAL = int(os.getenv("SESSION_ARCHIVE_INTERVAL", "0"))
+
+# Cache for temperature-0 LLM calls: "memory" (per process), "sqlite" (LLM_CACHE_PATH,
+# shared by workers on one host) or "none".
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or str(BASE_DIR / "llm_cache.sqlite3")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+
+# Where chat completions come from: "openai" or "fake", a deterministic local stand-in
+# for load tests and offline development (agents/fake_llm.py). The fake replies from
+# FAKE_LLM_FIXTURES (default: the bundled fixtures) after a FAKE_LLM_LATENCY delay:
+# fixed:MS, uniform:LOW-HIGH, normal:MEAN,SD or lognormal:MEDIAN,SIGMA.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+FAKE_LLM_FIXTURES = os.getenv("FAKE_LLM_FIXTURES", "")
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "")
+FAKE_LLM_TOKEN_MS = float(os.getenv("FAKE_LLM_TOKEN_MS", "0"))
+FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+# Server-side TTS: attach agent_audio / agent_audio_url to agent replies.
+TTS_REPLY_AUDIO = os.getenv("TTS_REPLY_AUDIO", "False") == "True"
+TTS_VOICE = os.getenv("TTS_VOICE") or None
+TTS_RATE = int(os.getenv("TTS_RATE", "0")) or None
+TTS_CACHE_SIZE = int(os.getenv("TTS_CACHE_SIZE", "256"))
+# Rendered audio and in-flight renders are published to CACHES[TTS_CACHE_ALIAS] so an
+# agent_audio_url resolves on any worker; empty keeps them in the rendering process only.
+TTS_CACHE_ALIAS = os.getenv("TTS_CACHE_ALIAS", "tts_audio")
+TTS_CACHE_TTL = int(os.getenv("TTS_CACHE_TTL", "86400"))
 
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
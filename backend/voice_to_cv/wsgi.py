@@ -8,3 +8,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'voice_to_cv.settings')
 
 application = get_wsgi_application()
+
+# Imported once Django is set up; only server processes load this module.
+from agents.voice_handler import start_warm_up  # noqa: E402
+
+start_warm_up()
@@ -60,7 +60,7 @@ const ChatWindow = () => {
 
     try {
       console.log("Sending message:", messageText, "with session:", sessionId);
-      const res = await axios.post("/process-text/", { session_id: sessionId, text: messageText });
+      const res = await axios.post("/process-text/", { session_id: sessionId, text: messageText, delta: true });
       console.log("Backend response:", res.data);  // Log to inspect structure
       const agentText = res.data.agent_text || res.data.message || res.data.response || res.data.text || "Response received.";
       const agentMsg = { sender: "agent", text: agentText };